@@ -1,3 +1,4 @@
+import sys
 import time
 import toml
 from datetime import datetime
@@ -7,7 +8,12 @@ from src.date_generator import LogDateGenerator
 from src.user_selector import UserSelector
 from src.user_controller import UserEventController
 from src.log_contents import LogContents
+from src.log_renderer import LogRenderer
 from src.log_sink import LogSink
+from src.log_orderer import LogOrderer
+from src.random_pool import RandomPool
+from schemas.log_record import LogRecord, PlaybackSession
+from src.volume_planner import VolumePlanner
 
 
 def main():
@@ -20,7 +26,12 @@ def main():
     - UserSelector: 유저 선정 및 상태 관리
     - UserEventController: 유저 상태 → 로그 타입 결정 & 상태 전이
     - LogContents: 로그 타입별 실제 내용 생성
+    - LogOrderer: 이벤트 시각 순서 정렬 (미래 시각 재생 로그 보관 후 순서대로 방출)
     - LogSink: 최종 출력 (S3/로컬/Kafka)
+
+    실행:
+    - python main.py       : 로그 생성
+    - python main.py plan  : 로그 생성 없이 발생량/용량 계획만 출력 (VolumePlanner)
     """
 
     print("=" * 80)
@@ -31,19 +42,27 @@ def main():
     config = toml.load("config/config.toml")
     print(f"\n✅ Config 로딩 완료")
 
+    # plan 명령: DB/Sink 없이 설정만으로 발생량/용량 계산 후 종료
+    if len(sys.argv) > 1 and sys.argv[1] == "plan":
+        VolumePlanner(config).plan()
+        return
+
 
     # ========== 2. 모듈 초기화 ==========
     print("\n📦 모듈 초기화 중...\n")
 
-    db_client = DBClient(config)
+    random_pool = RandomPool(config)  # 모든 모듈이 공유하는 난수 버퍼 (seed 고정 시 재현 가능)
+
+    db_client = DBClient(config, random_pool)
     db_client.load_contents_cache()  # 콘텐츠 캐시 로드
     print("✅ DB Client 초기화 완료")
 
-    date_generator = LogDateGenerator(config)
-    user_selector = UserSelector(config, db_client)
-    user_event_controller = UserEventController(config)
-    log_contents = LogContents(config, db_client)
-    log_sink = LogSink(config)
+    date_generator = LogDateGenerator(config, random_pool)
+    user_selector = UserSelector(config, db_client, random_pool)
+    user_event_controller = UserEventController(config, random_pool)
+    log_renderer = LogRenderer(config, db_client)  # LogContents/LogSink 공용 바이트 템플릿
+    log_contents = LogContents(config, db_client, log_renderer, random_pool)
+    log_sink = LogSink(config, log_renderer)
 
     print("✅ 모든 모듈 초기화 완료")
 
@@ -107,7 +126,7 @@ def run_batch_mode(
        - UserSelector: 유저 선택 (신규/기존) + 현재 상태 확인
        - UserEventController: 상태 기반 다음 액션(로그 타입) 결정 + 상태 전이
        - LogContents: 해당 로그 타입의 실제 내용 생성 (DB 조회 포함)
-       - LogSink: 로그 출력 (MPS 제어 포함)
+       - LogOrderer: 이벤트 시각 순서로 정렬 후 LogSink로 출력 (MPS 제어 포함)
     """
     target_months = config["global"]["target_months"]
 
@@ -133,19 +152,21 @@ def run_batch_mode(
 
         # ===== 실행 =====
         log_count = 0
+        heartbeat_count = 0  # contents-playing (playing_interval_seconds > 0일 때만 발생)
         start_time = time.time()
+        log_orderer = LogOrderer(config, log_sink)
 
         # Stage 1: 타임스탬프 생성
         timestamps = date_generator.generate_timestamps(month, total_logs)
 
         # Stage 2-5: 각 타임스탬프 처리(1개월기준의 타임스템프가 시간 순서대로 송출)
-        for timestamp in timestamps:
-            # Stage 2: 유저 선택 (신규/기존 + 현재 상태)
-            user, current_state = user_selector.select_user(timestamp)
+        for timestamp, region in timestamps:
+            # Stage 2: 유저 선택 (신규/기존 + 현재 상태, 타임스탬프 지역의 유저)
+            user, current_state = user_selector.select_user(timestamp, region)
 
             # Stage 3: 상태 기반 다음 액션 결정 + 상태 전이
             # (user_controller가 첫 로그인 시 access-in을 자동으로 반환)
-            event_type, next_state, additional_data = user_event_controller.select_event(
+            transition, additional_data = user_event_controller.select_transition(
                 user=user,
                 current_state=current_state
             )
@@ -153,32 +174,41 @@ def run_batch_mode(
             # Stage 4: 로그 내용 생성 (DB 조회 포함)
             log_event = log_contents.generate(
                 user=user,
-                event_type=event_type,
+                transition=transition,
                 timestamp=timestamp,
                 additional_data=additional_data
             )
 
             # 상태 업데이트
-            user_selector.update_user_state(user, next_state)
+            user_selector.update_user_state(user, transition.next_state)
 
-            # Stage 5: 로그 출력
+            # Stage 5: 생성기 시계까지 지난 로그 방출 후 새 로그를 정렬 힙에 추가
+            log_orderer.advance(timestamp)
             if log_event:
+                # 일반 로그 (LogRecord도 튜플이므로 먼저 확인)
+                if isinstance(log_event, LogRecord):
+                    log_orderer.write(log_event)
+                    log_count += 1
                 # log_event가 튜플인 경우 (contents-start 패턴: (로그 리스트, 패턴 종료 시간))
-                if isinstance(log_event, tuple):
+                elif isinstance(log_event, tuple):
                     logs, pattern_end_time = log_event
                     # 유저를 패턴 종료 시간까지 차단
                     user.blocked_until = pattern_end_time
                     for single_log in logs:
-                        log_sink.write(single_log)
-                        log_count += 1
+                        log_orderer.write(single_log)
+                        # PlaybackSession은 heartbeat 수만큼 따로 카운트 (total_logs 목표/달성률에서 제외)
+                        if isinstance(single_log, PlaybackSession):
+                            heartbeat_count += single_log.heartbeat_count()
+                        else:
+                            log_count += 1
                 # log_event가 리스트인 경우 (하위 호환성 유지)
                 elif isinstance(log_event, list):
                     for single_log in log_event:
-                        log_sink.write(single_log)
+                        log_orderer.write(single_log)
                         log_count += 1
                 # 일반 로그
                 else:
-                    log_sink.write(log_event)
+                    log_orderer.write(log_event)
                     log_count += 1
 
             # 진행 상황 출력
@@ -189,15 +219,21 @@ def run_batch_mode(
                 print(f"   진행: {log_count:,}/{total_logs:,} ({progress:.2f}%) | "
                       f"경과: {elapsed:.1f}초 | MPS: {current_mps:.1f}")
 
+        # 남은 로그(월말 이후 시각의 재생 로그 포함) 방출
+        log_orderer.flush()
+
         # 월별 완료
         total_elapsed = time.time() - start_time
         print(f"\n✅ {month} 로그 생성 완료!")
         print(f"   총 로그: {log_count:,}개")
         print(f"   목표: {total_logs:,}개")
         print(f"   달성률: {(log_count / total_logs * 100):.2f}%")
+        if heartbeat_count:
+            print(f"   heartbeat (contents-playing): {heartbeat_count:,}개 (목표/달성률 제외)")
+            print(f"   출력 합계: {log_count + heartbeat_count:,}개")
         print(f"   소요 시간: {total_elapsed:.1f}초")
         if total_elapsed > 0:
-            print(f"   평균 MPS: {log_count / total_elapsed:.1f}")
+            print(f"   평균 MPS: {(log_count + heartbeat_count) / total_elapsed:.1f}")
 
 
 
@@ -219,25 +255,27 @@ def run_streaming_mode(
        - UserSelector: 유저 선택 (신규/기존) + 현재 상태 확인
        - UserEventController: 상태 기반 다음 액션 결정 + 상태 전이
        - LogContents: 로그 내용 생성
-       - LogSink: 로그 출력 (MPS 제어 포함)
+       - LogOrderer: 이벤트 시각 순서로 정렬 후 LogSink로 출력 (MPS 제어 포함)
     """
     print(f"\n🌊 Streaming 모드")
     print(f"⚠️  종료하려면 Ctrl+C를 누르세요\n")
 
     log_count = 0
+    heartbeat_count = 0  # contents-playing (playing_interval_seconds > 0일 때만 발생)
     start_time = time.time()
+    log_orderer = LogOrderer(config, log_sink)
 
     try:
         while True:
-            # Stage 1: 현재 타임스탬프
-            timestamp = date_generator.generate_now()
+            # Stage 1: 현재 타임스탬프 + 지역
+            timestamp, region = date_generator.generate_now()
 
             # Stage 2: 유저 선택
-            user, current_state = user_selector.select_user(timestamp)
+            user, current_state = user_selector.select_user(timestamp, region)
 
             # Stage 3: 상태 기반 다음 액션 결정 + 상태 전이
             # (user_controller가 첫 로그인 시 access-in을 자동으로 반환)
-            event_type, next_state, additional_data = user_event_controller.select_event(
+            transition, additional_data = user_event_controller.select_transition(
                 user=user,
                 current_state=current_state
             )
@@ -245,32 +283,41 @@ def run_streaming_mode(
             # Stage 4: 로그 내용 생성
             log_event = log_contents.generate(
                 user=user,
-                event_type=event_type,
+                transition=transition,
                 timestamp=timestamp,
                 additional_data=additional_data
             )
 
             # 상태 업데이트
-            user_selector.update_user_state(user, next_state)
+            user_selector.update_user_state(user, transition.next_state)
 
-            # Stage 5: 로그 출력
+            # Stage 5: 생성기 시계까지 지난 로그 방출 후 새 로그를 정렬 힙에 추가
+            log_orderer.advance(timestamp)
             if log_event:
+                # 일반 로그 (LogRecord도 튜플이므로 먼저 확인)
+                if isinstance(log_event, LogRecord):
+                    log_orderer.write(log_event)
+                    log_count += 1
                 # log_event가 튜플인 경우 (contents-start 패턴: (로그 리스트, 패턴 종료 시간))
-                if isinstance(log_event, tuple):
+                elif isinstance(log_event, tuple):
                     logs, pattern_end_time = log_event
                     # 유저를 패턴 종료 시간까지 차단
                     user.blocked_until = pattern_end_time
                     for single_log in logs:
-                        log_sink.write(single_log)
-                        log_count += 1
+                        log_orderer.write(single_log)
+                        # PlaybackSession은 heartbeat 수만큼 따로 카운트 (total_logs 목표/달성률에서 제외)
+                        if isinstance(single_log, PlaybackSession):
+                            heartbeat_count += single_log.heartbeat_count()
+                        else:
+                            log_count += 1
                 # log_event가 리스트인 경우 (하위 호환성 유지)
                 elif isinstance(log_event, list):
                     for log in log_event:
-                        log_sink.write(log)
+                        log_orderer.write(log)
                         log_count += 1
                 # 일반 로그
                 else:
-                    log_sink.write(log_event)
+                    log_orderer.write(log_event)
                     log_count += 1
 
             # 진행 상황 출력
@@ -281,11 +328,14 @@ def run_streaming_mode(
 
     except KeyboardInterrupt:
         print("\n⚠️  사용자에 의해 중단됨")
+        log_orderer.flush()
         total_elapsed = time.time() - start_time
         print(f"   총 로그: {log_count:,}개")
+        if heartbeat_count:
+            print(f"   heartbeat (contents-playing): {heartbeat_count:,}개")
         print(f"   소요 시간: {total_elapsed:.1f}초")
         if total_elapsed > 0:
-            print(f"   평균 MPS: {log_count / total_elapsed:.1f}")
+            print(f"   평균 MPS: {(log_count + heartbeat_count) / total_elapsed:.1f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""
+파이프라인 내부 로그 레코드 정의
+
+LogContents → main → LogSink 사이에서 로그 1건을 표현하는 경량 튜플
+timestamp는 UTC epoch 밀리초 정수 (ISO 문자열은 LogRenderer 직렬화 시점에만 생성)
+detail은 dict 대신 LogRenderer가 미리 인코딩한 JSON 객체 바이트
+(필드 구성/순서는 log_detail_schemas.py의 스키마를 따름)
+"""
+from typing import Iterator, NamedTuple, Tuple
+
+
+class LogRecord(NamedTuple):
+    """로그 1건 (직렬화는 LogSink에서 LogRenderer로 수행)"""
+    timestamp: int  # UTC epoch ms
+    user_id: int
+    event_category: int
+    event_type: int
+    detail: bytes  # 예: b'{"platform": 1}'
+
+
+# contents-playing (heartbeat) 코드
+PLAYING_EVENT_CATEGORY = 2  # contents
+PLAYING_EVENT_TYPE = 13     # playing
+
+
+class PlaybackSession(NamedTuple):
+    """
+    재생 구간의 contents-playing heartbeat 묶음
+
+    heartbeat를 개별 LogRecord로 만들지 않고 (기준 시각, 재생 구간, 간격)만 전달하고
+    LogOrderer가 방출 시점에 records()로 하나씩 전개함
+
+    segments의 각 구간 (first, end)는 기준 시각으로부터의 ms 단위 오프셋이며
+    first, first + interval, first + 2 × interval, ... (< end) 시각에 heartbeat 1건씩 발생
+    """
+    timestamp: int                            # 기준 시각 (UTC epoch ms, 첫 heartbeat 이전)
+    user_id: int
+    detail: bytes                             # 재생 로그와 같은 detail
+    segments: Tuple[Tuple[int, int], ...]
+    interval: int                             # heartbeat 간격 (ms)
+
+    def heartbeat_count(self) -> int:
+        """전개했을 때의 heartbeat 로그 수"""
+        return sum(
+            -((first - end) // self.interval) for first, end in self.segments if end > first
+        )
+
+
+    def records(self) -> Iterator[LogRecord]:
+        """heartbeat LogRecord를 시간순으로 하나씩 생성"""
+        base = self.timestamp
+        interval = self.interval
+        user_id = self.user_id
+        detail = self.detail
+        for first, end in self.segments:
+            for timestamp in range(base + first, base + end, interval):
+                yield LogRecord(timestamp, user_id, PLAYING_EVENT_CATEGORY, PLAYING_EVENT_TYPE, detail)
+
@@ -0,0 +1,177 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.random_pool import RandomPool
+
+
+# 세그먼트 기준 (셀 키 (국가, 구독 여부)에서 꺼낼 값의 위치)
+SEGMENT_KEYS = {
+    "country": 0,
+    "subscribed": 1,
+}
+
+
+class ActiveUserIndex:
+    """
+    활성 유저(account_status = 'active') 캐시 + 세그먼트 인덱스 (DBClient.get_random_users용)
+
+    책임:
+    - 활성 유저를 (국가, 구독 여부) 셀별 user_id 배열(array('q'))로 보관 (DB는 keyset scan으로 1회만 조회)
+    - 변경 반영: 신규 유저 추가 O(1), 탈퇴 시 마지막 원소와 교체하여 O(1) 제거, 구독 변경 시 셀 이동
+    - 비복원 추출: 전체(또는 세그먼트) 크기 범위에서 RandomPool.sample 후 셀 누적 오프셋으로 매핑 (정렬/셔플 없음)
+    - 층화 추출: 세그먼트(국가 또는 구독 여부)별 비율로 인원 배분, 부족분은 나머지 유저에서 채움
+
+    셀 순서는 최초 등장 순서 (keyset scan이 user_id 오름차순이므로 seed 고정 시 재현 가능)
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, bool, str]] = (), random_pool: Optional[RandomPool] = None):
+        """
+        Args:
+            rows: (user_id, 구독 여부, 국가 코드) (user_id 오름차순 권장)
+            random_pool: 추출용 난수 (없으면 새로 생성, DBClient와 공유 권장)
+        """
+        self.random_pool = random_pool or RandomPool({})
+        self._cells: Dict[Tuple[str, bool], array] = {}
+        self._position: Dict[int, Tuple[Tuple[str, bool], int]] = {}  # user_id → (셀 키, 셀 내 위치)
+        for user_id, subscribed, country in rows:
+            self.add(user_id, subscribed, country)
+
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._position
+
+
+    # ========== 변경 반영 ==========
+
+    def add(self, user_id: int, subscribed: bool, country: Optional[str]):
+        """활성 유저 추가 (이미 있으면 무시)"""
+        if user_id in self._position:
+            return
+        key = (country or "", bool(subscribed))
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = array('q')
+        self._position[user_id] = (key, len(cell))
+        cell.append(user_id)
+
+
+    def remove(self, user_id: int):
+        """활성 유저 제거 (탈퇴, 마지막 원소를 빈 자리로 옮겨 O(1))"""
+        entry = self._position.pop(user_id, None)
+        if entry is None:
+            return
+        key, pos = entry
+        cell = self._cells[key]
+        last = cell.pop()
+        if last != user_id:
+            cell[pos] = last
+            self._position[last] = (key, pos)
+
+
+    def set_subscribed(self, user_id: int, subscribed: bool):
+        """구독 여부 변경 (셀 이동)"""
+        entry = self._position.get(user_id)
+        if entry is None or entry[0][1] == bool(subscribed):
+            return
+        country = entry[0][0]
+        self.remove(user_id)
+        self.add(user_id, subscribed, country)
+
+
+    # ========== 추출 ==========
+
+    def sample(self, k: int, segment_by: Optional[str] = None,
+               shares: Optional[Dict[Hashable, float]] = None) -> List[Dict]:
+        """
+        활성 유저 비복원 추출
+
+        Args:
+            k: 추출 인원
+            segment_by: None(전체 균등), "country", "subscribed"
+            shares: 세그먼트 값 → 비율 (예: {"KR": 0.8, "JP": 0.2}, {True: 0.6, False: 0.4})
+
+        Returns:
+            [{"user_id": 1, "is_subscribed": 1, "country": "KR"}, ...]
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+
+        if segment_by is None or not shares:
+            keys = list(self._cells)
+            return [self._row(key, user_id) for key, user_id in self._sample_cells(keys, k)]
+
+        # 세그먼트별 셀 목록 (세그먼트 값 → 셀 키 목록)
+        index = SEGMENT_KEYS[segment_by]
+        segments: Dict[Hashable, List[Tuple[str, bool]]] = {}
+        for key in self._cells:
+            segments.setdefault(key[index], []).append(key)
+
+        # 존재하는 세그먼트끼리 비율 재정규화 후 인원 배분 (세그먼트 크기 상한)
+        present = {value: share for value, share in shares.items() if value in segments and share > 0}
+        total_share = sum(present.values())
+        chosen: List[Tuple[Tuple[str, bool], int]] = []
+        if total_share > 0:
+            for value, share in present.items():
+                cells = segments[value]
+                size = sum(len(self._cells[key]) for key in cells)
+                quota = min(size, round(k * share / total_share))
+                chosen.extend(self._sample_cells(cells, quota))
+
+        # 부족분(비율 반올림/세그먼트 부족)은 아직 뽑히지 않은 유저 중 균등 추출
+        if len(chosen) < k:
+            taken = {user_id for _, user_id in chosen}
+            chosen.extend(self._sample_rest(k - len(chosen), taken))
+        return [self._row(key, user_id) for key, user_id in chosen[:k]]
+
+
+    def _sample_cells(self, keys: List[Tuple[str, bool]], k: int) -> List[Tuple[Tuple[str, bool], int]]:
+        """셀 합집합에서 k명 비복원 추출 (위치 추출 → 누적 오프셋 이진 탐색)"""
+        offsets = []
+        total = 0
+        for key in keys:
+            offsets.append(total)
+            total += len(self._cells[key])
+        k = min(k, total)
+        if k <= 0:
+            return []
+
+        result = []
+        for i in self.random_pool.sample(range(total), k):
+            c = bisect_right(offsets, i) - 1
+            key = keys[c]
+            result.append((key, self._cells[key][i - offsets[c]]))
+        return result
+
+
+    def _sample_rest(self, k: int, taken: set) -> List[Tuple[Tuple[str, bool], int]]:
+        """taken에 없는 유저 중 k명 균등 추출 (거의 다 뽑힌 경우에는 나머지를 모아서 추출)"""
+        keys = list(self._cells)
+        remaining = len(self) - len(taken)
+        k = min(k, remaining)
+        if k <= 0:
+            return []
+
+        if len(taken) > remaining:
+            rest = [(key, user_id) for key in keys for user_id in self._cells[key] if user_id not in taken]
+            return self.random_pool.sample(rest, k)
+
+        result = []
+        seen = set(taken)
+        while len(result) < k:
+            for key, user_id in self._sample_cells(keys, k - len(result)):
+                if user_id not in seen:
+                    seen.add(user_id)
+                    result.append((key, user_id))
+        return result
+
+
+    @staticmethod
+    def _row(key: Tuple[str, bool], user_id: int) -> Dict:
+        country, subscribed = key
+        return {"user_id": user_id, "is_subscribed": int(subscribed), "country": country or None}
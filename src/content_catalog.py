@@ -0,0 +1,241 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from schemas.enum import ContentType
+from src.sampling import AliasTable, FenwickSampler
+
+
+class ContentRecord(NamedTuple):
+    """카탈로그에 고정된 콘텐츠 1건 (읽기 전용, 조회 시 복사 없이 그대로 반환)"""
+    slot: int                    # 카탈로그 내 정수 인덱스
+    contents_id: str             # 예: "movie_123", "tv_456"
+    contents_type: str           # DB 원본 타입 ("tv" / "movie")
+    type_code: int               # ContentType 코드 (tv=series=1, movie=single=2)
+    title: Optional[str]
+    genre: Optional[str]
+    runtime: Optional[int]
+    popularity: float
+    episode_ids: Tuple[str, ...] # ("ep_01", "ep_02", ...) (영화는 빈 튜플)
+    genre_codes: Tuple[int, ...] # genre_names를 분리한 장르 코드 (ContentCatalog.genres 인덱스)
+    release_date: Optional[date] # 공개일 (없거나 형식이 잘못되면 None)
+
+
+class ContentCatalog:
+    """
+    콘텐츠 카탈로그 인덱스 (콘텐츠 불변, 선택 가중치만 갱신 가능)
+
+    책임:
+    - contents_id → 정수 slot 매핑 (O(1) 조회)
+    - 콘텐츠별 타입 코드/에피소드 ID 튜플을 로드 시 1회 계산
+    - 인기도 가중치 alias 테이블로 O(1) 랜덤 선택 (선택적으로 Zipf 순위 가중치로 재구성)
+    - genre_names("액션, 드라마")를 장르 코드로 분리하고 장르별 alias 테이블 구성
+    - enable_dynamic_weights() 이후에는 Fenwick 트리로 전환하여 slot별 가중치 갱신 O(log n)
+      (ContentTrend가 시간대마다 변한 콘텐츠만 갱신)
+    - 다른 모듈의 콘텐츠 부분집합(검색어별 매칭 등)을 slot 그룹으로 등록받아 같은 가중치로 선택
+      (가중치 갱신 시 그룹 샘플러도 함께 갱신)
+
+    주의:
+    - 조회 결과는 공유되는 ContentRecord이므로 복사/수정하지 않음
+    - weights는 기본 가중치(로드 시 값)이며 갱신되지 않음
+    """
+
+    def __init__(self, contents: Iterable[Dict], zipf_exponent: float = 0.0):
+        """
+        Args:
+            contents: DB에서 조회한 콘텐츠 dict (스트리밍 가능, 인기도 내림차순이어야 Zipf 순위가 맞음)
+                (contents_id, contents_type, title, genre, runtime, popularity, number_of_episodes, release_date)
+            zipf_exponent: 0보다 크면 인기도 순위 r의 가중치를 1 / r^zipf_exponent로 재구성
+                (0이면 popularity 값을 그대로 가중치로 사용)
+        """
+        records = []
+        self.genres: Tuple[str, ...] = ()
+        self.genre_index: Dict[str, int] = {}
+        genre_names: List[str] = []
+        episode_names: Tuple[str, ...] = ()  # 공유 에피소드 ID ("ep_01", ...) (콘텐츠 간 문자열 재사용)
+        for slot, content in enumerate(contents):
+            contents_type = content["contents_type"]
+            num_episodes = int(content.get("number_of_episodes") or 0)
+            if num_episodes > len(episode_names):
+                episode_names += tuple(f"ep_{i:02d}" for i in range(len(episode_names) + 1, num_episodes + 1))
+            records.append(ContentRecord(
+                slot=slot,
+                contents_id=content["contents_id"],
+                contents_type=contents_type,
+                type_code=ContentType.SERIES.value if contents_type == "tv" else ContentType.SINGLE.value,
+                title=content.get("title"),
+                genre=content.get("genre"),
+                runtime=content.get("runtime"),
+                popularity=float(content.get("popularity") or 0.0),
+                episode_ids=episode_names[:num_episodes],
+                genre_codes=self._intern_genres(content.get("genre"), genre_names),
+                release_date=self._parse_date(content.get("release_date")),
+            ))
+        self.genres = tuple(genre_names)
+
+        self.records: Tuple[ContentRecord, ...] = tuple(records)
+        self.slot_by_id: Dict[str, int] = {record.contents_id: record.slot for record in self.records}
+
+        # 인기도 가중치 alias 테이블 (인기도가 모두 0이면 균등 선택, 콘텐츠가 없으면 None)
+        self.popularity_sampler: Optional[Union[AliasTable, FenwickSampler]] = None
+        self.weights: List[float] = []
+        if self.records:
+            if zipf_exponent > 0:
+                weights = [1.0 / (rank ** zipf_exponent) for rank in range(1, len(self.records) + 1)]
+            else:
+                weights = [record.popularity for record in self.records]
+                if sum(weights) <= 0:
+                    weights = [1.0] * len(self.records)
+            self.weights = weights
+            self.popularity_sampler = AliasTable(weights)
+
+        # 장르별 (alias 테이블, slot 튜플) + 장르 전체 가중치 (유저 선호 장르 선택용)
+        genre_slots: List[List[int]] = [[] for _ in self.genres]
+        for record in self.records:
+            for code in record.genre_codes:
+                genre_slots[code].append(record.slot)
+        self.genre_samplers: List[Tuple[Union[AliasTable, FenwickSampler], Tuple[int, ...]]] = [
+            (AliasTable([self.weights[slot] for slot in slots]), tuple(slots))
+            for slots in genre_slots
+        ]
+        self.genre_weights: List[float] = [
+            sum(self.weights[slot] for slot in slots) for slots in genre_slots
+        ]
+
+        # 가중치 갱신용 (enable_dynamic_weights 이후 사용): slot → ((장르 코드, 장르 내 위치), ...)
+        self.dynamic = False
+        self._genre_positions: List[Tuple[Tuple[int, int], ...]] = []
+
+        # 외부 등록 slot 그룹별 (샘플러, slot 튜플) + slot → ((그룹 번호, 그룹 내 위치), ...)
+        self.group_samplers: List[Tuple[Union[AliasTable, FenwickSampler], Tuple[int, ...]]] = []
+        self._group_positions: List[List[Tuple[int, int]]] = [[] for _ in self.records]
+
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+    def __iter__(self) -> Iterator[ContentRecord]:
+        return iter(self.records)
+
+
+    def get(self, contents_id: str) -> Optional[ContentRecord]:
+        """contents_id로 콘텐츠 조회 (없으면 None)"""
+        slot = self.slot_by_id.get(contents_id)
+        if slot is None:
+            return None
+        return self.records[slot]
+
+
+    def sample(self, u: Optional[float] = None) -> ContentRecord:
+        """인기도 가중치로 콘텐츠 1개 선택"""
+        return self.records[self.popularity_sampler.sample(u)]
+
+
+    def sample_genre(self, genre_code: int, u: Optional[float] = None) -> ContentRecord:
+        """특정 장르 안에서 인기도 가중치로 콘텐츠 1개 선택"""
+        sampler, slots = self.genre_samplers[genre_code]
+        return self.records[slots[sampler.sample(u)]]
+
+
+    def add_group(self, slots: Iterable[int]) -> int:
+        """
+        slot 그룹 등록 (현재 선택 가중치로 샘플러 구성, 이후 set_weight 갱신이 반영됨)
+
+        Args:
+            slots: 그룹에 속한 slot들 (비어 있으면 안 됨)
+
+        Returns:
+            그룹 번호 (sample_group에 사용)
+        """
+        slots = tuple(slots)
+        group = len(self.group_samplers)
+        if self.dynamic:
+            current = self.popularity_sampler.weights
+            sampler = FenwickSampler([current[slot] for slot in slots])
+        else:
+            sampler = AliasTable([self.weights[slot] for slot in slots])
+        self.group_samplers.append((sampler, slots))
+        for position, slot in enumerate(slots):
+            self._group_positions[slot].append((group, position))
+        return group
+
+
+    def sample_group(self, group: int, u: Optional[float] = None) -> Optional[ContentRecord]:
+        """
+        등록된 slot 그룹 안에서 현재 선택 가중치로 콘텐츠 1개 선택
+
+        가중치 갱신 중에는 현재 가중치가 0인 콘텐츠(미공개 등)를 반환하지 않음
+        (그룹 전체가 0이면 None)
+        """
+        sampler, slots = self.group_samplers[group]
+        index = sampler.sample(u)
+        if self.dynamic and sampler.weights[index] <= 0.0:
+            return None
+        return self.records[slots[index]]
+
+
+    # ========== 가중치 갱신 ==========
+
+    def enable_dynamic_weights(self):
+        """전체/장르별/그룹별 샘플러를 Fenwick 트리로 전환 (가중치 갱신 가능, 선택은 O(log n))"""
+        if self.dynamic or not self.records:
+            return
+
+        self.popularity_sampler = FenwickSampler(self.weights)
+        positions: List[List[Tuple[int, int]]] = [[] for _ in self.records]
+        samplers = []
+        for code, (_, slots) in enumerate(self.genre_samplers):
+            samplers.append((FenwickSampler([self.weights[slot] for slot in slots]), slots))
+            for position, slot in enumerate(slots):
+                positions[slot].append((code, position))
+        self.genre_samplers = samplers
+        self._genre_positions = [tuple(p) for p in positions]
+        self.group_samplers = [
+            (FenwickSampler([self.weights[slot] for slot in slots]), slots)
+            for _, slots in self.group_samplers
+        ]
+        self.dynamic = True
+
+
+    def set_weight(self, slot: int, weight: float):
+        """slot의 현재 선택 가중치 변경 (전체 + 소속 장르/그룹 샘플러, enable_dynamic_weights 이후만)"""
+        self.popularity_sampler.update(slot, weight)
+        genre_samplers = self.genre_samplers
+        for code, position in self._genre_positions[slot]:
+            genre_samplers[code][0].update(position, weight)
+        group_samplers = self.group_samplers
+        for group, position in self._group_positions[slot]:
+            group_samplers[group][0].update(position, weight)
+
+
+    def _intern_genres(self, genre: Optional[str], genre_names: List[str]) -> Tuple[int, ...]:
+        """"액션, 드라마" → 장르 코드 튜플 (처음 보는 장르는 코드 추가)"""
+        if not genre:
+            return ()
+        codes = []
+        for name in genre.split(","):
+            name = name.strip()
+            if not name:
+                continue
+            code = self.genre_index.get(name)
+            if code is None:
+                code = len(genre_names)
+                genre_names.append(name)
+                self.genre_index[name] = code
+            codes.append(code)
+        return tuple(codes)
+
+
+    @staticmethod
+    def _parse_date(value) -> Optional[date]:
+        """DB 공개일 → date (MySQL은 date, SQLite는 "YYYY-MM-DD" 문자열)"""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value)[:10])
+        except ValueError:
+            return None
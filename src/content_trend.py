@@ -0,0 +1,144 @@
+import math
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+
+from src.content_catalog import ContentCatalog
+
+
+# 공개 부스트가 기본 가중치의 이 비율 미만으로 줄어들면 더 이상 갱신하지 않음
+SETTLE_RATIO = 0.01
+
+
+class ContentTrend:
+    """
+    시간에 따라 변하는 콘텐츠 인기도 (트렌드)
+
+    책임:
+    - 콘텐츠 선택 가중치 = 기본 가중치 × 공개 부스트 × 트렌딩 스파이크
+      - 공개 전: 0 (선택되지 않음)
+      - 공개 부스트: 1 + release_boost × exp(-공개 후 경과일 / release_decay_days)
+      - 트렌딩 스파이크: [[content_trend.spikes]] 기간 동안 1 + boost × exp(-시작 후 경과일 / decay_days)
+    - update_interval_hours마다 변하는 콘텐츠(공개 직후/공개 예정/스파이크 예정·진행)만 카탈로그 가중치 갱신
+      (ContentCatalog Fenwick 트리, 콘텐츠 1개당 O(log n), 전체 재구성 없음)
+    - 부스트가 충분히 줄어든 콘텐츠는 기본 가중치로 고정하고 갱신 대상에서 제외
+
+    사용 (타임스탬프는 UTC epoch ms):
+        if timestamp >= trend.next_update:
+            trend.advance(timestamp)
+    """
+
+    def __init__(self, config: dict, catalog: Optional[ContentCatalog]):
+        """
+        Args:
+            config: config.toml 전체 dict
+            catalog: 콘텐츠 카탈로그 (없거나 enabled = false면 아무 것도 하지 않음)
+        """
+        trend_config = config.get("content_trend", {})
+        self.enabled = bool(trend_config.get("enabled", False)) and bool(catalog)
+        self.catalog = catalog
+        self.release_boost = trend_config.get("release_boost", 4.0)
+        self.release_decay_days = trend_config.get("release_decay_days", 14)
+        self.update_interval = max(1, int(trend_config.get("update_interval_hours", 1) * 3_600_000))  # ms
+        self.tz = pytz.timezone(config.get("global", {}).get("timezone", "Asia/Seoul"))  # 공개일/스파이크 기준
+
+        # 공개 부스트 갱신 기간 (부스트가 SETTLE_RATIO 미만이 되는 경과일)
+        if self.release_boost > SETTLE_RATIO:
+            self.settle_days = self.release_decay_days * math.log(self.release_boost / SETTLE_RATIO)
+        else:
+            self.settle_days = 0.0
+
+        # 다음 갱신 시각 (epoch ms, 비활성화면 갱신하지 않음)
+        self.next_update = sys.maxsize
+        self._initialized = False
+        self._dynamic_slots: List[int] = []
+        self._spikes: Dict[int, List[Tuple[datetime, datetime, float, float]]] = {}
+
+        if not self.enabled:
+            return
+
+        self.next_update = 0
+        self._spikes = self._load_spikes(trend_config.get("spikes", []))
+        catalog.enable_dynamic_weights()
+        print(f"✅ ContentTrend 초기화 완료 (공개 부스트 ×{1 + self.release_boost:g}, "
+              f"반감 {self.release_decay_days * math.log(2):.1f}일, 스파이크 {sum(map(len, self._spikes.values()))}개)")
+
+
+    def _load_spikes(self, specs: List[dict]) -> Dict[int, List[Tuple[datetime, datetime, float, float]]]:
+        """[[content_trend.spikes]] → slot별 (시작, 끝, boost, decay_days) 목록 (카탈로그에 없는 콘텐츠는 무시)"""
+        spikes: Dict[int, List[Tuple[datetime, datetime, float, float]]] = {}
+        for spec in specs:
+            slot = self.catalog.slot_by_id.get(spec["contents_id"])
+            if slot is None:
+                print(f"⚠️  트렌딩 스파이크 콘텐츠 {spec['contents_id']}가 카탈로그에 없어 무시합니다.")
+                continue
+            start = datetime.fromisoformat(str(spec["start"]))
+            end = start + timedelta(days=spec.get("days", 7))
+            spikes.setdefault(slot, []).append(
+                (start, end, float(spec.get("boost", 5.0)), float(spec.get("decay_days", 2.0)))
+            )
+        return spikes
+
+
+    def multiplier(self, slot: int, now: datetime) -> Tuple[float, bool]:
+        """
+        now 시점의 가중치 배수
+
+        Args:
+            slot: 카탈로그 slot
+            now: 현지 시각 (타임존 없는 값, 공개일/스파이크 시각과 같은 기준)
+
+        Returns:
+            (배수, 이후에도 변하는지 여부)
+        """
+        factor = 1.0
+        changing = False
+
+        release_date = self.catalog.records[slot].release_date
+        if release_date is not None:
+            age_days = (now - datetime(release_date.year, release_date.month, release_date.day)).total_seconds() / 86400
+            if age_days < 0:
+                return 0.0, True
+            if age_days < self.settle_days:
+                factor += self.release_boost * math.exp(-age_days / self.release_decay_days)
+                changing = True
+
+        for start, end, boost, decay_days in self._spikes.get(slot, ()):
+            if now < end:
+                changing = True
+                if now >= start:
+                    factor *= 1.0 + boost * math.exp(-(now - start).total_seconds() / 86400 / decay_days)
+
+        return factor, changing
+
+
+    def advance(self, now: int):
+        """
+        now가 속한 갱신 구간의 가중치로 카탈로그 갱신
+
+        최초 호출 시 전체 콘텐츠를 계산하고, 이후에는 변하는 콘텐츠만 갱신
+
+        Args:
+            now: 생성 타임스탬프 (UTC epoch ms)
+        """
+        if not self.enabled or now < self.next_update:
+            return
+
+        bucket = now - now % self.update_interval  # 갱신 간격 경계 (epoch 기준)
+        local = datetime.fromtimestamp(bucket // 1000, self.tz).replace(tzinfo=None)
+        catalog = self.catalog
+        weights = catalog.weights
+        slots = self._dynamic_slots if self._initialized else range(len(catalog))
+        self._initialized = True
+
+        dynamic = []
+        for slot in slots:
+            factor, changing = self.multiplier(slot, local)
+            catalog.set_weight(slot, weights[slot] * factor)
+            if changing:
+                dynamic.append(slot)
+        self._dynamic_slots = dynamic
+
+        self.next_update = bucket + self.update_interval
@@ -1,34 +1,141 @@
-import random
 import calendar
-from datetime import datetime
-from typing import Generator
+import time
+from datetime import datetime, timezone
+from typing import Generator, NamedTuple, Optional, Tuple
+
+import numpy as np
 import pytz
 
+from src.random_pool import RandomPool
+
+
+# [date_generator.regions]가 없을 때의 단일 지역 코드
+DEFAULT_REGION_CODE = "KR"
+
+# 하루 분 단위 슬롯 수 (시간대 곡선 해상도)
+MINUTES_PER_DAY = 1440
+
+# 스트리밍 생성 단위 (분 슬롯 수, 이 단위로만 정렬하여 반환)
+MINUTES_PER_HOUR = 60
+
+
+def load_region_specs(config: dict) -> dict:
+    """[date_generator.regions] 중 share > 0인 지역 정의 (순서 = 지역 인덱스)"""
+    specs = config.get("date_generator", {}).get("regions", {})
+    return {code: spec for code, spec in specs.items() if spec.get("share", 0.0) > 0}
+
+
+def region_codes(config: dict) -> Tuple[str, ...]:
+    """지역 인덱스 → 국가 코드 (LogDateGenerator.regions와 같은 순서)"""
+    return tuple(load_region_specs(config)) or (DEFAULT_REGION_CODE,)
+
+
+def local_epochs(epochs: np.ndarray, tz) -> np.ndarray:
+    """
+    UTC epoch 초 배열(오름차순) → 같은 순간의 현지 시각을 UTC처럼 표현한 epoch 초 (tz의 UTC 오프셋 적용)
+
+    UTC 시간당 오프셋을 1회만 계산하고, 시간 안에서 오프셋이 바뀌는 경우
+    (정시가 아닌 DST 전환, 예: Australia/Adelaide 16:30 UTC)만 값마다 다시 계산
+    """
+    if len(epochs) == 0:
+        return epochs
+
+    def offset(epoch: int) -> int:
+        return int(datetime.fromtimestamp(epoch, tz).utcoffset().total_seconds())
+
+    first_hour = int(epochs[0]) - int(epochs[0]) % 3600
+    hour_index = (epochs - first_hour) // 3600
+    # 마지막 시간의 끝 경계까지 포함 (시간 시작/끝 오프셋 비교용)
+    offsets = np.array([offset(epoch) for epoch in range(first_hour, int(epochs[-1]) + 3601, 3600)], dtype=np.int64)
+    local = epochs + offsets[hour_index]
+
+    for hour in np.flatnonzero(offsets[:-1] != offsets[1:]).tolist():
+        inside = hour_index == hour
+        local[inside] = [epoch + offset(epoch) for epoch in epochs[inside].tolist()]
+    return local
+
+
+class Region(NamedTuple):
+    """트래픽 지역 1개 (users.country 코드 단위)"""
+    code: str                  # 국가 코드 (예: "KR")
+    tz: object                 # pytz 타임존
+    share: float               # 전체 트래픽 중 비율
+    minute_weights: np.ndarray # 현지 시각 0~1439분 가중치 (분당)
+
 
 class LogDateGenerator:
     """
     타임스탬프 생성기
-    
+
     책임:
     - 월별 총 로그 개수 계산 (DAU × 1인당 로그 × 일수)
-    - 요일/시간대별 가중치 기반 타임스탬프 생성
-    - Generator 패턴으로 메모리 효율적 반환
+    - 지역(국가)별 타임존/시간대 곡선을 UTC 분 단위 가중치 표(지역 × 분, 월 43,200칸 내외)로 1회 컴파일
+    - 분별 로그 수를 다항분포로 1회 추첨 후 시간 단위로 ms epoch/지역을 NumPy로 생성 (월 전체를 메모리에 두지 않음)
+    - Generator 패턴으로 (UTC epoch ms, 지역 인덱스)를 시간 순서대로 반환
+
+    시간대 곡선 (현지 시각 기준, 분 단위):
+    - intraday_curve: "HH:MM" = 상대 가중치 제어점을 선형 보간 (23:59 이후는 첫 제어점으로 이어짐)
+    - hour_distribution: 구간 가중치를 구간 내 분마다 균등 배분 (계단형)
+
+    타임존:
+    - 타임스탬프는 UTC epoch ms 정수 (로그의 "...Z" 표기와 S3 시간 파티션이 UTC 기준, 문자열은 직렬화 시점에만 생성)
+    - 지역별 현지 시각은 epoch + UTC 오프셋으로 계산 (pytz tzinfo를 datetime에 직접 넣을 때의 LMT 오프셋 문제 없음)
+    - 월 범위는 global.timezone 기준 현지 월 (예: "2025-09" = KST 9/1 00:00 ~ 10/1 00:00)
     """
-    
-    def __init__(self, config: dict):
+
+    def __init__(self, config: dict, random_pool: Optional[RandomPool] = None):
         """
         Args:
-            config: config_v2.toml 전체 dict
+            config: config.toml 전체 dict
+            random_pool: 일괄 샘플링용 난수 (없으면 새로 생성, seed 공유 권장)
         """
         self.config = config
-        
-        # 타임존 설정
-        timezone = config["global"]["timezone"]
-        self.tz = pytz.timezone(timezone)
-        
-        print(f"✅ LogDateGenerator 초기화 완료 (timezone: {timezone})")
-    
-    
+        self.random_pool = random_pool or RandomPool(config)
+
+        # 기준 타임존 설정 (월 범위/일 경계)
+        timezone_name = config["global"]["timezone"]
+        self.tz = pytz.timezone(timezone_name)
+
+        # 지역별 타임존/트래픽 곡선
+        self.regions: Tuple[Region, ...] = self._load_regions()
+        self.region_codes: Tuple[str, ...] = tuple(region.code for region in self.regions)
+        self._day_weights = self._load_day_weights()
+
+        regions = ", ".join(f"{r.code} {r.share * 100:.0f}%" for r in self.regions)
+        print(f"✅ LogDateGenerator 초기화 완료 (timezone: {timezone_name}, 지역: {regions})")
+
+
+    def _load_regions(self) -> Tuple[Region, ...]:
+        """
+        [date_generator.regions.<국가코드>] 로딩
+
+        - 지역이 없으면 global.timezone 단일 지역 (DEFAULT_REGION_CODE)
+        - 지역 곡선 우선순위: 지역 intraday_curve → 지역 hour_distribution → 전역 곡선 (_load_minute_weights)
+        - share는 합계 1이 되도록 정규화
+        """
+        default_minutes = self._load_minute_weights()
+        specs = load_region_specs(self.config)
+        if not specs:
+            return (Region(DEFAULT_REGION_CODE, self.tz, 1.0, default_minutes),)
+
+        total_share = sum(spec["share"] for spec in specs.values())
+        regions = []
+        for code, spec in specs.items():
+            if spec.get("intraday_curve"):
+                minute_weights = self._parse_intraday_curve(spec["intraday_curve"])
+            elif spec.get("hour_distribution"):
+                minute_weights = self._hours_to_minutes(self._parse_hour_distribution(spec["hour_distribution"]))
+            else:
+                minute_weights = default_minutes
+            regions.append(Region(
+                code=code,
+                tz=pytz.timezone(spec.get("timezone", self.tz.zone)),
+                share=spec["share"] / total_share,
+                minute_weights=minute_weights,
+            ))
+        return tuple(regions)
+
+
     def calculate_total_logs(
         self,
         target_month: str,
@@ -37,41 +144,91 @@ class LogDateGenerator:
     ) -> int:
         """
         월별 총 로그 개수 계산
-        
+
         Args:
             target_month: "2025-01" 형식
             dau: Daily Active Users
             logs_per_user_per_day: 1인당 일일 로그 발생 수
-        
+
         Returns:
             해당 월의 총 로그 개수
-        
+
         계산식:
             총 로그 수 = DAU × 1인당 로그 × 월 일수
         """
         year, month = map(int, target_month.split('-'))
         _, days_in_month = calendar.monthrange(year, month)
-        
+
         total_logs = dau * logs_per_user_per_day * days_in_month
-        
+
         return total_logs
-    
-    
-    def generate_now(self) -> datetime:
+
+
+    def generate_now(self) -> Tuple[int, int]:
+        """
+        현재 시간 + 지역 반환 (Streaming 모드용)
+
+        지역은 현재 UTC 시각의 지역별 현지 요일/시간대 가중치 비율로 선택
+
+        Returns:
+            (현재 시간 (UTC epoch ms), 지역 인덱스)
+        """
+        now_ms = time.time_ns() // 1_000_000
+        now = datetime.fromtimestamp(now_ms // 1000, timezone.utc)
+        weights = [
+            region.share * self._local_weight(region, now.astimezone(region.tz))
+            for region in self.regions
+        ]
+        total = sum(weights)
+        if total <= 0:
+            return now_ms, 0
+
+        u = self.random_pool.random() * total
+        for index, weight in enumerate(weights):
+            u -= weight
+            if u < 0:
+                return now_ms, index
+        return now_ms, len(weights) - 1
+
+
+    def compile_month(self, target_month: str) -> Tuple[np.ndarray, np.ndarray]:
         """
-        현재 시간 반환 (Streaming 모드용)
+        월 범위의 UTC 분 단위 지역별 가중치 표
+
+        Args:
+            target_month: "2025-01" 형식 (global.timezone 기준 현지 월)
 
         Returns:
-            현재 시간 (타임존 적용됨)
+            (UTC 분 시작 epoch 초 배열 [M], 지역 × 분 가중치 [R, M])
+            지역 r의 행 합계 = 지역 share (전체 합계 = 1)
         """
-        return datetime.now(self.tz)
+        year, month = map(int, target_month.split('-'))
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        # 현지 월 경계 → epoch (localize로 실제 오프셋 적용)
+        start = int(self.tz.localize(datetime(year, month, 1)).timestamp())
+        end = int(self.tz.localize(datetime(next_year, next_month, 1)).timestamp())
+        minute_starts = np.arange(start, end, 60, dtype=np.int64)
+
+        weights = np.zeros((len(self.regions), len(minute_starts)))
+        day_weights = np.asarray(self._day_weights)
+        for r, region in enumerate(self.regions):
+            local = local_epochs(minute_starts, region.tz)
+            minute_of_day = (local // 60) % MINUTES_PER_DAY
+            weekday = (local // 86400 + 3) % 7  # 1970-01-01 = 목요일(3)
+            weights[r] = day_weights[weekday] * region.minute_weights[minute_of_day]
+            total = weights[r].sum()
+            if total > 0:
+                weights[r] *= region.share / total
+
+        return minute_starts, weights
 
 
     def generate_timestamps(
         self,
         target_month: str,
         total_logs: int
-    ) -> Generator[datetime, None, None]:
+    ) -> Generator[Tuple[int, int], None, None]:
         """
         지정된 월의 타임스탬프 생성 (Batch 모드용)
 
@@ -80,81 +237,55 @@ class LogDateGenerator:
             total_logs: 해당 월에 생성할 총 로그 개수
 
         Yields:
-            datetime 객체 (타임존 적용됨, 시간 순서대로 정렬됨)
+            (UTC epoch ms, 지역 인덱스) (시간 순서대로 정렬됨)
 
         특징:
-            - 요일별 가중치 적용 (config에서 읽음)
-            - 시간대별 가중치 적용 (config에서 읽음)
-            - 분/초는 랜덤 생성
+            - 지역별 현지 요일/시간대 곡선을 UTC 분 단위 표로 컴파일 (compile_month)
+            - 분별 로그 수를 다항분포로 1회 추첨 (합계 = total_logs)
+            - 시간(60분) 단위로 해당 시간의 ms 오프셋/지역만 NumPy로 생성·정렬 후 반환
+              (메모리는 1시간 분량으로 제한, 월 전체 정렬 없이 바로 출력 시작)
+            - 지역은 해당 UTC 분의 지역별 가중치 비율로 선택
         """
-        year, month = map(int, target_month.split('-'))
-        _, days_in_month = calendar.monthrange(year, month)
-        
-        # 요일별/시간대별 가중치 로딩
-        day_weights = self._load_day_weights()  
-        # 예시: [0.10, 0.12, 0.13, 0.12, 0.20, 0.15, 0.18]  
-        # [월, 화, 수, 목, 금, 토, 일]
-        hour_weights = self._load_hour_weights()
-        # 실제 반환값 (24개 요소):
-        # [
-        #     0.00833, 0.00833, 0.00833, 0.00833, 0.00833, 0.00833,  # 0-5시
-        #     0.03333, 0.03333, 0.03333,                              # 6-8시
-        #     0.05, 0.05, 0.05,                                       # 9-11시
-        #     0.05, 0.05,                                             # 12-13시
-        #     0.025, 0.025, 0.025, 0.025,                             # 14-17시
-        #     0.0875, 0.0875, 0.0875, 0.0875,                         # 18-21시
-        #     0.075, 0.075                                            # 22-23시
-        # ]
-
-
-        # 모든 날짜/시간 조합과 가중치 계산
-        all_datetimes = []
-        weights = []
-        
-        for day in range(1, days_in_month + 1):
-            dt = datetime(year, month, day, tzinfo=self.tz)
-            weekday = dt.weekday()  # 0=월요일, 6=일요일
-            day_weight = day_weights[weekday]
-            
-            for hour in range(24):
-                hour_weight = hour_weights[hour]
-                combined_weight = day_weight * hour_weight
-                
-                if combined_weight > 0:
-                    all_datetimes.append((year, month, day, hour))
-                    weights.append(combined_weight)
-        
-        # 가중치 정규화 (합이 1이 되도록)
-        total_weight = sum(weights)
-        normalized_weights = [w / total_weight for w in weights]
-        
-        # total_logs 개수만큼 샘플링
-        sampled_datetimes = random.choices(
-            all_datetimes,
-            weights=normalized_weights,
-            k=total_logs
-        )
-        
-        # 분/초까지 포함한 완전한 타임스탬프 리스트 생성
-        full_timestamps = []
-        for year, month, day, hour in sampled_datetimes:
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-
-            timestamp = datetime(
-                year, month, day, hour, minute, second,
-                tzinfo=self.tz
-            )
-            full_timestamps.append(timestamp)
-
-        # 시간 순서대로 정렬 (분/초까지 포함)
-        full_timestamps.sort()
-
-        # Generator로 반환
-        for timestamp in full_timestamps:
-            yield timestamp
-    
-    
+        minute_starts, weights = self.compile_month(target_month)
+        rng = self.random_pool.rng
+
+        # 1. 분별 로그 수 (다항분포)
+        minute_totals = weights.sum(axis=0)
+        counts = rng.multinomial(total_logs, minute_totals / minute_totals.sum())
+
+        # 분별 지역 누적 비율 (지역 선택용)
+        cumulative = np.cumsum(weights, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cumulative = np.nan_to_num(cumulative / minute_totals)
+        last_region = len(self.regions) - 1
+
+        for chunk_start in range(0, len(minute_starts), MINUTES_PER_HOUR):
+            chunk = slice(chunk_start, chunk_start + MINUTES_PER_HOUR)
+            chunk_counts = counts[chunk]
+            n = int(chunk_counts.sum())
+            if n == 0:
+                continue
+
+            # 2. 이 시간의 분 인덱스 → ms 단위 epoch (분 시작 + 0~59,999ms)
+            minutes = np.repeat(np.arange(chunk_start, chunk_start + len(chunk_counts)), chunk_counts)
+            epoch_ms = minute_starts[minutes] * 1000 + rng.integers(0, 60_000, size=n)
+
+            # 3. 지역 선택: 분별 지역 누적 비율과 비교
+            regions = (rng.random(n)[np.newaxis, :] >= cumulative[:, minutes]).sum(axis=0)
+            np.minimum(regions, last_region, out=regions)
+
+            # 시간 안에서만 정렬 (ms 단위)
+            order = np.argsort(epoch_ms, kind="stable")
+
+            # Generator로 반환 (datetime 변환 없이 정수 그대로)
+            yield from zip(epoch_ms[order].tolist(), regions[order].tolist())
+
+
+    def _local_weight(self, region: Region, local: datetime) -> float:
+        """지역 현지 시각의 요일 × 시간대(분) 가중치"""
+        return self._day_weights[local.weekday()] * float(region.minute_weights[local.hour * 60 + local.minute])
+
+
     def _load_day_weights(self) -> list:
         """
         요일별 가중치 로딩
@@ -182,6 +313,49 @@ class LogDateGenerator:
             return [1/7] * 7
     
     
+    def _load_minute_weights(self) -> np.ndarray:
+        """
+        전역 분 단위 시간대 곡선 로딩
+
+        [date_generator.intraday_curve]가 있으면 제어점 선형 보간, 없으면 hour_distribution 계단형
+
+        Returns:
+            1440개 요소 배열 [0분, 1분, ..., 1439분]
+        """
+        curve = self.config.get("date_generator", {}).get("intraday_curve")
+        if curve:
+            return self._parse_intraday_curve(curve)
+        return self._hours_to_minutes(self._load_hour_weights())
+
+
+    def _parse_intraday_curve(self, curve: dict) -> np.ndarray:
+        """
+        "HH:MM" = 상대 가중치 제어점 → 분 단위 가중치 (선형 보간, 자정에서 순환)
+
+        Args:
+            curve: {"00:00": 0.04, "04:00": 0.0005, "20:30": 0.09, ...}
+
+        Returns:
+            1440개 요소 배열 (음수는 0으로 처리)
+        """
+        points = []
+        for time_text, weight in curve.items():
+            hour, minute = map(int, str(time_text).split(':'))
+            points.append((hour * 60 + minute, max(0.0, float(weight))))
+        points.sort()
+
+        xs = np.array([x for x, _ in points], dtype=float)
+        ys = np.array([y for _, y in points], dtype=float)
+        # 마지막 제어점 → 다음날 첫 제어점 구간까지 이어서 보간
+        return np.interp(np.arange(MINUTES_PER_DAY), xs, ys, period=MINUTES_PER_DAY)
+
+
+    @staticmethod
+    def _hours_to_minutes(hour_weights: list) -> np.ndarray:
+        """24시간 가중치 → 분 단위 가중치 (시간 가중치를 60분에 균등 배분)"""
+        return np.repeat(np.asarray(hour_weights, dtype=float) / 60, 60)
+
+
     def _load_hour_weights(self) -> list:
         """
         시간대별 가중치 로딩
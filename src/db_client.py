@@ -1,14 +1,19 @@
 import os
 import sqlite3
+import threading
+import time
+import uuid
 import mysql.connector
 from mysql.connector import Error
-from typing import List, Dict, Optional, Any
-from contextlib import contextmanager
+from typing import List, Dict, Optional, Any, Tuple, Iterator
+from contextlib import closing, contextmanager
 from dotenv import load_dotenv
-import random
 import string
 from datetime import date, timedelta
-import uuid
+
+from src.active_user_index import ActiveUserIndex
+from src.content_catalog import ContentCatalog, ContentRecord
+from src.random_pool import RandomPool
 
 
 class DBClient:
@@ -16,18 +21,24 @@ class DBClient:
     DB 작업 전담 클라이언트
     
     책임:
-    - MySQL 연결 관리
+    - MySQL 연결 관리 (커넥션 풀) / SQLite 연결 관리 (스레드별 장기 연결, WAL, PRAGMA, 문장 캐시)
+    - Parquet 모드 (DB 없음): 스냅샷 파일 메모리 맵 + 변경은 메모리 overlay (ParquetStore)
+    - SQLite in-memory 미러 (선택): 시작 시 DB 파일을 :memory:로 복사, 종료 시 파일로 기록
+    - write-behind 쓰기 큐: 신규 유저/구독/탈퇴/좋아요 변경을 큐에 적재하고 백그라운드 스레드가 배치 트랜잭션으로 반영
+      (같은 유저/콘텐츠 변경은 병합, 큐 상한 초과 시 생성 스레드 대기, 종료 시 모두 flush)
     - 유저 CRUD (생성, 조회, 업데이트)
     - 콘텐츠 조회
     - 구독 정보 조회
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, random_pool: Optional[RandomPool] = None):
         """
         Args:
             config: config.toml 전체 dict
+            random_pool: 신규 유저 필드/구독 해지 상태/활성 유저 추출용 난수 (없으면 새로 생성, 다른 모듈과 공유 권장)
         """
         self.config = config
+        self.random_pool = random_pool or RandomPool(config)
 
         # .env 파일 로드
         load_dotenv()
@@ -59,21 +70,87 @@ class DBClient:
         elif self.db_type == "sqlite":
             # SQLite (Mock DB) 연결 정보 (config.toml 우선, 없으면 .env)
             self.sqlite_path = db_config.get("sqlite_db_path", os.getenv("SQLITE_DB_PATH", "mock_db/ott_test.db"))
-            self.pool = None  # SQLite는 풀 사용 안함
+            self.pool = None  # SQLite는 풀 대신 스레드별 장기 연결 사용
 
             # SQLite DB 파일 존재 확인
             if not os.path.exists(self.sqlite_path):
                 raise FileNotFoundError(f"SQLite DB 파일을 찾을 수 없습니다: {self.sqlite_path}")
 
+            # 연결 튜닝 (WAL, 캐시 크기, mmap, 연결별 prepared statement 캐시 크기)
+            self.sqlite_wal = db_config.get("sqlite_wal", True)
+            self.sqlite_cache_size_mb = db_config.get("sqlite_cache_size_mb", 64)
+            self.sqlite_mmap_size_mb = db_config.get("sqlite_mmap_size_mb", 256)
+            self.sqlite_cached_statements = db_config.get("sqlite_cached_statements", 256)
+            self.sqlite_in_memory = db_config.get("sqlite_in_memory", False)
+
+            # 스레드별 연결 (threading.local) + 종료 시 일괄 close를 위한 목록
+            self._local = threading.local()
+            self._sqlite_connections: List[sqlite3.Connection] = []
+            self._sqlite_lock = threading.Lock()
+
+            # in-memory 미러: 같은 프로세스의 모든 스레드가 공유하는 named memory DB로 backup
+            self._memory_uri = None
+            self._memory_anchor = None
+            if self.sqlite_in_memory:
+                self._memory_uri = f"file:ott_mirror_{uuid.uuid4().hex[:8]}?mode=memory&cache=shared"
+                self._memory_anchor = self._get_sqlite_connection()  # 마지막 연결이 닫히면 memory DB가 사라지므로 유지
+                with closing(sqlite3.connect(self.sqlite_path)) as source:
+                    source.backup(self._memory_anchor)
+
             print(f"✅ DB Client 초기화 완료 (SQLite)")
-            print(f"   DB Path: {self.sqlite_path}")
+            print(f"   DB Path: {self.sqlite_path}" + (" (in-memory 미러)" if self.sqlite_in_memory else ""))
 
-        else:
-            raise ValueError(f"지원하지 않는 DB_TYPE: {self.db_type}. 'mysql' 또는 'sqlite'를 사용하세요.")
+        elif self.db_type == "parquet":
+            # Parquet 스냅샷 (DB 연결 없음, pyarrow는 이 모드에서만 import)
+            from src.parquet_store import ParquetStore
 
-        # 콘텐츠 캐시 초기화
-        self.contents_cache = None
-        self.contents_weights = None
+            self.pool = None
+            self.parquet_dir = db_config.get("parquet_dir", "../db/table_file")
+            self.parquet = ParquetStore(self.parquet_dir, db_config.get("parquet_snapshot_dir") or None)
+
+            print(f"✅ DB Client 초기화 완료 (Parquet)")
+            print(f"   Parquet Dir: {self.parquet_dir} (유저 {self.parquet.users.num_rows:,}명)")
+
+        else:
+            raise ValueError(f"지원하지 않는 DB_TYPE: {self.db_type}. 'mysql', 'sqlite' 또는 'parquet'를 사용하세요.")
+
+        # 콘텐츠 캐시 초기화 (load_contents_cache에서 ContentCatalog로 생성)
+        self.catalog: Optional[ContentCatalog] = None
+        self.contents_catalog_size = db_config.get("contents_catalog_size", 50)  # 0이면 전체
+        self.contents_fetch_size = db_config.get("contents_fetch_size", 1000)
+        self.popularity_zipf_exponent = db_config.get("popularity_zipf_exponent", 0.0)
+
+        # 신규 유저 ID 블록 예약 및 배치 INSERT 설정
+        self.user_id_block_size = db_config.get("user_id_block_size", 1000)
+        self.new_user_flush_size = db_config.get("new_user_flush_size", 500)
+        self._next_user_id = 0
+        self._user_id_lease_end = 0
+        self._pending_new_users: List[tuple] = []
+        self._demographic_pool = self._build_demographic_pool(1024)
+
+        # 활성 유저 캐시 (get_random_users 최초 호출 시 로드, 이후 변경 메서드에서 직접 갱신)
+        self.user_fetch_size = db_config.get("user_fetch_size", 10000)
+        self._active_users: Optional[ActiveUserIndex] = None
+
+        # 유저 상태 변경 (user_id → [구독 활성화 subscription_id, 구독 해지 상태, 탈퇴 여부], 같은 유저는 병합)
+        self._pending_user_updates: Dict[int, list] = {}
+
+        # 좋아요 변경 배치 반영 설정 ((user_id, content_id) → (좋아요 여부, 시각))
+        self.like_flush_size = db_config.get("like_flush_size", 500)
+        self._pending_like_changes: Dict[tuple, tuple] = {}
+
+        # write-behind 쓰기 큐 (false면 기존처럼 생성 스레드에서 동기 반영)
+        self.write_behind = db_config.get("write_behind", True)
+        self.write_queue_size = db_config.get("write_queue_size", 20000)
+        self.write_flush_interval = db_config.get("write_flush_interval_ms", 200) / 1000
+        self._write_cond = threading.Condition()   # 대기 중 변경 적재/교체 보호
+        self._apply_lock = threading.Lock()        # 배치 반영 순서 보장 (교체 → 반영을 한 번에 1개만)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_stop = False
+        self._writer_error: Optional[BaseException] = None
+        self._flush_requested = False
+        self._oldest_pending: Optional[float] = None  # 가장 오래된 미반영 변경의 적재 시각 (monotonic)
+        self.write_stats = {"queued": 0, "coalesced": 0, "flushed": 0, "batches": 0, "stalls": 0, "max_lag_ms": 0.0}
 
 
     def _create_mysql_pool(self):
@@ -104,229 +181,596 @@ class DBClient:
             finally:
                 conn.close()
         elif self.db_type == "sqlite":
-            conn = sqlite3.connect(self.sqlite_path)
-            conn.row_factory = sqlite3.Row  # dict-like access
+            # 스레드별 장기 연결 재사용 (닫지 않음, 예외 시 열린 트랜잭션만 롤백)
+            conn = self._get_sqlite_connection()
             try:
                 yield conn
-            finally:
-                conn.close()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+
+    def _get_sqlite_connection(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 SQLite 연결 (없으면 생성 후 PRAGMA 적용)
+
+        - cached_statements: 같은 SQL 문자열의 prepared statement를 연결 단위로 재사용
+        - 파일 DB: WAL + synchronous=NORMAL (커밋마다 fsync 없이 체크포인트 시에만)
+        - in-memory 미러: 공유 캐시 memory DB에 연결 (저널/동기화 불필요)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        if self._memory_uri is not None:
+            conn = sqlite3.connect(
+                self._memory_uri, uri=True,
+                cached_statements=self.sqlite_cached_statements, check_same_thread=False
+            )
+            conn.execute("PRAGMA read_uncommitted=1")  # 공유 캐시 테이블 락으로 writer 스레드와 충돌하지 않도록
+        else:
+            conn = sqlite3.connect(
+                self.sqlite_path, timeout=30,
+                cached_statements=self.sqlite_cached_statements, check_same_thread=False
+            )
+            if self.sqlite_wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.sqlite_mmap_size_mb * 1024 * 1024)}")
+        conn.execute(f"PRAGMA cache_size={-int(self.sqlite_cache_size_mb * 1024)}")  # 음수 = KiB 단위
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.row_factory = sqlite3.Row  # dict-like access
+
+        self._local.conn = conn
+        with self._sqlite_lock:
+            self._sqlite_connections.append(conn)
+        return conn
     
     
     # ========== 유저 관련 메서드 ==========
     
-    def create_new_user(self, signup_date: Optional[date] = None) -> int:
+    def create_new_user(self, signup_date: Optional[date] = None, country: str = "KR") -> int:
         """
-        신규 유저 생성 (DB INSERT)
+        신규 유저 생성 (ID 블록에서 user_id 할당 + INSERT는 배치 버퍼에 적재)
+
+        매 호출마다 DB에 INSERT/commit 하지 않고,
+        미리 예약한 user_id 블록에서 ID를 꺼내고 인구통계 필드는 사전 생성 풀에서 선택
+        실제 INSERT는 쓰기 큐에서 new_user_flush_size마다 한 트랜잭션으로 처리
+
+        Args:
+            signup_date: 가입일 (없으면 오늘)
+            country: 국가 코드 (타임스탬프 지역)
 
         Returns:
             생성된 user_id
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            # 랜덤 데이터 생성
-            random_suffix = ''.join(random.choices(string.digits, k=6))
-            email = f"G_user_{uuid.uuid4().hex}@ottservice.com"
-            password_hash = ''.join(random.choices(string.hexdigits.lower(), k=64))
+        if self._next_user_id >= self._user_id_lease_end:
+            self._lease_user_id_block()
+
+        user_id = self._next_user_id
+        self._next_user_id += 1
+
+        if signup_date is None:
+            signup_date = date.today()
+
+        (name, gender, birth_date, city, is_adult_verified,
+         push_opt_in, password_hash) = self.random_pool.pick(self._demographic_pool)
+
+        row = (
+            user_id,
+            f"G_user_{user_id}_{self.random_pool.randint(100000, 999999)}@ottservice.com",
+            password_hash,
+            name,
+            gender,
+            birth_date,
+            country,
+            city,
+            signup_date,
+            'active',  # account_status
+            is_adult_verified,
+            push_opt_in
+        )
+        with self._write_cond:
+            self._pending_new_users.append(row)
+            self._enqueued(len(self._pending_new_users) >= self.new_user_flush_size)
+
+        if self._active_users is not None:
+            self._active_users.add(user_id, False, country)
+
+        return user_id
+
+
+    def _lease_user_id_block(self):
+        """
+        신규 유저용 user_id 블록 예약
 
-            names = ["김민준", "이서윤", "박지호", "최수빈", "정예은", "강도윤", "조시우", "윤하은"]
-            cities = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+        DB의 현재 최대 user_id 이후부터 user_id_block_size개를 예약
+        (단일 생성기 프로세스가 users 테이블에 INSERT한다고 가정)
+        """
+        if self.db_type == "parquet":
+            max_user_id = self.parquet.max_user_id()
+        else:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COALESCE(MAX(user_id), 0) FROM users")
+                max_user_id = cursor.fetchone()[0]
+                cursor.close()
 
-            name = random.choice(names)
-            gender = random.randint(0, 1)  # 0=남성, 1=여성, 2=기타
+        start = max(int(max_user_id) + 1, self._next_user_id)
+        self._next_user_id = start
+        self._user_id_lease_end = start + self.user_id_block_size
 
-            # 생년월일: 1970~2005년생
-            birth_date = date(random.randint(1970, 2005), random.randint(1, 12), random.randint(1, 28))
-            city = random.choice(cities)
-            if signup_date is None:
-                signup_date = date.today()
 
-            if self.db_type == "mysql":
-                placeholder = "%s"
-                now_func = "NOW()"
-            else:  # sqlite
-                placeholder = "?"
-                now_func = "datetime('now')"
-
-            query = f"""
-                INSERT INTO users (
-                    email, password_hash, name, gender, birth_date,
-                    country, city, signup_date, account_status,
-                    is_adult_verified, push_opt_in, created_at, updated_at
-                )
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
-                        {placeholder}, {placeholder}, {placeholder}, {placeholder},
-                        {placeholder}, {placeholder}, {now_func}, {now_func})
-            """
+    def _build_demographic_pool(self, size: int) -> List[tuple]:
+        """
+        신규 유저 인구통계 필드 사전 생성
 
-            cursor.execute(query, (
-                email,
-                password_hash,
-                name,
+        Returns:
+            [(name, gender, birth_date, city, is_adult_verified, push_opt_in, password_hash), ...]
+        """
+        names = ["김민준", "이서윤", "박지호", "최수빈", "정예은", "강도윤", "조시우", "윤하은"]
+        cities = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+        today = date.today()
+
+        pool = []
+        rand = self.random_pool
+        for _ in range(size):
+            gender = rand.randint(0, 1)  # 0=남성, 1=여성, 2=기타
+            # 생년월일: 1970~2005년생
+            birth_date = date(rand.randint(1970, 2005), rand.randint(1, 12), rand.randint(1, 28))
+            pool.append((
+                rand.pick(names),
                 gender,
                 birth_date,
-                'KR',  # country
-                city,
-                signup_date,
-                'active',  # account_status
-                1 if (date.today() - birth_date).days >= 365*19 else 0,  # is_adult_verified (19세 이상)
-                random.choice([0, 1])  # push_opt_in
+                rand.pick(cities),
+                1 if (today - birth_date).days >= 365*19 else 0,  # is_adult_verified (19세 이상)
+                rand.randint(0, 1),  # push_opt_in
+                ''.join(rand.pick(string.hexdigits.lower()) for _ in range(64))  # password_hash
             ))
-
-            if self.db_type == "sqlite":
-                conn.commit()
-
-            user_id = cursor.lastrowid  # type: ignore
-            cursor.close()
-
-            return user_id
+        return pool
     
     
-    def get_random_users(self, limit: int) -> List[Dict]:
+    def get_random_users(self, limit: int, segment_by: Optional[str] = None,
+                         shares: Optional[Dict[Any, float]] = None) -> List[Dict]:
         """
-        DB에서 랜덤 유저 조회 (DAU만큼)
+        활성 유저 랜덤 조회 (모집단/DAU 선정용)
+
+        ORDER BY RANDOM()/RAND() 없이 활성 유저 캐시(ActiveUserIndex)에서 비복원 추출
+        캐시는 최초 호출 시 keyset scan으로 1회 로드하고 이후 신규 유저/탈퇴/구독 변경을 직접 반영
 
         Args:
-            limit: 가져올 유저 수 (DAU)
+            limit: 가져올 유저 수
+            segment_by: 층화 기준 (None, "country", "subscribed")
+            shares: 세그먼트 값 → 비율 (예: {"KR": 0.8, "JP": 0.12})
 
         Returns:
-            유저 정보 리스트 [{"user_id": 1, "is_subscribed": True}, ...]
+            유저 정보 리스트 [{"user_id": 1, "is_subscribed": 1, "country": "KR"}, ...]
         """
-        with self.get_connection() as conn:
-            if self.db_type == "mysql":
-                cursor = conn.cursor(dictionary=True)
-                random_func = "RAND()"
-            else:  # sqlite
-                cursor = conn.cursor()
-                random_func = "RANDOM()"
+        if self._active_users is None:
+            self._active_users = self._load_active_users()
+        return self._active_users.sample(limit, segment_by, shares)
 
-            # 랜덤 유저 조회 (subscription_status 컬럼 기반으로 구독 여부 판단)
+
+    def _load_active_users(self) -> ActiveUserIndex:
+        """
+        활성 유저 캐시 로드 (user_id 기준 keyset scan, user_fetch_size행씩)
+
+        WHERE user_id > 마지막 user_id ORDER BY user_id LIMIT n 으로 PK 인덱스 범위만 읽음 (OFFSET/정렬 없음)
+        """
+        # 아직 반영되지 않은 신규 유저/탈퇴가 있으면 먼저 반영
+        self.flush_writes()
+
+        if self.db_type == "parquet":
+            rows = self.parquet.active_users()
+            index = ActiveUserIndex(
+                ((row["user_id"], bool(row["is_subscribed"]), row["country"]) for row in rows),
+                self.random_pool
+            )
+        else:
+            placeholder = "%s" if self.db_type == "mysql" else "?"
             query = f"""
                 SELECT
-                    u.user_id,
-                    CASE
-                        WHEN u.subscription_status = 'active' THEN 1
-                        ELSE 0
-                    END AS is_subscribed
-                FROM users u
-                WHERE u.account_status = 'active'
-                ORDER BY {random_func}
-                LIMIT {limit}
+                    user_id,
+                    CASE WHEN subscription_status = 'active' THEN 1 ELSE 0 END AS is_subscribed,
+                    country
+                FROM users
+                WHERE account_status = 'active' AND user_id > {placeholder}
+                ORDER BY user_id
+                LIMIT {int(self.user_fetch_size)}
             """
-            cursor.execute(query)
+            index = ActiveUserIndex(random_pool=self.random_pool)
+            last_user_id = -1
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                while True:
+                    cursor.execute(query, (last_user_id,))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    for user_id, is_subscribed, country in rows:
+                        index.add(user_id, bool(is_subscribed), country)
+                    last_user_id = rows[-1][0]
+                cursor.close()
 
-            if self.db_type == "mysql":
-                users = cursor.fetchall()
-            else:  # sqlite
-                rows = cursor.fetchall()
-                users = [dict(row) for row in rows]
+        print(f"✅ 활성 유저 캐시 로드 완료 ({len(index):,}명)")
+        return index
 
-            cursor.close()
 
-            return users
-            #[{'user_id': 10231, 'is_subscribed': 1},
-            # {'user_id': 48752, 'is_subscribed': 0},
-            # {'user_id': 33109, 'is_subscribed': 1}]
-    
-    
     def activate_subscription(self, user_id: int, subscription_id: str):
         """
-        유저 구독 활성화 (subscription-start 로그 발생 시 호출)
+        유저 구독 활성화 (subscription-start 로그 발생 시 호출, 쓰기 큐에 적재)
         users 테이블의 subscription_status를 'active'로 변경
 
         Args:
             user_id: 유저 ID
             subscription_id: 구독 상품 ID (예: "s_1")
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            placeholder = "%s" if self.db_type == "mysql" else "?"
+        with self._write_cond:
+            update = self._user_update(user_id)
+            update[0] = subscription_id
+            update[1] = None  # 이전 해지는 이번 활성화로 덮어씀
+            self._enqueued(not self.write_behind)
 
-            # subscription_status를 'active'로 업데이트
-            # subscription_start_date는 오늘, subscription_end_date는 1개월 후, subscription_id도 저장
-            query = f"""
-                UPDATE users
-                SET subscription_status = 'active',
-                    subscription_start_date = CURRENT_DATE,
-                    subscription_end_date = DATE_ADD(CURRENT_DATE, INTERVAL 1 MONTH),
-                    subscription_id = {placeholder}
-                WHERE user_id = {placeholder}
-            """ if self.db_type == "mysql" else f"""
-                UPDATE users
-                SET subscription_status = 'active',
-                    subscription_start_date = DATE('now'),
-                    subscription_end_date = DATE('now', '+1 month'),
-                    subscription_id = {placeholder}
-                WHERE user_id = {placeholder}
-            """
+        if self._active_users is not None:
+            self._active_users.set_subscribed(user_id, True)
 
-            cursor.execute(query, (subscription_id, user_id))
 
-            if self.db_type == "sqlite":
-                conn.commit()
+    def deactivate_subscription(self, user_id: int):
+        """
+        유저 구독 해지 (subscription-stop 로그 발생 시 호출, 쓰기 큐에 적재)
+        users 테이블의 subscription_status를 'expired' 또는 'cancelled'로 랜덤 변경
 
-            cursor.close()
+        Args:
+            user_id: 유저 ID
+        """
+        # 'expired' 또는 'cancelled' 랜덤 선택
+        new_status = self.random_pool.pick(('expired', 'cancelled'))
 
+        with self._write_cond:
+            self._user_update(user_id)[1] = new_status  # 이전 활성화(구독 기간 기록)는 유지 후 해지 반영
+            self._enqueued(not self.write_behind)
 
-    def deactivate_subscription(self, user_id: int):
+        if self._active_users is not None:
+            self._active_users.set_subscribed(user_id, False)
+
+
+    def delete_user(self, user_id: int):
         """
-        유저 구독 해지 (subscription-stop 로그 발생 시 호출)
-        users 테이블의 subscription_status를 'expired' 또는 'cancelled'로 랜덤 변경
+        유저 탈퇴 (account_status를 'deleted'로 변경, 쓰기 큐에 적재)
 
         Args:
             user_id: 유저 ID
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            placeholder = "%s" if self.db_type == "mysql" else "?"
+        with self._write_cond:
+            self._user_update(user_id)[2] = True
+            self._enqueued(not self.write_behind)
 
-            # 'expired' 또는 'cancelled' 랜덤 선택
-            new_status = random.choice(['expired', 'cancelled'])
+        if self._active_users is not None:
+            self._active_users.remove(user_id)
 
-            query = f"""
-                UPDATE users
-                SET subscription_status = {placeholder}
-                WHERE user_id = {placeholder}
-            """
-            cursor.execute(query, (new_status, user_id))
 
-            if self.db_type == "sqlite":
-                conn.commit()
+    def _user_update(self, user_id: int) -> list:
+        """유저의 대기 중 상태 변경 (없으면 생성, 있으면 병합 카운트) (_write_cond 보유 상태에서 호출)"""
+        update = self._pending_user_updates.get(user_id)
+        if update is None:
+            update = self._pending_user_updates[user_id] = [None, None, False]
+        else:
+            self.write_stats["coalesced"] += 1
+        return update
+
 
+    # ========== 좋아요 관련 메서드 ==========
+
+    def iter_user_likes(self) -> Iterator[tuple]:
+        """
+        user_likes 전체를 (user_id, content_id)로 스트리밍 조회 (LikeStore 일괄 로드용)
+        """
+        if self.db_type == "parquet":
+            yield from self.parquet.iter_likes()
+            return
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT user_id, content_id FROM user_likes")
+            while True:
+                rows = cursor.fetchmany(self.contents_fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0], row[1]
             cursor.close()
 
 
-    def delete_user(self, user_id: int):
+    def queue_like_change(self, user_id: int, content_id: str, liked: bool, created_at: str):
         """
-        유저 탈퇴 (account_status를 'deleted'로 변경)
+        좋아요 상태 변경을 쓰기 큐에 적재 (like_flush_size마다 flush)
+
+        같은 (user_id, content_id)의 변경은 마지막 상태만 남김 (on → off → on은 한 번만 반영)
 
         Args:
             user_id: 유저 ID
+            content_id: 콘텐츠 ID
+            liked: 변경 후 좋아요 여부
+            created_at: 좋아요 시각 ("YYYY-MM-DD HH:MM:SS")
         """
+        key = (user_id, content_id)
+        with self._write_cond:
+            if key in self._pending_like_changes:
+                self.write_stats["coalesced"] += 1
+            self._pending_like_changes[key] = (liked, created_at)
+            self._enqueued(len(self._pending_like_changes) >= self.like_flush_size)
+
+
+    # ========== write-behind 쓰기 큐 ==========
+
+    def _pending_count(self) -> int:
+        """대기 중 변경 수 (신규 유저 + 상태 변경 유저 + 좋아요 변경)"""
+        return len(self._pending_new_users) + len(self._pending_user_updates) + len(self._pending_like_changes)
+
+
+    def _enqueued(self, flush_now: bool):
+        """
+        변경 1건 적재 후 처리 (_write_cond 보유 상태에서 호출)
+
+        - write_behind: 배치 크기 도달 시 writer 스레드를 깨우고, 큐 상한을 넘으면 반영될 때까지 대기
+        - 동기 모드: 배치 크기 도달(상태 변경은 즉시) 시 현재 스레드에서 반영
+        - writer가 반영에 실패했으면 이후 모든 적재에서 같은 오류를 발생 (실패 배치는 큐에 남아 있음)
+        """
+        self._raise_writer_error()
+
+        self.write_stats["queued"] += 1
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+
+        if not self.write_behind:
+            if flush_now:
+                self.flush_writes()
+            return
+
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="db-write-behind", daemon=True)
+            self._writer.start()
+
+        if flush_now and not self._flush_requested:
+            self._flush_requested = True
+            self._write_cond.notify_all()
+
+        if self._pending_count() >= self.write_queue_size:
+            self.write_stats["stalls"] += 1
+            self._flush_requested = True
+            self._write_cond.notify_all()
+            # writer가 오류로 종료되면 더 이상 큐가 줄지 않으므로 대기 중단
+            while (
+                self._pending_count() >= self.write_queue_size
+                and self._writer_error is None
+                and self._writer.is_alive()
+            ):
+                self._write_cond.wait(self.write_flush_interval)
+            self._raise_writer_error()
+
+
+    def _raise_writer_error(self):
+        """writer 반영 실패가 있으면 RuntimeError 발생 (오류는 유지되어 close까지 계속 보고됨)"""
+        if self._writer_error is not None:
+            raise RuntimeError(
+                f"DB 쓰기 큐 반영 실패 (미반영 변경 {self._pending_count():,}건)"
+            ) from self._writer_error
+
+
+    def _writer_loop(self):
+        """백그라운드 writer: flush 요청 또는 write_flush_interval마다 대기 중 변경을 배치 반영"""
+        while True:
+            with self._write_cond:
+                if not self._writer_stop and not self._flush_requested:
+                    self._write_cond.wait(self.write_flush_interval)
+                stop = self._writer_stop
+            try:
+                applied = self.flush_writes()
+            except Exception as e:
+                print(f"❌ DB 쓰기 큐 반영 실패: {e}")
+                with self._write_cond:
+                    self._writer_error = e
+                    self._write_cond.notify_all()
+                return
+            if stop and not applied:
+                return
+
+
+    def flush_writes(self) -> int:
+        """
+        대기 중 변경을 모두 꺼내 한 트랜잭션으로 반영
+
+        Returns:
+            반영한 변경 수
+        """
+        with self._apply_lock:
+            with self._write_cond:
+                new_users = self._pending_new_users
+                user_updates = self._pending_user_updates
+                like_changes = self._pending_like_changes
+                oldest = self._oldest_pending
+                self._pending_new_users = []
+                self._pending_user_updates = {}
+                self._pending_like_changes = {}
+                self._oldest_pending = None
+                self._flush_requested = False
+                self._write_cond.notify_all()  # 큐 상한으로 대기 중인 생성 스레드 재개
+
+            count = len(new_users) + len(user_updates) + len(like_changes)
+            if count == 0:
+                return 0
+
+            try:
+                self._apply_writes(new_users, user_updates, like_changes)
+            except Exception:
+                # 실패한 배치를 큐 앞쪽에 되돌림 (그 사이 적재된 변경이 더 최신이므로 위에 병합)
+                with self._write_cond:
+                    self._requeue(new_users, user_updates, like_changes, oldest)
+                raise
+
+            stats = self.write_stats
+            stats["flushed"] += count
+            stats["batches"] += 1
+            if oldest is not None:
+                stats["max_lag_ms"] = max(stats["max_lag_ms"], (time.monotonic() - oldest) * 1000)
+            return count
+
+
+    def _requeue(self, new_users: List[tuple], user_updates: Dict[int, list], like_changes: Dict[tuple, tuple],
+                 oldest: Optional[float]):
+        """반영 실패 배치를 대기 중 변경 앞에 되돌림 (_write_cond 보유 상태에서 호출)"""
+        self._pending_new_users = new_users + self._pending_new_users
+
+        for user_id, newer in self._pending_user_updates.items():
+            update = user_updates.setdefault(user_id, [None, None, False])
+            if newer[0] is not None:   # 이후 활성화가 이전 해지를 덮어씀 (activate_subscription과 같은 규칙)
+                update[0], update[1] = newer[0], None
+            if newer[1] is not None:
+                update[1] = newer[1]
+            update[2] = update[2] or newer[2]
+        self._pending_user_updates = user_updates
+
+        like_changes.update(self._pending_like_changes)
+        self._pending_like_changes = like_changes
+
+        if oldest is not None:
+            self._oldest_pending = min(oldest, self._oldest_pending or oldest)
+
+
+    def _apply_writes(self, new_users: List[tuple], user_updates: Dict[int, list], like_changes: Dict[tuple, tuple]):
+        """
+        변경 배치를 단일 트랜잭션으로 반영
+
+        순서: 신규 유저 INSERT → 구독 활성화 → 구독 해지 → 탈퇴 → 좋아요 INSERT/DELETE
+        (신규 유저 INSERT가 먼저이므로 같은 배치의 상태 변경/좋아요가 항상 존재하는 유저에 적용됨)
+        - SQLite: executemany
+        - MySQL: 유저 상태 변경은 CASE 기반 다중 행 UPDATE (new_user_flush_size개씩)
+        - Parquet: 메모리 overlay에 반영
+        """
+        if self.db_type == "parquet":
+            self.parquet.apply(new_users, user_updates, like_changes)
+            return
+
+        mysql = self.db_type == "mysql"
+        placeholder = "%s" if mysql else "?"
+        now_func = "NOW()" if mysql else "datetime('now')"
+
+        activations = [(update[0], user_id) for user_id, update in user_updates.items() if update[0] is not None]
+        deactivations = [(update[1], user_id) for user_id, update in user_updates.items() if update[1] is not None]
+        deletions = [user_id for user_id, update in user_updates.items() if update[2]]
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            placeholder = "%s" if self.db_type == "mysql" else "?"
 
-            query = f"""
-                UPDATE users
-                SET account_status = 'deleted'
-                WHERE user_id = {placeholder}
-            """
-            cursor.execute(query, (user_id,))
+            if new_users:
+                placeholders = ", ".join([placeholder] * 12)
+                cursor.executemany(f"""
+                    INSERT INTO users (
+                        user_id, email, password_hash, name, gender, birth_date,
+                        country, city, signup_date, account_status,
+                        is_adult_verified, push_opt_in, created_at, updated_at
+                    )
+                    VALUES ({placeholders}, {now_func}, {now_func})
+                """, new_users)
+
+            # 구독 활성화: subscription_start_date는 오늘, subscription_end_date는 1개월 후, subscription_id도 저장
+            activate_set = (
+                "subscription_status = 'active', subscription_start_date = CURRENT_DATE, "
+                "subscription_end_date = DATE_ADD(CURRENT_DATE, INTERVAL 1 MONTH)"
+            ) if mysql else (
+                "subscription_status = 'active', subscription_start_date = DATE('now'), "
+                "subscription_end_date = DATE('now', '+1 month')"
+            )
+            if mysql:
+                self._execute_case_update(cursor, activate_set, "subscription_id", activations)
+                self._execute_case_update(cursor, None, "subscription_status", deactivations)
+                self._execute_case_update(cursor, "account_status = 'deleted'", None, [(None, u) for u in deletions])
+            else:
+                if activations:
+                    cursor.executemany(
+                        f"UPDATE users SET {activate_set}, subscription_id = ? WHERE user_id = ?", activations
+                    )
+                if deactivations:
+                    cursor.executemany("UPDATE users SET subscription_status = ? WHERE user_id = ?", deactivations)
+                if deletions:
+                    cursor.executemany(
+                        "UPDATE users SET account_status = 'deleted' WHERE user_id = ?", [(u,) for u in deletions]
+                    )
+
+            if like_changes:
+                inserts = []
+                deletes = []
+                for (user_id, content_id), (liked, created_at) in like_changes.items():
+                    if liked:
+                        inserts.append((user_id, content_id, created_at))
+                    else:
+                        deletes.append((user_id, content_id))
+                # off → on이 한 배치로 병합되면 기존 행이 남아 있으므로 created_at을 최신 시각으로 갱신
+                # (배치 경계와 무관하게 같은 최종 상태)
+                insert_query = (
+                    "INSERT INTO user_likes (user_id, content_id, created_at) VALUES (%s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE created_at = VALUES(created_at)"
+                    if mysql else
+                    "INSERT OR REPLACE INTO user_likes (user_id, content_id, created_at) VALUES (?, ?, ?)"
+                )
+                if inserts:
+                    cursor.executemany(insert_query, inserts)
+                if deletes:
+                    cursor.executemany(
+                        f"DELETE FROM user_likes WHERE user_id = {placeholder} AND content_id = {placeholder}", deletes
+                    )
+
+            conn.commit()
+            cursor.close()
+
+
+    def _execute_case_update(self, cursor, fixed_set: Optional[str], case_column: Optional[str], rows: List[tuple]):
+        """
+        MySQL 다중 행 UPDATE (new_user_flush_size개씩)
+
+        UPDATE users SET {fixed_set}, {case_column} = CASE user_id WHEN %s THEN %s ... END
+        WHERE user_id IN (%s, ...)
+
+        Args:
+            fixed_set: 모든 행에 같은 값을 넣는 SET 절 (없으면 None)
+            case_column: 행마다 다른 값을 넣는 컬럼 (없으면 None)
+            rows: [(값, user_id), ...]
+        """
+        chunk_size = max(1, self.new_user_flush_size)
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            assignments = [fixed_set] if fixed_set else []
+            params: List[Any] = []
+            if case_column:
+                assignments.append(
+                    f"{case_column} = CASE user_id {' '.join(['WHEN %s THEN %s'] * len(chunk))} END"
+                )
+                for value, user_id in chunk:
+                    params.extend((user_id, value))
+            user_ids = [user_id for _, user_id in chunk]
+            params.extend(user_ids)
+            cursor.execute(
+                f"UPDATE users SET {', '.join(assignments)} WHERE user_id IN ({', '.join(['%s'] * len(chunk))})",
+                params
+            )
 
-            if self.db_type == "sqlite":
-                conn.commit()
 
-            cursor.close()
-    
-    
     # ========== 콘텐츠 관련 메서드 ==========
 
     def load_contents_cache(self):
         """
-        인기도 상위 50개 콘텐츠를 DB에서 조회하여 캐시에 저장
+        인기도 상위 contents_catalog_size개 콘텐츠를 DB에서 조회하여 카탈로그 인덱스로 저장
         초기화 시 한 번만 호출하여 성능 최적화
+
+        - contents_catalog_size가 0이면 tmdb_contents 전체 로드
+        - 결과 전체를 fetchall 하지 않고 contents_fetch_size 단위로 읽으면서 카탈로그 구성
         """
+        if self.db_type == "parquet":
+            rows = self.parquet.iter_contents(int(self.contents_catalog_size), self.contents_fetch_size)
+            self._set_catalog(ContentCatalog(rows, self.popularity_zipf_exponent))
+            return
+
         with self.get_connection() as conn:
             if self.db_type == "mysql":
                 cursor = conn.cursor(dictionary=True)
@@ -335,94 +779,84 @@ class DBClient:
                 cursor = conn.cursor()
                 table_name = "tmdb_contents"
 
-            # 인기도 상위 50개 조회 (에피소드 정보 포함)
+            # 인기도 내림차순 조회 (에피소드 정보 포함)
+            limit_clause = f"LIMIT {int(self.contents_catalog_size)}" if self.contents_catalog_size > 0 else ""
             query = f"""
-                SELECT content_id as contents_id, content_type as contents_type, title, genre_names as genre, runtime, popularity, number_of_episodes
+                SELECT content_id as contents_id, content_type as contents_type, title, genre_names as genre, runtime, popularity, number_of_episodes, release_date
                 FROM {table_name}
                 ORDER BY popularity DESC
-                LIMIT 50
+                {limit_clause}
             """
             cursor.execute(query)
 
-            if self.db_type == "mysql":
-                contents = cursor.fetchall()
-            else:  # sqlite
-                rows = cursor.fetchall()
-                contents = [dict(row) for row in rows]
+            catalog = ContentCatalog(self._iter_rows(cursor), self.popularity_zipf_exponent)
 
             cursor.close()
 
-            if contents:
-                # popularity를 float로 변환하여 가중치 리스트 생성
-                self.contents_cache = contents
-                self.contents_weights = [float(c['popularity']) for c in contents]
-                print(f"✅ 콘텐츠 캐시 로드 완료 ({len(contents)}개)")
-            else:
-                print("⚠️  콘텐츠가 없어 캐시를 생성하지 못했습니다.")
+        self._set_catalog(catalog)
 
-    def get_random_content(self) -> Optional[Dict]:
+
+    def _set_catalog(self, catalog: ContentCatalog):
+        """로드한 카탈로그 등록 (비어 있으면 캐시 없음)"""
+        if len(catalog) > 0:
+            # contents_id 인덱스 + 인기도 alias 테이블로 1회 컴파일
+            self.catalog = catalog
+            zipf = f", Zipf 지수 {self.popularity_zipf_exponent}" if self.popularity_zipf_exponent > 0 else ""
+            print(f"✅ 콘텐츠 캐시 로드 완료 ({len(catalog):,}개{zipf})")
+        else:
+            print("⚠️  콘텐츠가 없어 캐시를 생성하지 못했습니다.")
+
+
+    def _iter_rows(self, cursor) -> Iterator[Dict]:
+        """커서 결과를 contents_fetch_size 단위로 읽어 dict로 하나씩 반환"""
+        while True:
+            rows = cursor.fetchmany(self.contents_fetch_size)
+            if not rows:
+                return
+            if self.db_type == "mysql":
+                yield from rows
+            else:  # sqlite
+                for row in rows:
+                    yield dict(row)
+
+    def get_random_content(self) -> Optional[ContentRecord]:
         """
-        캐시된 콘텐츠 중에서 인기도 기반 가중치로 1개 선택
+        캐시된 콘텐츠 중에서 인기도 기반 가중치로 1개 선택 (alias 테이블 O(1), 트렌드 사용 시 Fenwick 트리 O(log n))
 
         Returns:
-            콘텐츠 정보 dict {"contents_id": "movie_123", "contents_type": "movie", ...}
+            ContentRecord (읽기 전용, 캐시가 없으면 None)
         """
-        # 캐시가 없으면 None 반환
-        if not self.contents_cache or not self.contents_weights:
+        if not self.catalog:
             return None
 
-        # 캐시에서 인기도 가중치로 1개 선택
-        selected = random.choices(self.contents_cache, weights=self.contents_weights, k=1)[0]
-
-        # popularity 필드 제거하여 복사본 반환 (원본 캐시 보호)
-        result = selected.copy()
-        result.pop('popularity', None)
-
-        return result
+        return self.catalog.sample()
     
     
-    def get_content_by_id(self, contents_id: str) -> Optional[Dict]:
+    def get_content_by_id(self, contents_id: str) -> Optional[ContentRecord]:
         """
-        특정 콘텐츠 조회 (캐시에서 검색)
+        특정 콘텐츠 조회 (카탈로그 인덱스, O(1))
 
         Args:
             contents_id: 콘텐츠 ID (예: "movie_123", "tv_456")
 
         Returns:
-            콘텐츠 정보 dict
-        """
-        # 캐시에서 검색
-        if self.contents_cache:
-            for content in self.contents_cache:
-                if content.get('contents_id') == contents_id:
-                    # popularity 제거한 복사본 반환
-                    result = content.copy()
-                    result.pop('popularity', None)
-                    return result
-
-        # 캐시에 없으면 None 반환
-        return None
+            ContentRecord (읽기 전용, 캐시에 없으면 None)
+        """
+        if not self.catalog:
+            return None
+
+        return self.catalog.get(contents_id)
     
     
-    def get_episodes_by_content_id(self, contents_id: str) -> List[Dict]:
+    def get_episodes_by_content_id(self, contents_id: str) -> Tuple[str, ...]:
         """
-        캐시에서 콘텐츠 정보를 찾아 에피소드 리스트를 동적 생성하여 반환
+        콘텐츠의 에피소드 ID 튜플 반환 (카탈로그 로드 시 미리 생성, 없으면 빈 튜플)
         """
-        # 캐시에서 콘텐츠 찾기
-        if self.contents_cache:
-            for content in self.contents_cache:
-                if content.get('contents_id') == contents_id:
-                    # number_of_episodes가 없거나 0이면 빈 리스트 반환
-                    num_episodes = content.get('number_of_episodes')
-                    if not num_episodes:
-                        return []
+        content = self.get_content_by_id(contents_id)
+        if content is None:
+            return ()
 
-                    # episode_id 리스트 생성
-                    episodes = [{"episode_id": f"ep_{i:02d}"} for i in range(1, int(num_episodes) + 1)]
-                    return episodes
-
-        # 캐시에 없으면 빈 리스트 반환
-        return []
+        return content.episode_ids
     
     
     # ========== 구독 관련 메서드 ========== (삭제됨: subscription_plans 테이블 삭제)
@@ -432,7 +866,47 @@ class DBClient:
     
     def close(self):
         """
-        커넥션 풀 종료
+        커넥션 풀 종료 (writer 스레드 종료 + 쓰기 큐에 남은 변경 flush)
+
+        Raises:
+            RuntimeError: writer가 반영에 실패한 경우 (스냅샷/in-memory 미러 기록 없이 커넥션만 정리)
         """
-        # 커넥션 풀은 자동으로 정리되므로 특별한 처리 불필요
+        if self._writer is not None:
+            with self._write_cond:
+                self._writer_stop = True
+                self._write_cond.notify_all()
+            self._writer.join()
+            self._writer = None
+
+        failed = self._writer_error is not None
+        if not failed:
+            self.flush_writes()
+
+        stats = self.write_stats
+        if stats["queued"]:
+            print(f"📊 DB 쓰기 큐: 적재 {stats['queued']:,}건 (병합 {stats['coalesced']:,}건), "
+                  f"반영 {stats['flushed']:,}건 / {stats['batches']:,}회, "
+                  f"최대 지연 {stats['max_lag_ms']:.0f}ms, 큐 상한 대기 {stats['stalls']:,}회")
+
+        if self.db_type == "parquet" and not failed:
+            snapshot_dir = self.parquet.write_snapshot()
+            if snapshot_dir is not None:
+                print(f"💾 Parquet 스냅샷 기록 완료: {snapshot_dir}")
+
+        if self.db_type == "sqlite":
+            # in-memory 미러는 변경 내용을 DB 파일로 다시 기록
+            if self._memory_anchor is not None and not failed:
+                with closing(sqlite3.connect(self.sqlite_path)) as target:
+                    self._memory_anchor.backup(target)
+                print(f"💾 in-memory 미러 → {self.sqlite_path} 기록 완료")
+                self._memory_anchor = None
+
+            with self._sqlite_lock:
+                for conn in self._sqlite_connections:
+                    conn.close()
+                self._sqlite_connections.clear()
+            self._local = threading.local()
+
+        # MySQL 커넥션 풀은 자동으로 정리되므로 특별한 처리 불필요
+        self._raise_writer_error()
         print("✅ DB Client 종료")
\ No newline at end of file
@@ -0,0 +1,87 @@
+from array import array
+import time
+from typing import Optional
+
+from src.content_catalog import ContentCatalog, ContentRecord
+from src.db_client import DBClient
+
+
+class LikeStore:
+    """
+    유저 × 콘텐츠 좋아요 상태 저장소 (메모리)
+
+    책임:
+    - 시작 시 user_likes를 1회 일괄 로드 (이벤트마다 DB 조회 없음)
+    - 좋아요 여부 조회/변경 O(1)
+    - 콘텐츠별 좋아요 수 유지 (카탈로그 slot 인덱스 배열)
+    - 변경 사항은 DBClient 배치 버퍼로 전달 (like_flush_size마다 일괄 반영)
+
+    저장 방식:
+    - (user_id, 카탈로그 slot)을 user_id × 카탈로그 크기 + slot 하나의 정수 키로 압축해 set에 저장
+    - 좋아요는 희소하므로 유저 × 콘텐츠 전체 비트맵 대신 좋아요 수에 비례하는 메모리만 사용
+    - 카탈로그에 없는 콘텐츠의 좋아요는 추적하지 않음
+    """
+
+    def __init__(self, db_client: DBClient, catalog: Optional[ContentCatalog]):
+        """
+        Args:
+            db_client: user_likes 로드 및 변경 반영용
+            catalog: 콘텐츠 카탈로그 (contents_id → slot)
+        """
+        self.db_client = db_client
+        self.catalog = catalog
+        self.stride = max(1, len(catalog)) if catalog else 1
+
+        self._liked: set = set()
+        self.like_counts = array('i', [0] * (len(catalog) if catalog else 0))
+
+        loaded = self._load() if catalog else 0
+        print(f"✅ LikeStore 초기화 완료 (좋아요 {loaded:,}건 로드)")
+
+
+    def _load(self) -> int:
+        """user_likes 일괄 로드 (카탈로그에 없는 콘텐츠는 제외)"""
+        slot_by_id = self.catalog.slot_by_id
+        stride = self.stride
+        liked = self._liked
+        counts = self.like_counts
+        for user_id, content_id in self.db_client.iter_user_likes():
+            slot = slot_by_id.get(content_id)
+            if slot is None:
+                continue
+            key = user_id * stride + slot
+            if key not in liked:
+                liked.add(key)
+                counts[slot] += 1
+        return len(liked)
+
+
+    def is_liked(self, user_id: int, content: ContentRecord) -> bool:
+        """좋아요 여부"""
+        return user_id * self.stride + content.slot in self._liked
+
+
+    def set_liked(self, user_id: int, content: ContentRecord, liked: bool, timestamp: int):
+        """
+        좋아요 상태 변경 (상태가 같으면 아무 것도 하지 않음)
+
+        Args:
+            user_id: 유저 ID
+            content: 카탈로그 콘텐츠
+            liked: 변경 후 좋아요 여부
+            timestamp: 이벤트 발생 시각 UTC epoch ms (user_likes.created_at)
+        """
+        key = user_id * self.stride + content.slot
+        if (key in self._liked) == liked:
+            return
+
+        if liked:
+            self._liked.add(key)
+            self.like_counts[content.slot] += 1
+        else:
+            self._liked.discard(key)
+            self.like_counts[content.slot] -= 1
+
+        self.db_client.queue_like_change(
+            user_id, content.contents_id, liked, time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp // 1000))
+        )
@@ -1,34 +1,25 @@
-import random
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable
 from schemas.enum import (
     ActivityLevel,
-    Platform,
+    EventCategory,
+    EventType,
     TrafficSource,
     ReasonType,
     InquiryType,
     ContentType
 )
-from schemas.log_detail_schemas import (
-    AccessInDetail,
-    AccessOutDetail,
-    ContentsClickDetail,
-    ContentsStartDetail,
-    ContentsStopDetail,
-    ContentsPauseDetail,
-    ContentsResumeDetail,
-    ContentsPlayingDetail,
-    ContentsLikeOnDetail,
-    ContentsLikeOffDetail,
-    ReviewReviewDetail,
-    SubscriptionStartDetail,
-    SubscriptionStopDetail,
-    RegisterInDetail,
-    RegisterOutDetail,
-    SearchSearchDetail,
-    SupportInquiryDetail
-)
+from schemas.log_record import LogRecord, PlaybackSession
+from src.content_catalog import ContentRecord
 from src.db_client import DBClient
+from src.log_renderer import LogRenderer
+from src.random_pool import RandomPool
+from src.watch_pattern import WatchPatternEngine
+from src.user_profile import UserProfiles
+from src.user_table import NO_INDEX
+from src.like_store import LikeStore
+from src.search_index import SearchIndex
+from src.content_trend import ContentTrend
+from src.user_controller import Transition
 
 
 class LogContents:
@@ -36,20 +27,32 @@ class LogContents:
     로그 내용 생성 클래스
 
     책임:
-    - 로그 타입별 로그 내용 생성
+    - 로그 타입별 로그 내용 생성 (UserEventController가 컴파일한 Transition 코드로 생성 메서드 선택)
     - DB 데이터 조회 (DBClient 사용)
-    - 로그 포맷 구성
+    - 로그 포맷 구성 (LogRecord + 미리 인코딩된 detail 바이트)
     - 활성도 등급별 시청시간 계산
+    - 콘텐츠 인기도 트렌드 갱신 시점 판단 (ContentTrend)
+    - search-search 검색어를 기억했다가 다음 contents-click을 검색어 매칭 콘텐츠로 유도 (SearchIndex)
     """
 
-    def __init__(self, config: dict, db_client: DBClient):
+    def __init__(
+        self,
+        config: dict,
+        db_client: DBClient,
+        renderer: Optional[LogRenderer] = None,
+        random_pool: Optional[RandomPool] = None
+    ):
         """
         Args:
             config: config.toml 전체 dict
             db_client: DB 작업용 클라이언트
+            renderer: detail 조각 인코딩용 (없으면 새로 생성, LogSink와 공유 권장)
+            random_pool: 난수 버퍼 (없으면 새로 생성, 다른 모듈과 공유 권장)
         """
         self.config = config
         self.db_client = db_client
+        self.renderer = renderer or LogRenderer(config, db_client)
+        self.random_pool = random_pool or RandomPool(config)
 
         # 활성도 등급별 시청시간 설정
         self.activity_config = config.get("user_activity", {})
@@ -57,25 +60,14 @@ class LogContents:
         # LogContents 전용 설정
         self.log_contents_config = config.get("log_contents", {})
 
-        # 플랫폼별 비율
-        self.platform_ratio = self.log_contents_config.get("platform_ratio", {
-            "android": 0.35,
-            "ios": 0.30,
-            "pc": 0.25,
-            "tv": 0.10
-        })
-
         # 확률 설정
         self.review_detail_ratio = self.log_contents_config.get("review_detail_ratio", 0.70)
         self.register_out_detail_ratio = self.log_contents_config.get("register_out_detail_ratio", 0.50)
+        self.search_click_ratio = self.log_contents_config.get("search_click_ratio", 0.60)
+
+        # 재생 중 heartbeat(contents-playing) 간격 (초, 0이면 생성 안 함)
+        self.playing_interval = self.log_contents_config.get("playing_interval_seconds", 0)
 
-        # 시청 패턴 확률 설정
-        self.watch_pattern_prob = self.log_contents_config.get("watch_pattern_probability", {
-            "play_stop": 0.15,
-            "play_pause_stop": 0.25,
-            "play_pause_resume_stop": 0.50,
-            "play_pause_resume_pause_stop": 0.10
-        })
 
         # 구독 상품 타입별 선택 비율
         self.subscription_type_ratio = self.log_contents_config.get("subscription_type_ratio", {
@@ -86,104 +78,113 @@ class LogContents:
         })
 
         # 샘플 데이터
-        self.search_terms = self.log_contents_config.get("search_terms", ["해리포터", "어벤져스"])
         self.review_samples = self.log_contents_config.get("review_samples", ["재밌어요", "별로예요"])
         self.register_out_reasons = self.log_contents_config.get("register_out_reasons", ["콘텐츠가 부족해요"])
         self.inquiry_samples = self.log_contents_config.get("inquiry_samples", ["문의합니다"])
 
+        # 시청 패턴 엔진 ([log_contents.watch_patterns] 컴파일)
+        self.watch_patterns = WatchPatternEngine(config, self.random_pool)
+
+        # 유저 × 콘텐츠 좋아요 상태 (user_likes 일괄 로드, like_on/like_off 일관성 유지)
+        self.likes = LikeStore(db_client, db_client.catalog)
+
+        # 유저별 프로필 (세션 플랫폼 고정, 선호 장르/이어보기 기반 콘텐츠 선택)
+        self.profiles = UserProfiles(config, db_client.catalog, self.random_pool)
+
+        # 검색어 → 콘텐츠 역색인 (search_terms + search_keywords)
+        self.search_index = SearchIndex(config, db_client.catalog)
+
+        # 시간에 따른 콘텐츠 인기도 (공개 부스트/트렌딩 스파이크, 시간대마다 카탈로그 가중치 갱신)
+        self.trend = ContentTrend(config, db_client.catalog)
+
+        # 범주형 분포를 난수 버퍼에 등록 (호출마다 가중치 리스트를 만들지 않음)
+        self.subscription_types = list(self.subscription_type_ratio.keys())
+        self.random_pool.register_choice("subscription_type", list(self.subscription_type_ratio.values()))
+
+        # 텍스트 샘플 detail 조각 (UTF-8 인코딩 1회)
+        field = self.renderer.field
+        self.search_term_fragments = [field("term", term) for term in self.search_index.terms]
+        self.review_fragments = [field("detail", text) for text in self.review_samples]
+        self.register_out_reason_fragments = [field("reason_detail", text) for text in self.register_out_reasons]
+        self.inquiry_fragments = [field("inquiry_detail", text) for text in self.inquiry_samples]
+
+        # 상세 내용이 없을 때의 조각 (kinesis면 null 출력, 그 외는 생략)
+        self.empty_review_fragment = field("detail", None)
+        self.empty_reason_fragment = field("reason_detail", None)
+
+        # 이벤트 코드별 생성 메서드 (Transition의 코드로 바로 조회, 이벤트 이름 파싱 없음)
+        self._generators = self._build_generators()
+
         print(f"✅ LogContents 초기화 완료")
 
 
     def generate(
         self,
         user,
-        event_type: Optional[str],
-        timestamp: datetime,
+        transition: Optional[Transition],
+        timestamp: int,
         additional_data: Optional[Dict[str, Any]] = None
-    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]], tuple]]:
+    ) -> Optional[Union[LogRecord, tuple]]:
         """
         로그 타입에 따른 로그 내용 생성
 
         Args:
             user: User 객체
-            event_type: 이벤트 타입 (예: "access-in", "contents-start")
-            timestamp: 로그 발생 시간
+            transition: UserEventController가 선택한 Transition (컴파일된 이벤트 코드로 생성 메서드 선택)
+            timestamp: 로그 발생 시간 (UTC epoch ms)
             additional_data: 추가 데이터 (user_controller에서 전달)
 
         Returns:
-            - 일반 로그: Dict[str, Any] (단일 로그)
-            - contents-start 패턴: tuple(List[Dict[str, Any]], datetime) (로그 리스트, 패턴 종료 시간)
+            - 일반 로그: LogRecord (단일 로그)
+            - contents-start 패턴: tuple(List[LogRecord | PlaybackSession], int) (로그 리스트, 패턴 종료 시간 epoch ms)
             - None (로그 없는 이벤트의 경우)
         """
-        if event_type is None:
+        if transition is None or transition.event_type is None:
             return None
 
+        # 갱신 시각이 지났으면 콘텐츠 인기도 갱신 (시간대당 1회)
+        if timestamp >= self.trend.next_update:
+            self.trend.advance(timestamp)
+
         if additional_data is None:
             additional_data = {}
 
-        # event_type 파싱 (category-type)
-        parts = event_type.split("-")
-        category = parts[0]
-        type_name = parts[1] if len(parts) > 1 else ""
-
-        # 카테고리별 로그 생성 메서드 호출
-        if category == "access":
-            if type_name == "in":
-                return self._generate_access_in(user, timestamp)
-            elif type_name == "out":
-                return self._generate_access_out(user, timestamp)
-
-        elif category == "contents":
-            if type_name == "click":
-                return self._generate_contents_click(user, timestamp, additional_data)
-            elif type_name == "start":
-                # contents-start는 패턴에 따라 여러 로그를 생성 (Play, Pause, Resume, Stop)
-                # 튜플(로그 리스트, 패턴 종료 시간)로 반환하여 main.py에서 blocked_until 설정에 사용
-                logs, pattern_end_time = self._generate_contents_pattern(user, timestamp, additional_data)
-                return (logs, pattern_end_time)  # 튜플 반환
-            elif type_name == "like_on":
-                return self._generate_contents_like_on(user, timestamp, additional_data)
-            elif type_name == "like_off":
-                return self._generate_contents_like_off(user, timestamp, additional_data)
-
-        elif category == "review":
-            if type_name == "review":
-                return self._generate_review_review(user, timestamp, additional_data)
-
-        elif category == "subscription":
-            if type_name == "start":
-                return self._generate_subscription_start(user, timestamp)
-            elif type_name == "stop":
-                return self._generate_subscription_stop(user, timestamp)
-
-        elif category == "register":
-            if type_name == "in":
-                return self._generate_register_in(user, timestamp)
-            elif type_name == "out":
-                return self._generate_register_out(user, timestamp, additional_data)
-
-        elif category == "search":
-            if type_name == "search":
-                return self._generate_search_search(user, timestamp)
-
-        elif category == "support":
-            if type_name == "inquiry":
-                return self._generate_support_inquiry(user, timestamp)
-
-        return None
-
-
-    # ========== 플랫폼 랜덤 선택 ==========
-    def _get_random_platform(self) -> int:
-        """랜덤 플랫폼 선택 (비율 기반)"""
-        platforms = [Platform.ANDROID, Platform.IOS, Platform.PC, Platform.TV]
-        weights = [
-            self.platform_ratio.get("android", 0.35),
-            self.platform_ratio.get("ios", 0.30),
-            self.platform_ratio.get("pc", 0.25),
-            self.platform_ratio.get("tv", 0.10)
-        ]
-        return random.choices(platforms, weights=weights)[0].value
+        # (카테고리 코드, 타입 코드) → 생성 메서드
+        generator = self._generators.get((transition.event_category_code, transition.event_type_code))
+        if generator is None:
+            return None
+        return generator(user, timestamp, additional_data)
+
+
+    def _build_generators(self) -> Dict[Tuple[int, int], Callable]:
+        """
+        (EventCategory 코드, EventType 코드) → 생성 메서드 (user, timestamp, additional_data)
+
+        contents-start는 패턴에 따라 여러 로그를 생성 (Play, Pause, Resume, Stop)
+        튜플(로그 리스트, 패턴 종료 시간)로 반환하여 main.py에서 blocked_until 설정에 사용
+        """
+        access = EventCategory.ACCESS.value
+        contents = EventCategory.CONTENTS.value
+        return {
+            (access, EventType.IN.value): lambda user, ts, data: self._generate_access_in(user, ts),
+            (access, EventType.OUT.value): lambda user, ts, data: self._generate_access_out(user, ts),
+            (contents, EventType.CLICK.value): self._generate_contents_click,
+            (contents, EventType.START.value): self._generate_contents_pattern,
+            (contents, EventType.LIKE_ON.value): self._generate_contents_like_on,
+            (contents, EventType.LIKE_OFF.value): self._generate_contents_like_off,
+            (EventCategory.REVIEW.value, EventType.REVIEW.value): self._generate_review_review,
+            (EventCategory.SUBSCRIPTION.value, EventType.START.value):
+                lambda user, ts, data: self._generate_subscription_start(user, ts),
+            (EventCategory.SUBSCRIPTION.value, EventType.STOP.value):
+                lambda user, ts, data: self._generate_subscription_stop(user, ts),
+            (EventCategory.REGISTER.value, EventType.IN.value):
+                lambda user, ts, data: self._generate_register_in(user, ts),
+            (EventCategory.REGISTER.value, EventType.OUT.value): self._generate_register_out,
+            (EventCategory.SEARCH.value, EventType.SEARCH.value):
+                lambda user, ts, data: self._generate_search_search(user, ts),
+            (EventCategory.SUPPORT.value, EventType.INQUIRY.value):
+                lambda user, ts, data: self._generate_support_inquiry(user, ts),
+        }
 
 
     # ========== 시청시간 계산 ==========
@@ -213,104 +214,107 @@ class LogContents:
             noise_range = self.activity_config.get("low_noise", 5)
 
         # noise 추가 (±noise_range)
-        noise = random.randint(-noise_range, noise_range)
+        noise = self.random_pool.randint(-noise_range, noise_range)
         duration = max(1, avg_minutes + noise)
 
         return duration
 
 
+
+
+    # ========== 콘텐츠 detail 조각 ==========
+    def _content_fragment(self, content_id: str, content: Optional[ContentRecord]) -> bytes:
+        """
+        콘텐츠 ID/타입 조각
+
+        카탈로그 콘텐츠는 slot별로 미리 인코딩된 조각 사용
+        카탈로그에 없는 콘텐츠는 single(movie) 타입으로 처리
+        """
+        if content is not None:
+            return self.renderer.content_fragments[content.slot]
+        return self.renderer.content_fragment(content_id, ContentType.SINGLE.value)
+
+
     # ========== 접속 로그 (access) ==========
-    def _generate_access_in(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_access_in(self, user, timestamp: int) -> LogRecord:
         """access-in 로그 생성"""
-        detail: AccessInDetail = {
-            "platform": self._get_random_platform()
-        }
+        # 세션 시작: 세션 플랫폼 결정 (세션 동안 유지)
+        self.profiles.start_session(user)
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 1,  # access
-            "event_type": 1,  # in
-            "detail": detail
-        }
+        detail = self.renderer.detail(
+            self.renderer.platform_fragments[self.profiles.platform(user)]
+        )
+
+        return LogRecord(timestamp, user.user_id, 1, 1, detail)  # access, in
 
 
-    def _generate_access_out(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_access_out(self, user, timestamp: int) -> LogRecord:
         """access-out 로그 생성"""
         # 로그아웃 시 플래그 리셋 (같은 날 재로그인 시 access-in 발생 가능하도록)
         if hasattr(user, 'has_logged_in_today'):
             user.has_logged_in_today = False
 
-        detail: AccessOutDetail = {
-            "platform": self._get_random_platform()
-        }
+        detail = self.renderer.detail(
+            self.renderer.platform_fragments[self.profiles.platform(user)]
+        )
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 1,  # access
-            "event_type": 2,  # out
-            "detail": detail
-        }
+        # 세션 종료: 다음 접속 시 세션 플랫폼 다시 결정, 검색어 기억 해제
+        user.table.platform[user.row] = -1
+        user.table.last_search[user.row] = NO_INDEX
+
+        return LogRecord(timestamp, user.user_id, 1, 2, detail)  # access, out
 
 
     # ========== 콘텐츠 로그 (contents) ==========
     def _generate_contents_click(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> LogRecord:
         """contents-click 로그 생성"""
-        # DB에서 랜덤 콘텐츠 조회
-        content = self.db_client.get_random_content()
-
-        if not content:
-            # 콘텐츠 없으면 기본값
-            content = {
-                "contents_id": "movie_0",
-                "contents_type": "movie"
-            }
+        # 직전 검색어가 있으면 search_click_ratio 확률로 검색어 매칭 콘텐츠 선택 (검색어는 1회만 사용)
+        content = None
+        table, row = user.table, user.row
+        term = table.last_search[row]
+        if term != NO_INDEX:
+            table.last_search[row] = NO_INDEX
+            if self.random_pool.random() < self.search_click_ratio:
+                content = self.search_index.sample(term, self.random_pool.random())
+
+        # 유저 프로필 기반 콘텐츠 선택 (이어보기/선호 장르/전체, 없으면 기본값 movie_0)
+        if content is None:
+            content = self.profiles.pick_content(user)
+        content_id = content.contents_id if content else "movie_0"
 
         # User 객체에 콘텐츠 정보 저장
-        user.current_content_id = content["contents_id"]
-
-        # content_type → TINYINT 변환 (tv=series=1, movie=single=2)
-        content_type_code = ContentType.SERIES.value if content["contents_type"] == "tv" else ContentType.SINGLE.value
+        user.current_content_id = content_id
 
-        detail: ContentsClickDetail = {
-            "platform": self._get_random_platform(),
-            "contents_id": content["contents_id"],
-            "contents_type": content_type_code
-        }
+        detail = self.renderer.detail(
+            self.renderer.platform_fragments[self.profiles.platform(user)],
+            self._content_fragment(content_id, content)
+        )
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 2,  # contents
-            "event_type": 3,  # click
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 2, 3, detail)  # contents, click
 
 
     def _generate_contents_pattern(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> tuple[List[Dict[str, Any]], datetime]:
+    ) -> tuple[List[Union[LogRecord, PlaybackSession]], int]:
         """
         contents-start 발생 시 패턴에 따라 여러 로그를 한 번에 생성
 
+        패턴 단계/시간 분포는 WatchPatternEngine이 config에서 컴파일한 배열을 사용
+        playing_interval_seconds > 0이면 재생 구간 heartbeat를 PlaybackSession으로 덧붙임
+
         Returns:
-            (로그 딕셔너리 리스트, 패턴 종료 시간)
+            (LogRecord/PlaybackSession 리스트, 패턴 종료 시간)
         """
-        logs = []
-
-        # 1. 패턴 타입 랜덤 선택
-        pattern_types = list(self.watch_pattern_prob.keys())
-        pattern_weights = list(self.watch_pattern_prob.values())
-        selected_pattern = random.choices(pattern_types, weights=pattern_weights)[0]
+        # 1. 패턴 랜덤 선택 (config의 watch_patterns를 컴파일한 패턴)
+        pattern = self.watch_patterns.choose()
 
         # 2. 활성도 등급에 따른 총 시청시간 계산 (분 단위)
         total_watch_minutes = self._calculate_watch_duration(user.activity_level)
@@ -318,310 +322,161 @@ class LogContents:
         # 3. 콘텐츠 정보 가져오기
         content_id = user.current_content_id
         if not content_id:
-            content = self.db_client.get_random_content()
-            content_id = content["contents_id"] if content else "movie_0"
+            content = self.profiles.pick_content(user)
+            content_id = content.contents_id if content else "movie_0"
             user.current_content_id = content_id
+        else:
+            content = self.db_client.get_content_by_id(content_id)
+
+        # TV 시리즈면 에피소드 ID 튜플 (카탈로그에 미리 만든 튜플)
+        episode_ids = ()
+        if content is not None and content.contents_type == "tv":
+            episode_ids = content.episode_ids
+        first_episode = self.random_pool.index(len(episode_ids)) if episode_ids else 0
+
+        # 4. 에피소드별 공통 detail (같은 에피소드의 Play/Pause/Resume/Stop은 detail 공유)
+        platform_fragment = self.renderer.platform_fragments[self.profiles.platform(user)]
+        content_fragment = self._content_fragment(content_id, content)
+        details = []
+        episode_id = None
+        for episode in range(pattern.episode_index[-1] + 1):
+            if episode_ids:
+                episode_id = episode_ids[(first_episode + episode) % len(episode_ids)]
+            details.append(self.renderer.detail(
+                platform_fragment,
+                content_fragment,
+                self.renderer.field("episode_id", episode_id)
+            ))
+        if episode_id is not None:
+            user.current_episode_id = episode_id
+
+        # 최근 시청 콘텐츠 기록 (이어보기용)
+        if content is not None:
+            self.profiles.remember(user, content)
+
+        # 5. 패턴 단계별 오프셋을 한 번에 계산하여 로그 생성
+        offsets = self.watch_patterns.offsets(pattern, total_watch_minutes)
+        user_id = user.user_id
+        logs = [
+            LogRecord(timestamp + int(offset * 60_000), user_id, 2, event_type_code, details[episode])
+            for offset, event_type_code, episode in zip(offsets, pattern.event_type_codes, pattern.episode_index)
+        ]
 
-        content = self.db_client.get_content_by_id(content_id)
-        if not content:
-            content = {"contents_type": "movie"}
+        pattern_end_time = logs[-1].timestamp
 
-        content_type_code = ContentType.SERIES.value if content["contents_type"] == "tv" else ContentType.SINGLE.value
+        # 6. 재생 구간 heartbeat (contents-playing): 에피소드별 PlaybackSession 1개로 압축 전달
+        if self.playing_interval > 0:
+            logs.extend(self._playback_sessions(user_id, timestamp, pattern, offsets, details))
 
-        # TV 시리즈면 에피소드 ID
-        episode_id = None
-        if content["contents_type"] == "tv":
-            episodes = self.db_client.get_episodes_by_content_id(content_id)
-            if episodes:
-                episode = random.choice(episodes)
-                episode_id = episode["episode_id"]
-                user.current_episode_id = episode_id
-
-        # 4. 패턴에 따라 로그 생성
-        current_time = timestamp
-        platform = self._get_random_platform()
-
-        # Play (contents-start) 로그
-        start_detail: ContentsStartDetail = {
-            "platform": platform,
-            "contents_id": content_id,
-            "contents_type": content_type_code,
-            "episode_id": episode_id
-        }
+        # 로그 리스트와 패턴 종료 시간(마지막 재생 로그의 타임스탬프) 반환
+        return logs, pattern_end_time
 
-        play_log = {
-            "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 2,
-            "event_type": 4,  # start
-            "detail": start_detail
-        }
-        logs.append(play_log)
-
-        # 패턴별 로그 생성 및 시간 할당
-        if selected_pattern == "play_stop":
-            # Play → stop (즉시 이탈)
-            current_time += timedelta(minutes=total_watch_minutes)
-
-        elif selected_pattern == "play_pause_stop":
-            # Play → Pause → stop (중단 이탈)
-            pause_time = total_watch_minutes * random.uniform(0.3, 0.7)
-            current_time += timedelta(minutes=pause_time)
-
-            pause_detail: ContentsPauseDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            pause_log = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 6,  # pause
-                "detail": pause_detail
-            }
-            logs.append(pause_log)
-
-            # 일시정지 후 대기 시간
-            current_time += timedelta(minutes=total_watch_minutes - pause_time)
-
-        elif selected_pattern == "play_pause_resume_stop":
-            # Play → Pause → Resume → stop (정상 시청)
-            pause_time = total_watch_minutes * random.uniform(0.2, 0.4)
-            current_time += timedelta(minutes=pause_time)
-
-            # Pause 로그
-            pause_detail: ContentsPauseDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            pause_log = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 6,  # pause
-                "detail": pause_detail
-            }
-            logs.append(pause_log)
-
-            # 일시정지 대기 시간 (1-5분)
-            wait_time = random.uniform(1, 5)
-            current_time += timedelta(minutes=wait_time)
-
-            # Resume 로그
-            resume_detail: ContentsResumeDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            resume_log = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 7,  # resume
-                "detail": resume_detail
-            }
-            logs.append(resume_log)
-
-            # 나머지 시청 시간
-            remaining_time = total_watch_minutes - pause_time
-            current_time += timedelta(minutes=remaining_time)
-
-        elif selected_pattern == "play_pause_resume_pause_stop":
-            # Play → Pause → Resume → Pause → stop (잦은 끊김)
-            first_pause_time = total_watch_minutes * random.uniform(0.15, 0.25)
-            current_time += timedelta(minutes=first_pause_time)
-
-            # 첫 번째 Pause
-            pause_detail1: ContentsPauseDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            pause_log1 = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 6,  # pause
-                "detail": pause_detail1
-            }
-            logs.append(pause_log1)
-
-            # 대기
-            current_time += timedelta(minutes=random.uniform(1, 3))
-
-            # Resume
-            resume_detail: ContentsResumeDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            resume_log = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 7,  # resume
-                "detail": resume_detail
-            }
-            logs.append(resume_log)
-
-            # 재시청
-            second_watch_time = total_watch_minutes * random.uniform(0.2, 0.35)
-            current_time += timedelta(minutes=second_watch_time)
-
-            # 두 번째 Pause
-            pause_detail2: ContentsPauseDetail = {
-                "platform": platform,
-                "contents_id": content_id,
-                "contents_type": content_type_code,
-                "episode_id": episode_id
-            }
-
-            pause_log2 = {
-                "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-                "user_id": user.user_id,
-                "event_category": 2,
-                "event_type": 6,  # pause
-                "detail": pause_detail2
-            }
-            logs.append(pause_log2)
-
-            # 나머지 시간
-            remaining = total_watch_minutes - first_pause_time - second_watch_time
-            current_time += timedelta(minutes=remaining)
-
-        # 마지막 Stop 로그 (모든 패턴 공통)
-        stop_detail: ContentsStopDetail = {
-            "platform": platform,
-            "contents_id": content_id,
-            "contents_type": content_type_code,
-            "episode_id": episode_id
-        }
 
-        stop_log = {
-            "timestamp": current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 2,
-            "event_type": 5,  # stop
-            "detail": stop_detail
-        }
-        logs.append(stop_log)
+    def _playback_sessions(
+        self,
+        user_id: int,
+        timestamp: int,
+        pattern,
+        offsets: List[float],
+        details: List[bytes]
+    ) -> List[PlaybackSession]:
+        """
+        재생 구간(start/resume → pause/stop)마다 playing_interval초 간격 heartbeat를 갖는 세션 생성
 
-        # 로그 리스트와 패턴 종료 시간(stop 로그의 타임스탬프) 반환
-        return logs, current_time
+        구간 시작 후 interval초부터 구간 끝 전까지 heartbeat 발생 (LogSink에서 전개)
+        """
+        interval = int(self.playing_interval * 1000)
+        segments_by_episode: Dict[int, List[Tuple[int, int]]] = {}
+        for episode, start, end in self.watch_patterns.play_segments(pattern, offsets):
+            segments_by_episode.setdefault(episode, []).append((int(start * 60_000) + interval, int(end * 60_000)))
+
+        sessions = []
+        for episode, segments in segments_by_episode.items():
+            session = PlaybackSession(timestamp, user_id, details[episode], tuple(segments), interval)
+            if session.heartbeat_count() > 0:
+                sessions.append(session)
+        return sessions
 
 
     def _generate_contents_like_on(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """contents-like_on 로그 생성"""
-        content_id = user.current_content_id or "movie_0"
-
-        content = self.db_client.get_content_by_id(content_id)
-        if not content:
-            content = {"contents_type": "movie"}
-
-        content_type_code = ContentType.SERIES.value if content["contents_type"] == "tv" else ContentType.SINGLE.value
-
-        detail: ContentsLikeOnDetail = {
-            "contents_id": content_id,
-            "contents_type": content_type_code
-        }
-
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 2,  # contents
-            "event_type": 8,  # like_on
-            "detail": detail
-        }
+    ) -> Optional[LogRecord]:
+        """contents-like_on 로그 생성 (이미 좋아요한 콘텐츠면 로그 없음)"""
+        return self._generate_contents_like(user, timestamp, True)
 
 
     def _generate_contents_like_off(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """contents-like_off 로그 생성"""
+    ) -> Optional[LogRecord]:
+        """contents-like_off 로그 생성 (좋아요하지 않은 콘텐츠면 로그 없음)"""
+        return self._generate_contents_like(user, timestamp, False)
+
+
+    def _generate_contents_like(self, user, timestamp: int, liked: bool) -> Optional[LogRecord]:
+        """
+        좋아요 등록/취소 로그 생성
+
+        UserEventController가 뽑은 이벤트(like_on/like_off)를 그대로 사용하고 LikeStore는 검사에만 사용
+        (user_event_transitions의 like_on/like_off 확률이 그대로 유지됨)
+        - 이미 좋아요한 콘텐츠에 like_on, 좋아요하지 않은 콘텐츠에 like_off → 버튼 상태가 같으므로 로그 없음
+        - 그 외에는 상태를 변경하고 로그 생성
+        카탈로그에 없는 콘텐츠는 상태를 추적하지 않으므로 좋아요하지 않은 콘텐츠로 취급
+        """
         content_id = user.current_content_id or "movie_0"
 
         content = self.db_client.get_content_by_id(content_id)
-        if not content:
-            content = {"contents_type": "movie"}
 
-        content_type_code = ContentType.SERIES.value if content["contents_type"] == "tv" else ContentType.SINGLE.value
+        if content is not None:
+            if self.likes.is_liked(user.user_id, content) == liked:
+                return None
+            self.likes.set_liked(user.user_id, content, liked, timestamp)
+        elif not liked:
+            return None
 
-        detail: ContentsLikeOffDetail = {
-            "contents_id": content_id,
-            "contents_type": content_type_code
-        }
+        event_type_code = EventType.LIKE_ON.value if liked else EventType.LIKE_OFF.value
+        detail = self.renderer.detail(self._content_fragment(content_id, content))
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 2,  # contents
-            "event_type": 9,  # like_off
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 2, event_type_code, detail)  # contents, like_on/like_off
 
 
     # ========== 리뷰 로그 (review) ==========
     def _generate_review_review(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> LogRecord:
         """review-review 로그 생성"""
         content_id = user.current_content_id or "movie_0"
 
         # 평점: 0.5 단위 (0.5 ~ 5.0)
-        rating = round(random.uniform(0.5, 5.0) * 2) / 2
+        rating = round(self.random_pool.uniform(0.5, 5.0) * 2) / 2
 
         # 리뷰 내용 (config의 review_detail_ratio 확률로 작성)
-        review_detail_text = None
-        if random.random() < self.review_detail_ratio:
-            review_detail_text = random.choice(self.review_samples)
-
-        detail: ReviewReviewDetail = {
-            "contents_id": content_id,
-            "rating": rating,
-            "detail": review_detail_text
-        }
+        review_fragment = self.empty_review_fragment
+        if self.random_pool.random() < self.review_detail_ratio:
+            review_fragment = self.random_pool.pick(self.review_fragments)
 
-        log = {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 3,  # review
-            "event_type": 10,  # review
-            "detail": detail
-        }
+        detail = self.renderer.detail(
+            self.renderer.field("contents_id", content_id),
+            self.renderer.field("rating", rating),
+            review_fragment
+        )
 
-        return log
+        return LogRecord(timestamp, user.user_id, 3, 10, detail)  # review, review
 
 
     # ========== 구독 로그 (subscription) ==========
-    def _generate_subscription_start(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_subscription_start(self, user, timestamp: int) -> LogRecord:
         """subscription-start 로그 생성"""
         # config 비율에 따라 subscription_type 선택
-        subscription_types = list(self.subscription_type_ratio.keys())
-        weights = list(self.subscription_type_ratio.values())
-        selected_type = random.choices(subscription_types, weights=weights)[0]
+        selected_type = self.subscription_types[self.random_pool.choice("subscription_type")]
 
         # subscription_type에 따른 ID 매핑
         # standard: s_1~s_4, premium: s_5~s_8, family: s_9~s_12, mobile_only: s_13~s_16
@@ -633,7 +488,7 @@ class LogContents:
         }
 
         start_id, end_id = type_to_id_range.get(selected_type, (1, 4))
-        subscription_id = f"s_{random.randint(start_id, end_id)}"
+        subscription_id = f"s_{self.random_pool.randint(start_id, end_id)}"
 
         # DB 업데이트: subscription_status를 'active'로 변경
         self.db_client.activate_subscription(user.user_id, subscription_id)
@@ -641,23 +496,15 @@ class LogContents:
         # User 객체도 업데이트
         user.is_subscribed = True
 
-        detail: SubscriptionStartDetail = {
-            "subscription_id": subscription_id
-        }
+        detail = self.renderer.detail(self.renderer.field("subscription_id", subscription_id))
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 4,  # subscription
-            "event_type": 4,  # start
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 4, 4, detail)  # subscription, start
 
 
-    def _generate_subscription_stop(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_subscription_stop(self, user, timestamp: int) -> LogRecord:
         """subscription-stop 로그 생성"""
         # subscription_plans 테이블이 삭제되어 하드코딩된 ID 사용
-        subscription_id = f"s_{random.randint(1, 16)}"
+        subscription_id = f"s_{self.random_pool.randint(1, 16)}"
 
         # DB 업데이트: subscription_status를 'expired' 또는 'cancelled'로 랜덤 변경
         self.db_client.deactivate_subscription(user.user_id)
@@ -665,22 +512,17 @@ class LogContents:
         # User 객체도 업데이트
         user.is_subscribed = False
 
-        detail: SubscriptionStopDetail = {
-            "subscription_id": subscription_id
-        }
+        detail = self.renderer.detail(self.renderer.field("subscription_id", subscription_id))
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 4,  # subscription
-            "event_type": 5,  # stop
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 4, 5, detail)  # subscription, stop
 
 
     # ========== 회원 로그 (register) ==========
-    def _generate_register_in(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_register_in(self, user, timestamp: int) -> LogRecord:
         """register-in 로그 생성"""
+        # 가입 직후 세션 시작 (프로필 구성 + 세션 플랫폼 결정)
+        self.profiles.start_session(user)
+
         # 유입 경로 랜덤 선택
         traffic_sources = [
             TrafficSource.SEARCH,
@@ -690,74 +532,55 @@ class LogContents:
             TrafficSource.REFERRAL,
             TrafficSource.MISC
         ]
-        traffic_source = random.choice(traffic_sources).value
+        traffic_source = self.random_pool.pick(traffic_sources).value
 
-        detail: RegisterInDetail = {
-            "traffic_source": traffic_source
-        }
+        detail = self.renderer.detail(self.renderer.field("traffic_source", traffic_source))
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 5,  # register
-            "event_type": 1,  # in
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 5, 1, detail)  # register, in
 
 
     def _generate_register_out(
         self,
         user,
-        timestamp: datetime,
+        timestamp: int,
         additional_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> LogRecord:
         """register-out 로그 생성"""
+        # DB 업데이트: account_status를 'deleted'로 변경 + 모집단에서 제외
+        if additional_data.get("delete_user"):
+            self.db_client.delete_user(user.user_id)
+            user.is_deleted = True
+
         # 탈퇴 이유 타입 랜덤 선택
         reason_types = [ReasonType.CONTENTS, ReasonType.CHARGE, ReasonType.MISC]
-        reason_type = random.choice(reason_types).value
+        reason_type = self.random_pool.pick(reason_types).value
 
         # 탈퇴 이유 상세 (config의 register_out_detail_ratio 확률로 작성)
-        reason_detail_text = None
-        if random.random() < self.register_out_detail_ratio:
-            reason_detail_text = random.choice(self.register_out_reasons)
-
-        detail: RegisterOutDetail = {
-            "reason_type": reason_type,
-            "reason_detail": reason_detail_text
-        }
+        reason_fragment = self.empty_reason_fragment
+        if self.random_pool.random() < self.register_out_detail_ratio:
+            reason_fragment = self.random_pool.pick(self.register_out_reason_fragments)
 
-        log = {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 5,  # register
-            "event_type": 2,  # out
-            "detail": detail
-        }
+        detail = self.renderer.detail(
+            self.renderer.field("reason_type", reason_type),
+            reason_fragment
+        )
 
-        return log
+        return LogRecord(timestamp, user.user_id, 5, 2, detail)  # register, out
 
 
     # ========== 검색 로그 (search) ==========
-    def _generate_search_search(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_search_search(self, user, timestamp: int) -> LogRecord:
         """search-search 로그 생성"""
-        # 검색어 후보 (config에서 읽기)
-        term = random.choice(self.search_terms)
-
-        detail: SearchSearchDetail = {
-            "term": term
-        }
+        # 검색어 후보 (config에서 읽어 미리 인코딩한 조각), 다음 contents-click을 위해 검색어 기억
+        term = self.random_pool.index(len(self.search_term_fragments))
+        user.table.last_search[user.row] = term
+        detail = self.renderer.detail(self.search_term_fragments[term])
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 6,  # search
-            "event_type": 11,  # search
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 6, 11, detail)  # search, search
 
 
     # ========== 고객센터 로그 (support) ==========
-    def _generate_support_inquiry(self, user, timestamp: datetime) -> Dict[str, Any]:
+    def _generate_support_inquiry(self, user, timestamp: int) -> LogRecord:
         """support-inquiry 로그 생성"""
         # 문의 타입 랜덤 선택
         inquiry_types = [
@@ -766,20 +589,12 @@ class LogContents:
             InquiryType.SUBSCRIPTION,
             InquiryType.INFORMATION
         ]
-        inquiry_type = random.choice(inquiry_types).value
-
-        # 문의 내용 (config에서 읽기)
-        inquiry_detail_text = random.choice(self.inquiry_samples)
+        inquiry_type = self.random_pool.pick(inquiry_types).value
 
-        detail: SupportInquiryDetail = {
-            "inquiry_type": inquiry_type,
-            "inquiry_detail": inquiry_detail_text
-        }
+        # 문의 내용 (config에서 읽어 미리 인코딩한 조각)
+        detail = self.renderer.detail(
+            self.renderer.field("inquiry_type", inquiry_type),
+            self.random_pool.pick(self.inquiry_fragments)
+        )
 
-        return {
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "user_id": user.user_id,
-            "event_category": 7,  # support
-            "event_type": 12,  # inquiry
-            "detail": detail
-        }
+        return LogRecord(timestamp, user.user_id, 7, 12, detail)  # support, inquiry
@@ -0,0 +1,114 @@
+import heapq
+from itertools import count
+from typing import Iterator, List, Optional, Tuple, Union
+
+from schemas.log_record import LogRecord, PlaybackSession
+from src.log_sink import LogSink
+
+
+class LogOrderer:
+    """
+    이벤트 시각 순서 정렬 단계 (LogContents → LogOrderer → LogSink)
+
+    책임:
+    - contents-start 패턴처럼 미래 시각 로그가 먼저 생성되어도 LogSink에는 시각 순서대로 전달
+    - 이벤트 시각 기준 최소 힙에 보관하고, 생성기 시계(현재 타임스탬프) - 허용 지연이 지난 로그만 방출
+      (push/pop 모두 O(log n))
+    - PlaybackSession은 heartbeat를 미리 전개하지 않고 다음 heartbeat 1건만 힙에 유지
+    - 보관 로그 수가 max_pending_logs를 넘으면 가장 이른 로그부터 강제 방출 (메모리 상한)
+
+    순서 보장:
+    - 같은 시각의 로그는 생성 순서대로 방출 (힙 키에 순번 포함)
+    - 이미 방출된 시각보다 이른 로그(허용 지연 초과)는 즉시 방출하고 late_count로 집계
+    """
+
+    def __init__(self, config: dict, sink: LogSink):
+        """
+        Args:
+            config: config.toml 전체 dict
+            sink: 정렬된 로그를 받을 LogSink
+        """
+        self.sink = sink
+
+        sink_config = config.get("log_sink", {})
+        self.allowed_lateness = int(sink_config.get("allowed_lateness_seconds", 5) * 1000)  # ms
+        self.max_pending = sink_config.get("max_pending_logs", 1_000_000)
+
+        # (이벤트 시각 epoch ms, 순번, LogRecord, 남은 heartbeat 이터레이터)
+        self._heap: List[Tuple[int, int, LogRecord, Optional[Iterator[LogRecord]]]] = []
+        self._sequence = count()
+        self.last_emitted: Optional[int] = None
+        self.late_count = 0
+
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+    def write(self, log_event: Union[LogRecord, PlaybackSession]) -> None:
+        """
+        로그를 정렬 힙에 추가
+
+        Args:
+            log_event: LogRecord 또는 PlaybackSession
+        """
+        if log_event is None:
+            return
+
+        if isinstance(log_event, PlaybackSession):
+            records = log_event.records()
+            first = next(records, None)
+            if first is not None:
+                self._push(first, records)
+        else:
+            self._push(log_event, None)
+
+        # 메모리 상한: 가장 이른 로그부터 방출
+        while len(self._heap) > self.max_pending:
+            self._emit_next()
+
+
+    def advance(self, clock: int) -> None:
+        """
+        생성기 시계를 clock으로 진행하고 clock - 허용 지연 이전의 로그를 모두 방출
+
+        Args:
+            clock: 현재 처리 중인 타임스탬프 epoch ms (batch는 생성 타임스탬프, streaming은 현재 시각)
+        """
+        watermark = clock - self.allowed_lateness
+        heap = self._heap
+        while heap and heap[0][0] <= watermark:
+            self._emit_next()
+
+
+    def flush(self) -> None:
+        """남은 로그를 모두 시각 순서대로 방출 (월 종료/프로그램 종료 시)"""
+        while self._heap:
+            self._emit_next()
+
+        if self.late_count:
+            print(f"⚠️  허용 지연을 넘긴 로그 {self.late_count:,}건은 도착 즉시 출력됨")
+            self.late_count = 0
+
+
+    def _push(self, record: LogRecord, rest: Optional[Iterator[LogRecord]]) -> None:
+        """힙에 추가 (이미 방출된 시각보다 이르면 즉시 방출)"""
+        while self.last_emitted is not None and record.timestamp < self.last_emitted:
+            self.late_count += 1
+            self.sink.write(record)
+            record = next(rest, None) if rest is not None else None
+            if record is None:
+                return
+        heapq.heappush(self._heap, (record.timestamp, next(self._sequence), record, rest))
+
+
+    def _emit_next(self) -> None:
+        """가장 이른 로그 1건을 LogSink로 방출 (세션이면 다음 heartbeat를 다시 힙에 추가)"""
+        timestamp, _, record, rest = heapq.heappop(self._heap)
+        self.sink.write(record)
+        self.last_emitted = timestamp
+
+        if rest is not None:
+            following = next(rest, None)
+            if following is not None:
+                heapq.heappush(self._heap, (following.timestamp, next(self._sequence), following, rest))
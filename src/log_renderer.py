@@ -0,0 +1,142 @@
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from schemas.enum import Platform
+from schemas.log_record import LogRecord
+
+
+class LogRenderer:
+    """
+    로그 직렬화 전담 클래스 (미리 인코딩된 바이트 템플릿 기반)
+
+    책임:
+    - (event_category, event_type)별 로그 바이트 템플릿 사전 컴파일
+    - 콘텐츠/플랫폼/텍스트 샘플 등 고정 detail 조각을 UTF-8 바이트로 미리 인코딩
+    - LogRecord를 json.dumps 없이 바이트로 조립 (재사용 버퍼에 append 가능)
+    - epoch ms 타임스탬프 → ISO 문자열 변환 시 초 단위 prefix 캐시 (같은 초의 로그는 ms 3자리만 조립)
+
+    출력 형식은 기존 json.dumps(log, ensure_ascii=False)와 동일
+    (키 순서: timestamp, user_id, event_category, event_type, detail)
+    - sink_type이 kinesis면 detail의 null 필드를 그대로 출력
+    - 그 외(local/s3)는 null 필드를 제외하고 출력
+    """
+
+    def __init__(self, config: dict, db_client=None):
+        """
+        Args:
+            config: config.toml 전체 dict
+            db_client: 콘텐츠 캐시 조회용 (있으면 콘텐츠 조각을 미리 인코딩)
+        """
+        sink_config = config.get("log_sink", {})
+        self.keep_nulls = sink_config.get("sink_type", "local") == "kinesis"
+
+        # (event_category, event_type) → b', "event_category": C, "event_type": T, "detail": '
+        self._event_fragments: Dict[Tuple[int, int], bytes] = {}
+
+        # 마지막으로 변환한 초와 b'{"timestamp": "YYYY-MM-DDTHH:MM:SS.' prefix
+        self._prefix_second = -1
+        self._timestamp_prefix = b""
+
+        # 텍스트/숫자 필드 조각 캐시: (필드명, 값 타입, 값) → b'"name": value'
+        # (3 == 3.0 == True처럼 해시가 같은 값도 타입별로 따로 인코딩)
+        self._field_cache: Dict[Tuple[str, type, Any], bytes] = {}
+
+        # 플랫폼 코드 → b'"platform": N'
+        self.platform_fragments = [b""] * (max(p.value for p in Platform) + 1)
+        for platform in Platform:
+            self.platform_fragments[platform.value] = self.field("platform", platform.value)
+
+        # 콘텐츠 조각 캐시: (contents_id, contents_type) → b'"contents_id": "...", "contents_type": N'
+        self._content_cache: Dict[Tuple[str, int], bytes] = {}
+
+        # 카탈로그 slot → 콘텐츠 조각 (ContentRecord.slot으로 바로 조회)
+        self.content_fragments: List[bytes] = []
+        if db_client is not None and db_client.catalog:
+            self.content_fragments = [
+                self.content_fragment(record.contents_id, record.type_code)
+                for record in db_client.catalog
+            ]
+
+
+    # ========== detail 조각 ==========
+
+    def field(self, name: str, value: Any) -> bytes:
+        """
+        단일 필드 조각 (캐시됨)
+
+        Returns:
+            b'"name": <json value>' (값이 None이고 keep_nulls가 False면 b'')
+        """
+        key = (name, type(value), value)
+        fragment = self._field_cache.get(key)
+        if fragment is None:
+            if value is None and not self.keep_nulls:
+                fragment = b""
+            else:
+                fragment = (
+                    json.dumps(name) + ": " + json.dumps(value, ensure_ascii=False)
+                ).encode("utf-8")
+            self._field_cache[key] = fragment
+        return fragment
+
+
+    def content_fragment(self, contents_id: str, contents_type: int) -> bytes:
+        """콘텐츠 ID/타입 조각 (캐시됨)"""
+        key = (contents_id, contents_type)
+        fragment = self._content_cache.get(key)
+        if fragment is None:
+            fragment = (
+                self.field("contents_id", contents_id) + b", " + self.field("contents_type", contents_type)
+            )
+            self._content_cache[key] = fragment
+        return fragment
+
+
+    @staticmethod
+    def detail(*fragments: bytes) -> bytes:
+        """detail 조각들을 JSON 객체 바이트로 결합 (빈 조각은 제외)"""
+        return b"{" + b", ".join([f for f in fragments if f]) + b"}"
+
+
+    # ========== 레코드 직렬화 ==========
+
+    def _event_fragment(self, event_category: int, event_type: int) -> bytes:
+        """(카테고리, 타입)별 고정 바이트 템플릿"""
+        key = (event_category, event_type)
+        fragment = self._event_fragments.get(key)
+        if fragment is None:
+            fragment = (
+                f', "event_category": {event_category}, "event_type": {event_type}, "detail": '
+            ).encode("utf-8")
+            self._event_fragments[key] = fragment
+        return fragment
+
+
+    def render_into(self, buffer: bytearray, record: LogRecord) -> None:
+        """
+        LogRecord를 JSON 바이트로 직렬화하여 버퍼에 append (줄바꿈 미포함)
+
+        Args:
+            buffer: 재사용 버퍼
+            record: 로그 레코드
+        """
+        second, millis = divmod(record.timestamp, 1000)
+        if second != self._prefix_second:
+            self._prefix_second = second
+            self._timestamp_prefix = (
+                '{"timestamp": "' + time.strftime("%Y-%m-%dT%H:%M:%S.", time.gmtime(second))
+            ).encode("ascii")
+        buffer += self._timestamp_prefix
+        buffer += b'%03dZ", "user_id": ' % millis
+        buffer += str(record.user_id).encode("ascii")
+        buffer += self._event_fragment(record.event_category, record.event_type)
+        buffer += record.detail
+        buffer += b"}"
+
+
+    def render(self, record: LogRecord) -> bytes:
+        """LogRecord → JSON 바이트 (Kinesis 레코드 1건용)"""
+        buffer = bytearray()
+        self.render_into(buffer, record)
+        return bytes(buffer)
@@ -1,14 +1,22 @@
 import os
-import json
 import time
 import uuid
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Optional, List
 from collections import defaultdict
 import boto3
 from botocore.exceptions import ClientError
 
+from schemas.log_record import LogRecord
+from src.log_renderer import LogRenderer
+
+
+# 파일 저장 시 한 번에 기록하는 바이트 수
+WRITE_CHUNK_BYTES = 1 << 20
+
+# epoch ms → 시간 파티션 키
+MS_PER_HOUR = 3_600_000
+
 
 class LogSink:
     """
@@ -18,14 +26,18 @@ class LogSink:
     - 로그 출력 방식 결정 (로컬/S3/Kinesis)
     - MSK S3 Sink Connector와 동일한 폴더 구조/파일명 생성
     - MPS(Messages Per Second) 제어
+    - LogRecord 직렬화 (LogRenderer 바이트 템플릿 사용, 이벤트별 json.dumps 없음)
+    - 시각 순서로 들어온 로그(LogOrderer)를 시간대 단위 파일로 저장
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, renderer: Optional[LogRenderer] = None):
         """
         Args:
             config: config.toml 전체 dict
+            renderer: 로그 직렬화기 (없으면 새로 생성, LogContents와 공유 권장)
         """
         self.config = config
+        self.renderer = renderer or LogRenderer(config)
 
         # Global 설정
         global_config = config.get("global", {})
@@ -78,17 +90,15 @@ class LogSink:
                 self.kinesis_client = boto3.client('kinesis', region_name=self.kinesis_region)
 
         # 시간별 오프셋 카운터 (파일명용)
-        self.hourly_offsets: Dict[str, int] = defaultdict(int)
-
-        # 현재 시간대 버퍼와 다음 시간대 버퍼 (두 개의 버퍼로 관리)
-        self.current_hour_key: Optional[str] = None
-        self.current_hour_buffer: List[Dict[str, Any]] = []
+        self.hourly_offsets: Dict[int, int] = defaultdict(int)
 
-        self.next_hour_key: Optional[str] = None
-        self.next_hour_buffer: List[Dict[str, Any]] = []
+        # 현재 시간대 버퍼 (입력이 시각 순서이므로 버퍼 하나로 관리)
+        # 시간 키: UTC epoch 시간 번호 (epoch ms // MS_PER_HOUR, 정수 나눗셈만으로 계산)
+        self.current_hour_key: Optional[int] = None
+        self.current_hour_buffer: List[LogRecord] = []
 
         # Kinesis 배치 전송용 버퍼 (streaming-batch 모드 전용)
-        self.kinesis_batch_buffer: List[Dict[str, Any]] = []
+        self.kinesis_batch_buffer: List[LogRecord] = []
         self.last_batch_send_time = time.time()
 
         print(f"✅ LogSink 초기화 완료")
@@ -109,12 +119,12 @@ class LogSink:
                 print(f"   Batch Timeout: {self.batch_timeout_ms}ms")
 
 
-    def write(self, log_event: Dict[str, Any]) -> None:
+    def write(self, log_event: LogRecord) -> None:
         """
         로그 쓰기 (모드에 따라 분기)
 
         Args:
-            log_event: 로그 딕셔너리
+            log_event: LogRecord
         """
         if log_event is None:
             return
@@ -127,7 +137,7 @@ class LogSink:
             self.batch_write(log_event)
 
 
-    def streaming_single_write(self, log_event: Dict[str, Any]) -> None:
+    def streaming_single_write(self, log_event: LogRecord) -> None:
         """
         Streaming Single 모드: Kinesis로 즉시 단일 전송 (put_record)
 
@@ -135,7 +145,7 @@ class LogSink:
         미지원: Local, S3
 
         Args:
-            log_event: 로그 딕셔너리
+            log_event: LogRecord
         """
         if self.sink_type == "kinesis":
             self._write_to_kinesis_single(log_event)
@@ -147,7 +157,7 @@ class LogSink:
         if self.interval > 0:
             time.sleep(self.interval)
 
-    def streaming_batch_write(self, log_event: Dict[str, Any]) -> None:
+    def streaming_batch_write(self, log_event: LogRecord) -> None:
         """
         Streaming Batch 모드: Kinesis로 배치 전송 (put_records)
 
@@ -155,7 +165,7 @@ class LogSink:
         미지원: Local, S3
 
         Args:
-            log_event: 로그 딕셔너리
+            log_event: LogRecord
         """
         if self.sink_type != "kinesis":
             print(f"❌ Streaming 모드는 Kinesis만 지원합니다. (현재 sink_type: {self.sink_type})")
@@ -177,7 +187,7 @@ class LogSink:
             time.sleep(self.interval)
 
 
-    def batch_write(self, log_event: Dict[str, Any]) -> None:
+    def batch_write(self, log_event: LogRecord) -> None:
         """
         Batch 모드: 버퍼에 모아서 파일로 저장
 
@@ -185,7 +195,7 @@ class LogSink:
         미지원: Kinesis
 
         Args:
-            log_event: 로그 딕셔너리
+            log_event: LogRecord
         """
         if self.sink_type == "local":
             self._write_to_local(log_event)
@@ -200,98 +210,49 @@ class LogSink:
             time.sleep(self.interval)
 
 
-    def _write_to_local(self, log_event: Dict[str, Any]) -> None:
+    def _write_to_local(self, log_event: LogRecord) -> None:
         """
         로컬 파일에 JSON 형식으로 저장
 
         폴더 구조: {output_dir}/{topic}/year={YYYY}/month={MM}/day={DD}/hour={HH}/
         파일명: {topic}-{offset(6자리)}-{uuid}.json
 
-        현재 시간대 버퍼와 다음 시간대 버퍼 두 개로 관리
+        LogOrderer가 시각 순서대로 전달하므로 현재 시간대 버퍼 하나만 유지
         - 현재 시간대 로그 → 현재 버퍼에 추가
-        - 다음 시간대 로그 → 다음 버퍼에 추가
-        - 시간대 변경 시 → 현재 버퍼 flush, 다음 버퍼를 현재 버퍼로 승격
+        - 시간대 변경 시 → 현재 버퍼 flush 후 새 시간대 버퍼 시작
         """
-        timestamp_str = log_event.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        hour_key = log_event.timestamp // MS_PER_HOUR
 
-        # ISO 8601 형식 지원 (2025-09-01T01:18:20.000Z)
-        if "T" in timestamp_str:
-            # 밀리초 제거 후 파싱
-            timestamp_str_clean = timestamp_str.replace("Z", "").split(".")[0]
-            timestamp = datetime.strptime(timestamp_str_clean, "%Y-%m-%dT%H:%M:%S")
-        else:
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-
-        year = timestamp.strftime("%Y")
-        month = timestamp.strftime("%m")
-        day = timestamp.strftime("%d")
-        hour = timestamp.strftime("%H")
-
-        hour_key = f"{year}-{month}-{day}-{hour}"
-
-        # 첫 번째 로그인 경우 초기화
-        if self.current_hour_key is None:
+        if hour_key != self.current_hour_key:
+            if self.current_hour_key is not None:
+                self._flush_buffer_to_json(self.current_hour_key, self.current_hour_buffer)
             self.current_hour_key = hour_key
-            self.current_hour_buffer.append(log_event)
-            return
-
-        # 현재 시간대 로그인 경우
-        if hour_key == self.current_hour_key:
-            self.current_hour_buffer.append(log_event)
+            self.current_hour_buffer = []
 
-        # 다음 시간대 로그인 경우
-        elif self.next_hour_key is None or hour_key == self.next_hour_key:
-            if self.next_hour_key is None:
-                self.next_hour_key = hour_key
-            self.next_hour_buffer.append(log_event)
+        self.current_hour_buffer.append(log_event)
 
-        # 새로운 시간대로 전환 (현재 → 다음 → 새로운)
-        else:
-            # 1. 현재 시간대 버퍼를 flush
-            self._flush_buffer_to_json(self.current_hour_key, self.current_hour_buffer)
-
-            # 2. 다음 시간대 버퍼를 현재 시간대로 승격
-            self.current_hour_key = self.next_hour_key
-            self.current_hour_buffer = self.next_hour_buffer
 
-            # 3. 새로운 다음 시간대 설정
-            self.next_hour_key = hour_key
-            self.next_hour_buffer = [log_event]
-
-
-    def _flush_buffer_to_json(self, hour_key: str, buffer: List[Dict[str, Any]]) -> None:
+    def _flush_buffer_to_json(self, hour_key: int, buffer: List[LogRecord]) -> None:
         """
         특정 시간대 버퍼에 쌓인 로그를 JSON 파일로 저장
 
         Args:
-            hour_key: "YYYY-MM-DD-HH" 형식의 시간 키
-            buffer: 저장할 로그 리스트
+            hour_key: UTC epoch 시간 번호 (epoch ms // MS_PER_HOUR)
+            buffer: 저장할 LogRecord 리스트
         """
         if not buffer:
             return
 
-        # 시간순으로 정렬
-        sorted_logs = sorted(buffer, key=lambda x: x.get("timestamp", ""))
+        # 시간순으로 정렬 (LogOrderer를 거친 버퍼는 이미 정렬되어 있어 선형 시간, 허용 지연 초과 로그만 재배치)
+        buffer.sort(key=lambda record: record.timestamp)
 
-        # 첫 번째 로그의 타임스탬프로 경로 결정
-        first_log = sorted_logs[0]
-        timestamp_str = first_log.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
-        # ISO 8601 형식 지원 (2025-09-01T01:18:20.000Z)
-        if "T" in timestamp_str:
-            # 밀리초 제거 후 파싱
-            timestamp_str_clean = timestamp_str.replace("Z", "").split(".")[0]
-            timestamp = datetime.strptime(timestamp_str_clean, "%Y-%m-%dT%H:%M:%S")
-        else:
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-
-        year = timestamp.strftime("%Y")
-        month = timestamp.strftime("%m")
-        day = timestamp.strftime("%d")
-        hour = timestamp.strftime("%H")
+        year, month, day, hour = time.gmtime(hour_key * 3600)[:4]
 
         # 폴더 구조 생성
-        dir_path = Path(self.output_dir) / self.topic / f"year={year}" / f"month={month}" / f"day={day}" / f"hour={hour}"
+        dir_path = (
+            Path(self.output_dir) / self.topic
+            / f"year={year:04d}" / f"month={month:02d}" / f"day={day:02d}" / f"hour={hour:02d}"
+        )
         dir_path.mkdir(parents=True, exist_ok=True)
 
         # 파일명 생성: {topic}-{offset(6자리)}-{uuid}.json
@@ -300,31 +261,28 @@ class LogSink:
         filename = f"{self.topic}-{offset:06d}-{file_uuid}.json"
         file_path = dir_path / filename
 
-        # detail에서 null 값 제거
-        def remove_nulls(detail: dict) -> dict:
-            return {k: v for k, v in detail.items() if v is not None}
-
         # NDJSON (Newline Delimited JSON) 형식으로 저장
         # Kinesis에서 처리하기 위해 각 로그를 한 줄씩 저장
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for log in sorted_logs:
-                log_entry = {
-                    "timestamp": log["timestamp"],
-                    "user_id": log["user_id"],
-                    "event_category": log["event_category"],
-                    "event_type": log["event_type"],
-                    "detail": remove_nulls(log["detail"])
-                }
-                # 각 로그를 한 줄로 작성 (줄바꿈으로 구분)
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-
-        print(f"💾 JSON 저장: {filename} ({len(sorted_logs)}개 로그)")
+        # (null 필드는 LogRenderer가 detail 조각 생성 시 이미 제외)
+        # (heartbeat로 로그가 많아질 수 있으므로 WRITE_CHUNK_BYTES 단위로 나눠 기록)
+        render_into = self.renderer.render_into
+        data = bytearray()
+        with open(file_path, 'wb') as f:
+            for record in buffer:
+                render_into(data, record)
+                data += b"\n"
+                if len(data) >= WRITE_CHUNK_BYTES:
+                    f.write(data)
+                    data.clear()
+            f.write(data)
+
+        print(f"💾 JSON 저장: {filename} ({len(buffer)}개 로그)")
 
         # offset 증가
         self.hourly_offsets[hour_key] += 1
 
 
-    def _write_to_s3(self, log_event: Dict[str, Any]) -> None:
+    def _write_to_s3(self, log_event: LogRecord) -> None:
         """
         S3에 저장 (향후 구현)
 
@@ -339,12 +297,12 @@ class LogSink:
         # s3_client.upload_file(local_file, bucket, key)
 
 
-    def _write_to_kinesis_single(self, log_event: Dict[str, Any]) -> None:
+    def _write_to_kinesis_single(self, log_event: LogRecord) -> None:
         """
         Kinesis Data Streams로 단일 전송 (put_record)
 
         Args:
-            log_event: 로그 딕셔너리
+            log_event: LogRecord
         """
         if self.kinesis_client is None:
             print("❌ Kinesis client가 초기화되지 않았습니다.")
@@ -352,10 +310,10 @@ class LogSink:
 
         try:
             # user_id를 partition key로 사용 (같은 유저의 로그는 같은 샤드로)
-            partition_key = str(log_event.get("user_id", "default"))
+            partition_key = str(log_event.user_id)
 
-            # JSON을 바이트로 변환
-            data = json.dumps(log_event, ensure_ascii=False).encode('utf-8')
+            # 바이트 템플릿으로 직렬화
+            data = self.renderer.render(log_event)
 
             # Kinesis로 전송
             response = self.kinesis_client.put_record(
@@ -386,13 +344,11 @@ class LogSink:
         try:
             # put_records 요청 준비
             records = []
+            render = self.renderer.render
             for log_event in self.kinesis_batch_buffer:
-                partition_key = str(log_event.get("user_id", "default"))
-                data = json.dumps(log_event, ensure_ascii=False).encode('utf-8')
-
                 records.append({
-                    'Data': data,
-                    'PartitionKey': partition_key
+                    'Data': render(log_event),
+                    'PartitionKey': str(log_event.user_id)
                 })
 
             # Kinesis로 배치 전송
@@ -445,9 +401,6 @@ class LogSink:
         # 현재 시간대 버퍼 flush
         if self.current_hour_key is not None and self.current_hour_buffer:
             self._flush_buffer_to_json(self.current_hour_key, self.current_hour_buffer)
-
-        # 다음 시간대 버퍼 flush
-        if self.next_hour_key is not None and self.next_hour_buffer:
-            self._flush_buffer_to_json(self.next_hour_key, self.next_hour_buffer)
+            self.current_hour_buffer = []
 
         print("✅ LogSink 종료")
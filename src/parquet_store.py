@@ -0,0 +1,300 @@
+import calendar
+import os
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# DBClient 신규 유저 튜플 순서 (create_new_user → _apply_writes와 같은 순서)
+NEW_USER_COLUMNS = (
+    "user_id", "email", "password_hash", "name", "gender", "birth_date",
+    "country", "city", "signup_date", "account_status", "is_adult_verified", "push_opt_in",
+)
+
+# load_contents_cache가 기대하는 콘텐츠 컬럼 (Parquet 컬럼명 → 카탈로그 키)
+CONTENT_COLUMNS = {
+    "content_id": "contents_id",
+    "content_type": "contents_type",
+    "title": "title",
+    "genre_names": "genre",
+    "runtime": "runtime",
+    "popularity": "popularity",
+    "number_of_episodes": "number_of_episodes",
+    "release_date": "release_date",
+}
+
+
+def _import_pyarrow():
+    """pyarrow는 db_type = "parquet"일 때만 필요하므로 사용 시점에 import"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "db_type = \"parquet\"를 사용하려면 pyarrow가 필요합니다. (pip install pyarrow)"
+        ) from e
+    return pa, pc, pq
+
+
+class ParquetStore:
+    """
+    Parquet 스냅샷 기반 DB 대체 저장소 (DBClient db_type = "parquet")
+
+    책임:
+    - mock_db/mock_table_parquet.py가 내보낸 users / tmdb_contents / user_likes 파일을 Arrow 메모리 맵으로 로드
+      (읽기 전용 → 여러 워커 프로세스가 같은 파일 페이지를 공유, DB 연결/락 없음)
+    - 변경(신규 유저, 구독 활성화/해지, 탈퇴, 좋아요)은 메모리 overlay에만 반영
+    - 조회 시 스냅샷 + overlay 병합
+    - snapshot_dir이 있으면 종료 시 overlay를 반영한 새 스냅샷 기록
+
+    overlay 조회/반영은 DBClient write-behind 스레드와 생성 스레드가 함께 사용하므로 lock으로 보호
+    """
+
+    def __init__(self, parquet_dir: str, snapshot_dir: Optional[str] = None):
+        """
+        Args:
+            parquet_dir: {테이블명}.parquet 파일이 있는 폴더
+            snapshot_dir: 종료 시 새 스냅샷을 기록할 폴더 (없으면 기록하지 않음)
+        """
+        self.pa, self.pc, self.pq = _import_pyarrow()
+        self.parquet_dir = Path(parquet_dir)
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+
+        for table_name in ("users", "tmdb_contents"):
+            if not (self.parquet_dir / f"{table_name}.parquet").exists():
+                raise FileNotFoundError(
+                    f"Parquet 파일을 찾을 수 없습니다: {self.parquet_dir / f'{table_name}.parquet'}"
+                )
+
+        self.users = self._read("users")
+        self.contents = self._read("tmdb_contents")
+        likes_path = self.parquet_dir / "user_likes.parquet"
+        self.likes = self._read("user_likes") if likes_path.exists() else None
+
+        # overlay
+        self._lock = threading.Lock()
+        self._new_users: List[dict] = []                      # 신규 유저 행 (컬럼명 → 값)
+        self._new_user_index: Dict[int, dict] = {}            # user_id → 신규 유저 행
+        self._user_changes: Dict[int, dict] = {}              # 스냅샷 유저 user_id → 변경 컬럼
+        self._like_changes: Dict[Tuple[int, str], Optional[str]] = {}  # (user_id, content_id) → created_at (None = 삭제)
+
+
+    def _read(self, table_name: str):
+        """Parquet 파일 → Arrow Table (메모리 맵)"""
+        return self.pq.read_table(self.parquet_dir / f"{table_name}.parquet", memory_map=True)
+
+
+    # ========== 조회 ==========
+
+    def max_user_id(self) -> int:
+        """스냅샷 + 신규 유저 중 최대 user_id"""
+        base_max = self.pc.max(self.users["user_id"]).as_py() if self.users.num_rows else 0
+        with self._lock:
+            new_max = max(self._new_user_index, default=0)
+        return max(base_max or 0, new_max)
+
+
+    def active_users(self) -> List[Dict]:
+        """
+        account_status = 'active'인 유저 목록 (user_id 오름차순, overlay 반영)
+
+        Returns:
+            [{"user_id": 1, "is_subscribed": 1, "country": "KR"}, ...]
+        """
+        pc = self.pc
+        active = self.users.filter(pc.equal(self.users["account_status"], "active"))
+        active = active.sort_by("user_id")
+        user_ids = active["user_id"].to_pylist()
+        statuses = active["subscription_status"].to_pylist()
+        countries = active["country"].to_pylist()
+
+        users = []
+        with self._lock:
+            changes = self._user_changes
+            for user_id, status, country in zip(user_ids, statuses, countries):
+                change = changes.get(user_id)
+                if change is not None:
+                    if change.get("account_status", "active") != "active":
+                        continue
+                    status = change.get("subscription_status", status)
+                users.append({"user_id": user_id, "is_subscribed": int(status == "active"), "country": country})
+
+            for row in self._new_users:
+                if row["account_status"] == "active":
+                    users.append({
+                        "user_id": row["user_id"],
+                        "is_subscribed": int(row.get("subscription_status") == "active"),
+                        "country": row["country"],
+                    })
+        return users
+
+
+    def iter_contents(self, limit: int, batch_size: int) -> Iterator[Dict]:
+        """
+        인기도 내림차순 콘텐츠 (load_contents_cache용 키로 변환)
+
+        Args:
+            limit: 상위 N개 (0이면 전체)
+            batch_size: 한 번에 dict로 변환하는 행 수
+        """
+        table = self.contents.sort_by([("popularity", "descending")])
+        if limit > 0:
+            table = table.slice(0, limit)
+        table = table.select(list(CONTENT_COLUMNS)).rename_columns(list(CONTENT_COLUMNS.values()))
+        for batch in table.to_batches(max_chunksize=batch_size):
+            yield from batch.to_pylist()
+
+
+    def iter_likes(self) -> Iterator[Tuple[int, str]]:
+        """user_likes 전체 (user_id, content_id) (overlay 반영)"""
+        with self._lock:
+            like_changes = dict(self._like_changes)
+
+        if self.likes is not None:
+            for batch in self.likes.select(["user_id", "content_id"]).to_batches():
+                for user_id, content_id in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+                    if (user_id, content_id) not in like_changes:
+                        yield user_id, content_id
+
+        for key, created_at in like_changes.items():
+            if created_at is not None:
+                yield key
+
+
+    # ========== 변경 (overlay) ==========
+
+    def apply(self, new_users: List[tuple], user_updates: Dict[int, list], like_changes: Dict[tuple, tuple]):
+        """
+        DBClient 쓰기 배치를 overlay에 반영 (_apply_writes와 같은 순서/의미)
+
+        Args:
+            new_users: NEW_USER_COLUMNS 순서의 튜플 목록
+            user_updates: user_id → [구독 활성화 subscription_id, 구독 해지 상태, 탈퇴 여부]
+            like_changes: (user_id, content_id) → (좋아요 여부, created_at)
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        today = datetime.now(timezone.utc).date()
+
+        with self._lock:
+            for values in new_users:
+                row = {
+                    column: value.isoformat() if isinstance(value, date) else value
+                    for column, value in zip(NEW_USER_COLUMNS, values)
+                }
+                row["created_at"] = row["updated_at"] = now
+                self._new_users.append(row)
+                self._new_user_index[row["user_id"]] = row
+
+            for user_id, (subscription_id, deactivated_status, deleted) in user_updates.items():
+                row = self._new_user_index.get(user_id)
+                if row is None:
+                    row = self._user_changes.setdefault(user_id, {})
+                if subscription_id is not None:
+                    row["subscription_status"] = "active"
+                    row["subscription_start_date"] = today.isoformat()
+                    row["subscription_end_date"] = self._add_month(today).isoformat()
+                    row["subscription_id"] = subscription_id
+                if deactivated_status is not None:
+                    row["subscription_status"] = deactivated_status
+                if deleted:
+                    row["account_status"] = "deleted"
+
+            for key, (liked, created_at) in like_changes.items():
+                self._like_changes[key] = created_at if liked else None
+
+
+    @staticmethod
+    def _add_month(day: date) -> date:
+        """1개월 후 (말일은 다음 달 말일로 맞춤)"""
+        year, month = (day.year + 1, 1) if day.month == 12 else (day.year, day.month + 1)
+        return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+    # ========== 스냅샷 ==========
+
+    def write_snapshot(self) -> Optional[Path]:
+        """
+        overlay를 반영한 users / tmdb_contents / user_likes를 snapshot_dir에 기록
+
+        원본과 같은 폴더여도 임시 파일에 쓴 뒤 교체하므로 메모리 맵 중인 파일을 덮어쓰지 않음
+
+        Returns:
+            기록한 폴더 (snapshot_dir이 없으면 None)
+        """
+        if self.snapshot_dir is None:
+            return None
+
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tables = {
+                "users": self._users_snapshot(),
+                "tmdb_contents": self.contents,
+                "user_likes": self._likes_snapshot(),
+            }
+
+        for table_name, table in tables.items():
+            if table is None:
+                continue
+            target = self.snapshot_dir / f"{table_name}.parquet"
+            temp = target.with_name(f".{target.name}.tmp")
+            self.pq.write_table(table, temp, compression="snappy")
+            os.replace(temp, target)
+        return self.snapshot_dir
+
+
+    def _users_snapshot(self):
+        """스냅샷 users + 변경 컬럼 + 신규 유저 행"""
+        pa = self.pa
+        users = self.users
+        schema = users.schema
+
+        if self._user_changes:
+            row_index = {user_id: i for i, user_id in enumerate(users["user_id"].to_pylist())}
+            changed_columns = {column for change in self._user_changes.values() for column in change}
+            for column in changed_columns:
+                values = users[column].to_pylist()
+                for user_id, change in self._user_changes.items():
+                    i = row_index.get(user_id)
+                    if i is not None and column in change:
+                        values[i] = change[column]
+                position = schema.get_field_index(column)
+                users = users.set_column(position, schema.field(position), pa.array(values, type=schema.field(position).type))
+
+        if self._new_users:
+            new_rows = pa.Table.from_pylist(
+                [{name: row.get(name) for name in schema.names} for row in self._new_users], schema=schema
+            )
+            users = pa.concat_tables([users, new_rows])
+        return users
+
+
+    def _likes_snapshot(self):
+        """스냅샷 user_likes - 삭제 + 추가 (id는 기존 최대값 이후로 부여)"""
+        pa, pc = self.pa, self.pc
+        if not self._like_changes:
+            return self.likes
+
+        next_id = None
+        likes = self.likes
+        if likes is not None:
+            keys = zip(likes["user_id"].to_pylist(), likes["content_id"].to_pylist())
+            likes = likes.filter(pa.array([key not in self._like_changes for key in keys]))
+            if "id" in likes.schema.names:
+                next_id = (pc.max(self.likes["id"]).as_py() or 0) + 1
+        added = []
+        for (user_id, content_id), created_at in self._like_changes.items():
+            if created_at is None:
+                continue
+            row = {"user_id": user_id, "content_id": content_id, "created_at": created_at}
+            if next_id is not None:
+                row["id"] = next_id
+                next_id += 1
+            added.append(row)
+
+        if likes is None:
+            return pa.Table.from_pylist(added) if added else None
+        if added:
+            likes = pa.concat_tables([likes, pa.Table.from_pylist(added, schema=likes.schema)])
+        return likes
@@ -0,0 +1,147 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+
+class RandomPool:
+    """
+    핫패스용 난수 버퍼 서비스 (NumPy 블록 생성)
+
+    책임:
+    - 균등 난수/범주형 인덱스를 block_size 단위로 한 번에 생성해 두고 1개씩 꺼내 씀
+    - 범주형 분포(플랫폼, 시청 패턴 등)는 이름으로 등록 후 인덱스 버퍼로 관리
+    - 일별/대체 경로의 비복원 추출, 일회성 가중치 선택도 같은 생성기로 처리 (random 모듈 대체)
+    - random_seed가 있으면 NumPy 생성기와 random 모듈을 같은 seed로 고정 (재현 가능)
+
+    사용 예:
+        pool = RandomPool(config)
+        pool.register_choice("platform", [0.35, 0.30, 0.25, 0.10])
+        index = pool.choice("platform")  # 0~3
+        u = pool.random()                # [0, 1)
+    """
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: config.toml 전체 dict
+        """
+        global_config = config.get("global", {})
+
+        # 0 또는 미설정이면 매 실행마다 다른 난수
+        seed = global_config.get("random_seed", 0) or None
+        self.seed = seed
+        self.block_size = global_config.get("random_block_size", 65536)
+
+        self.rng = np.random.default_rng(seed)
+        if seed is not None:
+            random.seed(seed)
+
+        # 균등 난수 버퍼
+        self._uniforms: Iterator[float] = iter(())
+
+        # 범주형 분포: 이름 → 누적 확률 / 인덱스 버퍼
+        self._cumulative: Dict[str, np.ndarray] = {}
+        self._choices: Dict[str, Iterator[int]] = {}
+
+        print(f"✅ RandomPool 초기화 완료 (seed: {seed if seed is not None else '없음'}, block: {self.block_size:,})")
+
+
+    # ========== 균등 난수 ==========
+
+    def random(self) -> float:
+        """[0, 1) 균등 난수 1개"""
+        try:
+            return next(self._uniforms)
+        except StopIteration:
+            self._uniforms = iter(self.rng.random(self.block_size).tolist())
+            return next(self._uniforms)
+
+
+    def uniform(self, a: float, b: float) -> float:
+        """[a, b) 균등 난수 1개 (random.uniform 대체)"""
+        return a + (b - a) * self.random()
+
+
+    def randint(self, a: int, b: int) -> int:
+        """[a, b] 정수 1개 (random.randint 대체)"""
+        return a + int(self.random() * (b - a + 1))
+
+
+    def index(self, n: int) -> int:
+        """[0, n) 인덱스 1개"""
+        return int(self.random() * n)
+
+
+    def pick(self, seq: Sequence):
+        """시퀀스에서 균등하게 1개 선택 (random.choice 대체)"""
+        return seq[int(self.random() * len(seq))]
+
+
+    # ========== 범주형 분포 ==========
+
+    def register_choice(self, name: str, weights: Sequence[float]) -> None:
+        """
+        범주형 분포 등록 (같은 이름으로 다시 등록하면 교체)
+
+        Args:
+            name: 분포 이름 (예: "platform")
+            weights: 인덱스별 가중치 (합계가 1.0이 아니어도 비율대로 정규화)
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if len(weights) == 0 or total <= 0:
+            raise ValueError(f"RandomPool 분포 '{name}'는 합계가 0보다 큰 가중치가 필요합니다.")
+
+        cumulative = np.cumsum(weights / total)
+        cumulative[-1] = 1.0
+        self._cumulative[name] = cumulative
+        self._choices[name] = iter(())
+
+
+    def choice(self, name: str) -> int:
+        """등록된 범주형 분포에서 인덱스 1개"""
+        try:
+            return next(self._choices[name])
+        except StopIteration:
+            cumulative = self._cumulative[name]
+            indices = np.searchsorted(cumulative, self.rng.random(self.block_size), side="right")
+            buffer = iter(indices.tolist())
+            self._choices[name] = buffer
+            return next(buffer)
+
+
+    # ========== 비복원 추출 / 일회성 가중치 선택 ==========
+
+    def sample(self, seq: Sequence, k: int) -> list:
+        """
+        시퀀스에서 k개 비복원 추출 (random.sample 대체, k가 길이보다 크면 전체를 섞어서 반환)
+
+        range도 그대로 받으므로 큰 범위의 인덱스 추출에 리스트를 만들지 않음
+        """
+        n = len(seq)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        return [seq[i] for i in self.rng.choice(n, size=k, replace=False).tolist()]
+
+
+    def weighted_pick(self, seq: Sequence, weights: Sequence[float]):
+        """
+        가중치 기반 1개 선택 (random.choices(seq, weights)[0] 대체)
+
+        호출마다 가중치가 달라지는 대체 경로용 (반복 사용하는 분포는 register_choice 사용)
+        """
+        cumulative = list(accumulate(weights))
+        i = bisect_right(cumulative, self.random() * cumulative[-1])
+        return seq[min(i, len(seq) - 1)]
+
+
+    def weighted_picks(self, seq: Sequence, weights: Sequence[float], k: int) -> List:
+        """가중치 기반 k개 복원 추출 (random.choices(seq, weights, k=k) 대체)"""
+        cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+        indices = np.searchsorted(cumulative, self.rng.random(k) * cumulative[-1], side="right")
+        last = len(seq) - 1
+        return [seq[min(i, last)] for i in indices.tolist()]
@@ -0,0 +1,206 @@
+import math
+import random
+from array import array
+from typing import Optional, Sequence
+
+
+class AliasTable:
+    """
+    Walker alias table (Vose 알고리즘)
+
+    책임:
+    - 가중치 리스트를 한 번만 전처리하여 O(1) 가중치 랜덤 선택 제공
+    - random.choices처럼 매 호출마다 누적합을 다시 계산하지 않음
+
+    사용 예:
+        table = AliasTable([0.5, 0.3, 0.2])
+        index = table.sample()  # 0, 1, 2 중 하나 (가중치 비율대로)
+    """
+    __slots__ = ("size", "prob", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        """
+        Args:
+            weights: 음수가 아닌 가중치 리스트 (합계가 1일 필요 없음)
+        """
+        size = len(weights)
+        total = float(sum(weights))
+        if size == 0 or total <= 0:
+            raise ValueError("AliasTable은 합계가 0보다 큰 가중치가 필요합니다.")
+
+        self.size = size
+        self.prob = array('d', [0.0]) * size
+        self.alias = array('i', [0]) * size
+
+        # 평균이 1이 되도록 스케일링 후 small(<1) / large(>=1)로 분리
+        scaled = [w * size / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # 부동소수점 오차로 남은 항목은 확률 1로 고정
+        for i in large:
+            self.prob[i] = 1.0
+            self.alias[i] = i
+        for i in small:
+            self.prob[i] = 1.0
+            self.alias[i] = i
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    def sample(self, u: Optional[float] = None) -> int:
+        """
+        가중치 기반 인덱스 1개 선택 (O(1))
+
+        Args:
+            u: [0, 1) 균등 난수 (없으면 random.random() 사용)
+               하나의 난수로 칸 선택과 alias 판정을 모두 수행
+
+        Returns:
+            선택된 인덱스
+        """
+        if u is None:
+            u = random.random()
+        scaled = u * self.size
+        i = int(scaled)
+        if i >= self.size:  # u가 1.0에 매우 가까운 경우 보호
+            i = self.size - 1
+        if scaled - i < self.prob[i]:
+            return i
+        return self.alias[i]
+
+
+class FenwickSampler:
+    """
+    Fenwick 트리(Binary Indexed Tree) 기반 가중치 샘플러
+
+    책임:
+    - 가중치 1개 변경 O(log n) (AliasTable처럼 전체 재구성하지 않음)
+    - 가중치 기반 인덱스 선택 O(log n) (누적합 트리를 위에서부터 내려가며 탐색)
+    - 시간에 따라 가중치가 바뀌는 분포(콘텐츠 트렌드 등)에 사용
+    - 갱신 n회마다 가중치 배열에서 트리/합계를 다시 구성 (부동소수점 누적 오차 제거, 분할 상환 O(1))
+
+    사용 예:
+        sampler = FenwickSampler([0.5, 0.3, 0.2])
+        sampler.update(2, 1.0)   # 2번 가중치만 변경
+        index = sampler.sample()
+    """
+    __slots__ = ("size", "weights", "tree", "total", "_top", "_updates", "_rebuild_every")
+
+    def __init__(self, weights: Sequence[float]):
+        """
+        Args:
+            weights: 음수가 아닌 가중치 리스트 (합계가 1일 필요 없음)
+        """
+        size = len(weights)
+        if size == 0:
+            raise ValueError("FenwickSampler는 가중치가 1개 이상 필요합니다.")
+
+        self.size = size
+        self.weights = array('d', weights)
+        self._rebuild_every = max(64, size)
+        self._rebuild()
+
+        top = 1
+        while top * 2 <= size:
+            top *= 2
+        self._top = top
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    def _rebuild(self):
+        """가중치 배열에서 트리와 합계를 다시 구성 (O(n))"""
+        size = self.size
+        # 각 노드 값을 부모 노드에 한 번씩 더함 (tree는 1-based)
+        tree = array('d', [0.0]) * (size + 1)
+        for i, w in enumerate(self.weights, start=1):
+            tree[i] += w
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = math.fsum(self.weights)
+        self._updates = 0
+
+
+    def update(self, index: int, weight: float):
+        """index의 가중치를 weight로 변경 (O(log n), n회마다 재구성)"""
+        delta = weight - self.weights[index]
+        if delta == 0.0:
+            return
+        self.weights[index] = weight
+
+        self._updates += 1
+        if self._updates >= self._rebuild_every:
+            self._rebuild()
+            return
+
+        self.total += delta
+        tree = self.tree
+        size = self.size
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+
+    def sample(self, u: Optional[float] = None) -> int:
+        """
+        가중치 기반 인덱스 1개 선택 (O(log n))
+
+        Args:
+            u: [0, 1) 균등 난수 (없으면 random.random() 사용)
+
+        Returns:
+            선택된 인덱스 (가중치 0인 항목은 선택되지 않음, 가중치 합이 0이면 균등 선택)
+        """
+        if u is None:
+            u = random.random()
+        if self.total <= 0:
+            return min(int(u * self.size), self.size - 1)
+
+        # 누적합이 target을 처음 넘는 인덱스 탐색
+        target = u * self.total
+        tree = self.tree
+        size = self.size
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+
+        # 누적 오차로 target이 트리 합계를 넘었거나 가중치 0인 칸에 떨어진 경우 가장 가까운 양수 가중치로 보정
+        if pos >= size or self.weights[pos] <= 0.0:
+            return self._nearest_positive(min(pos, size - 1))
+        return pos
+
+
+    def _nearest_positive(self, index: int) -> int:
+        """index 이하에서 가장 가까운 양수 가중치 인덱스 (없으면 이후에서 탐색)"""
+        weights = self.weights
+        for i in range(index, -1, -1):
+            if weights[i] > 0.0:
+                return i
+        for i in range(index + 1, self.size):
+            if weights[i] > 0.0:
+                return i
+        return index
@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.content_catalog import ContentCatalog, ContentRecord
+
+
+class SearchIndex:
+    """
+    검색어 → 콘텐츠 역색인 (search-search → contents-click 전환용, 불변)
+
+    책임:
+    - 검색어 목록 구성: search_terms + search_keywords(콘텐츠별 검색어)에만 있는 검색어
+    - 검색어별 매칭 콘텐츠 slot 목록을 로드 시 1회 계산
+      - search_keywords: contents_id → 검색어 목록을 뒤집어 검색어 → 콘텐츠로 등록
+      - search_title_match: 제목에 검색어가 포함된 카탈로그 콘텐츠도 등록 (공백/대소문자 무시)
+    - 검색어별 매칭 콘텐츠를 카탈로그 slot 그룹으로 등록하여 현재 선택 가중치로 콘텐츠 선택
+      (ContentTrend가 갱신한 가중치 반영: 미공개 콘텐츠 제외, 스파이크 반영)
+
+    검색어는 정수 인덱스(terms의 위치)로 다룸 (UserTable.last_search에 저장)
+    """
+
+    def __init__(self, config: dict, catalog: Optional[ContentCatalog]):
+        """
+        Args:
+            config: config.toml 전체 dict
+            catalog: 콘텐츠 카탈로그 (없으면 검색어만 관리하고 매칭 콘텐츠 없음)
+        """
+        log_contents_config = config.get("log_contents", {})
+        search_terms = log_contents_config.get("search_terms", ["해리포터", "어벤져스"])
+        keywords: Dict[str, List[str]] = log_contents_config.get("search_keywords", {})
+        title_match = log_contents_config.get("search_title_match", True)
+
+        # 검색어 목록 (중복 제거, 순서 유지)
+        terms: List[str] = []
+        term_index: Dict[str, int] = {}
+        for term in list(search_terms) + [term for content_terms in keywords.values() for term in content_terms]:
+            if term not in term_index:
+                term_index[term] = len(terms)
+                terms.append(term)
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self.term_index = term_index
+
+        # 검색어별 매칭 slot (중복 없이, 등록 순서 유지)
+        term_slots: List[Dict[int, None]] = [{} for _ in self.terms]
+        if catalog:
+            for contents_id, content_terms in keywords.items():
+                slot = catalog.slot_by_id.get(contents_id)
+                if slot is None:
+                    continue
+                for term in content_terms:
+                    term_slots[term_index[term]][slot] = None
+
+            if title_match:
+                normalized_terms = [self._normalize(term) for term in self.terms]
+                for record in catalog:
+                    title = self._normalize(record.title or "")
+                    if not title:
+                        continue
+                    for i, term in enumerate(normalized_terms):
+                        if term and term in title:
+                            term_slots[i][record.slot] = None
+
+        # 검색어별 카탈로그 slot 그룹 번호 (매칭 콘텐츠가 없으면 None)
+        self.groups: List[Optional[int]] = [
+            catalog.add_group(slots) if slots else None
+            for slots in term_slots
+        ]
+        self.catalog = catalog
+
+        matched = sum(1 for group in self.groups if group is not None)
+        print(f"✅ SearchIndex 초기화 완료 (검색어 {len(self.terms)}개 중 {matched}개 콘텐츠 매칭)")
+
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+    def has_matches(self, term: int) -> bool:
+        """검색어에 매칭된 콘텐츠가 있는지"""
+        return self.groups[term] is not None
+
+
+    def sample(self, term: int, u: Optional[float] = None) -> Optional[ContentRecord]:
+        """검색어에 매칭된 콘텐츠 중 현재 선택 가중치로 1개 선택 (매칭 없으면 None)"""
+        group = self.groups[term]
+        if group is None:
+            return None
+        return self.catalog.sample_group(group, u)
+
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """공백 제거 + 소문자 (제목/검색어 부분 일치용)"""
+        return "".join(text.split()).lower()
@@ -1,13 +1,54 @@
-import random
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Sequence, NamedTuple
 
 # schemas에서 Enum 가져오기
 from schemas.enum import (
     UserState,
-    ActivityLevel,
     EventCategory,
     EventType
 )
+from src.sampling import AliasTable
+from src.random_pool import RandomPool
+from src.user_table import ACTIVITY_CODES
+
+
+class Transition(NamedTuple):
+    """컴파일된 상태 전이 (이벤트 → 코드, 다음 상태, additional_data)"""
+    event_type: Optional[str]
+    event_category_code: int
+    event_type_code: int
+    next_state: UserState
+    additional_data: Optional[dict]
+    needs_activity: bool  # True면 활성도 등급별 additional_data 사용 (contents-start)
+
+
+# 이벤트별 (다음 상태, additional_data, 활성도 필요 여부)
+# contents-start는 패턴에 따라 모든 재생 로그를 생성한 뒤 MAIN_PAGE로 전이
+# CONTENT_PAGE의 모든 이벤트는 행동 후 MAIN_PAGE로 돌아감
+EVENT_TRANSITIONS = {
+    "register-in": (UserState.MAIN_PAGE, None, False),
+    "access-in": (UserState.MAIN_PAGE, None, False),
+    "access-out": (UserState.USER_OUT, None, False),
+    "contents-click": (UserState.CONTENT_PAGE, {"need_content": True}, False),
+    "subscription-stop": (UserState.MAIN_PAGE, {"update_subscription": False}, False),
+    "register-out": (UserState.USER_OUT, {"delete_user": True}, False),
+    "search-search": (UserState.MAIN_PAGE, None, False),
+    "support-inquiry": (UserState.MAIN_PAGE, None, False),
+    "subscription-start": (UserState.MAIN_PAGE, {"update_subscription": True}, False),
+    "contents-start": (UserState.MAIN_PAGE, None, True),
+    "contents-like_on": (UserState.MAIN_PAGE, None, False),
+    "contents-like_off": (UserState.MAIN_PAGE, None, False),
+    "review-review": (UserState.MAIN_PAGE, None, False),
+}
+
+# 알 수 없는 이벤트의 상태별 대체 동작
+# (MAIN_PAGE: access-out으로 처리, CONTENT_PAGE: 로그 없이 MAIN_PAGE로)
+STATE_FALLBACK_EVENT = {
+    UserState.MAIN_PAGE: "access-out",
+    UserState.CONTENT_PAGE: None,
+}
+
+# 확률 합계 허용 오차
+TRANSITION_SUM_TOLERANCE = 1e-6
 
 
 class UserEventController:
@@ -17,24 +58,40 @@ class UserEventController:
     책임:
     - 유저의 현재 상태를 기반으로 발생 가능한 로그 타입 결정
     - 선택된 로그 타입에 따른 다음 상태 결정
-    - 상태 전이 확률 관리
+    - 상태 전이 확률 관리 (초기화 시 alias 테이블로 컴파일 + 합계 검증)
     
     주의:
     - User 객체는 UserSelector가 관리
     - 이 클래스는 User 인스턴스를 받아서 어떤 로그를 발생시킬지만 결정
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, random_pool: Optional[RandomPool] = None):
         """
         Args:
             config: config.toml의 전체 설정
+            random_pool: 전이 선택용 난수 버퍼 (없으면 새로 생성, 다른 모듈과 공유 권장)
         """
         self.config = config
+        self.random_pool = random_pool or RandomPool(config)
         
         # 상태별 전이 확률 (config에서 읽거나 기본값 사용)
         self.state_transitions = self._load_state_transitions()
-        
+
+        # (상태, 구독여부)별 alias 테이블 + 미리 만든 Transition으로 컴파일
+        self._compile_transitions()
+
+        # 고정 전이 (상태 전이 확률과 무관하게 발생)
+        self._register_in = self._make_transition("register-in")
+        self._access_in = self._make_transition("access-in")
+        self._user_out = Transition(None, 0, 0, UserState.USER_OUT, None, False)
+
+        # contents-start additional_data (활성도 등급 코드별로 미리 생성)
+        self._start_data_by_code = [
+            {"need_episode": True, "activity_level": level} for level in ACTIVITY_CODES
+        ]
+
         print(f"✅ UserEventController 초기화 완료")
+        self._print_validation_report()
 
     def _load_state_transitions(self) -> dict:
         """
@@ -76,124 +133,188 @@ class UserEventController:
             }
         })
 
+    def _compile_transitions(self):
+        """
+        상태별 전이 확률을 (상태, 구독여부)별 alias 테이블로 1회 컴파일
+
+        - 각 이벤트는 미리 만든 Transition(이벤트, 코드, 다음 상태, additional_data)으로 매핑
+        - 확률 합계가 1.0에서 벗어나거나 알 수 없는 이벤트가 있으면 validation_report에 기록
+          (합계가 1.0이 아니어도 alias 테이블 구성 시 비율대로 정규화됨)
+        """
+        self.transition_tables: dict[Tuple[UserState, bool], Tuple[AliasTable, Tuple[Transition, ...]]] = {}
+        self.validation_report: List[str] = []
+
+        for state_name, groups in self.state_transitions.items():
+            state = UserState[state_name]
+            fallback = STATE_FALLBACK_EVENT.get(state)
+
+            for group_name, subscribed in (("subscribed", True), ("not_subscribed", False)):
+                probs = groups.get(group_name)
+                if not probs:
+                    self.validation_report.append(f"{state_name}.{group_name}: 전이 확률이 정의되지 않음")
+                    continue
+
+                total = sum(probs.values())
+                if abs(total - 1.0) > TRANSITION_SUM_TOLERANCE:
+                    self.validation_report.append(
+                        f"{state_name}.{group_name}: 확률 합계 {total:.6f} ≠ 1.0 (비율대로 정규화됨)"
+                    )
+
+                transitions = []
+                weights = []
+                for event, weight in probs.items():
+                    if weight < 0:
+                        self.validation_report.append(f"{state_name}.{group_name}.{event}: 음수 확률 {weight} (무시됨)")
+                        continue
+                    if weight == 0:
+                        continue
+                    if event not in EVENT_TRANSITIONS:
+                        self.validation_report.append(
+                            f"{state_name}.{group_name}.{event}: 알 수 없는 이벤트 (기본 동작 {fallback}로 대체)"
+                        )
+                        event = fallback
+                    transitions.append(self._make_transition(event))
+                    weights.append(weight)
+
+                if not weights:
+                    self.validation_report.append(f"{state_name}.{group_name}: 유효한 이벤트가 없음")
+                    continue
+
+                self.transition_tables[(state, subscribed)] = (AliasTable(weights), tuple(transitions))
+
+
+    def _make_transition(self, event: Optional[str]) -> Transition:
+        """이벤트 이름 → Transition (이벤트 코드, 다음 상태, additional_data 포함)"""
+        if event is None:
+            return Transition(None, 0, 0, UserState.MAIN_PAGE, None, False)
+
+        next_state, additional_data, needs_activity = EVENT_TRANSITIONS[event]
+        return Transition(
+            event,
+            self.get_event_category_code(event),
+            self.get_event_type_code(event),
+            next_state,
+            additional_data,
+            needs_activity
+        )
+
+
+    def _print_validation_report(self):
+        """전이 확률 검증 결과 출력"""
+        if not self.validation_report:
+            print("   전이 확률 검증: 이상 없음")
+            return
+        print(f"⚠️  전이 확률 검증: {len(self.validation_report)}건")
+        for line in self.validation_report:
+            print(f"   - {line}")
+
+
+    def select_transition(
+        self,
+        user,
+        current_state: UserState
+    ) -> Tuple[Transition, Optional[dict]]:
+        """
+        유저 상태 기반 다음 전이 선택 (LogContents.generate에 Transition을 그대로 전달)
+
+        Args:
+            user: User 뷰 (UserTable row)
+            current_state: 현재 유저 상태
+
+        Returns:
+            (Transition, additional_data)
+        """
+        return self._select_transition(user.table, user.row, current_state, self.random_pool.random())
+
+
     def select_event(
         self,
         user,
         current_state: UserState
     ) -> Tuple[Optional[str], UserState, Optional[dict]]:
         """
-        유저 상태 기반 다음 이벤트 선택
+        유저 상태 기반 다음 이벤트 선택 (이벤트 이름 문자열 반환)
 
         Args:
-            user: User 객체
+            user: User 뷰 (UserTable row)
             current_state: 현재 유저 상태
 
         Returns:
             (event_type, next_state, additional_data)
         """
-        # NOT_LOGGED_IN 상태: 무조건 access-in 발생 후 MAIN_PAGE로 전이
-        if current_state == UserState.NOT_LOGGED_IN:
-            user.has_logged_in_today = True
-            return "access-in", UserState.MAIN_PAGE, None
+        transition, additional_data = self.select_transition(user, current_state)
+        return transition.event_type, transition.next_state, additional_data
 
-        if current_state == UserState.MAIN_PAGE:
-            return self._handle_main_page(user.is_subscribed)
 
-        elif current_state == UserState.CONTENT_PAGE:
-            return self._handle_content_page(user.is_subscribed, user.activity_level)
+    def select_events_bulk(
+        self,
+        users: Sequence,
+        current_states: Sequence[UserState]
+    ) -> List[Tuple[Optional[str], UserState, Optional[dict]]]:
+        """
+        여러 유저의 다음 이벤트를 한 번에 선택
 
-        elif current_state == UserState.USER_OUT:
-            return None, UserState.USER_OUT, None
+        난수를 한꺼번에 생성한 뒤 컴파일된 alias 테이블에서 바로 조회
 
-        else:
-            return None, UserState.USER_OUT, None
-        
-        
+        Args:
+            users: User 뷰 리스트
+            current_states: 각 유저의 현재 상태
 
-    def _handle_main_page(self, is_subscribed: bool) -> Tuple[str, UserState, Optional[dict]]:
-        """MAIN_PAGE 상태 처리"""
-        
-        if is_subscribed:
-            probs = self.state_transitions["MAIN_PAGE"]["subscribed"]
-        else:
-            probs = self.state_transitions["MAIN_PAGE"]["not_subscribed"]
-        
-        # 가중치 기반 랜덤 선택
-        event = random.choices(
-            list(probs.keys()),
-            weights=list(probs.values())
-        )[0]
-        
-        # 이벤트별 다음 상태 결정
-        if event == "access-out":
-            return "access-out", UserState.USER_OUT, None
-        
-        elif event == "contents-click":
-            return "contents-click", UserState.CONTENT_PAGE, {"need_content": True}
-        
-        elif event == "subscription-stop":
-            return "subscription-stop", UserState.MAIN_PAGE, {"update_subscription": False}
-        
-        elif event == "register-out":
-            return "register-out", UserState.USER_OUT, {"delete_user": True}
-        
-        elif event == "search-search":
-            return "search-search", UserState.MAIN_PAGE, None
-        
-        elif event == "support-inquiry":
-            return "support-inquiry", UserState.MAIN_PAGE, None
-        
-        elif event == "subscription-start":
-            return "subscription-start", UserState.MAIN_PAGE, {"update_subscription": True}
-        
-        else:
-            # 기본값
-            return "access-out", UserState.USER_OUT, None
+        Returns:
+            [(event_type, next_state, additional_data), ...] (users와 같은 순서)
+        """
+        uniforms = self.random_pool.rng.random(len(users)).tolist()
+        results = []
+        for user, current_state, u in zip(users, current_states, uniforms):
+            transition, additional_data = self._select_transition(user.table, user.row, current_state, u)
+            results.append((transition.event_type, transition.next_state, additional_data))
+        return results
 
-    def _handle_content_page(
+
+    def _select_transition(
         self,
-        is_subscribed: bool,
-        activity_level: Optional[ActivityLevel] = None
-    ) -> Tuple[Optional[str], UserState, Optional[dict]]:
+        table,
+        row: int,
+        current_state: UserState,
+        u: Optional[float] = None
+    ) -> Tuple[Transition, Optional[dict]]:
         """
-        CONTENT_PAGE 상태 처리
+        컴파일된 전이 테이블에서 Transition 1개 선택
 
-        contents-start 이벤트는 패턴에 따라 모든 로그를 한번에 생성하고
-        바로 MAIN_PAGE로 전이
+        Args:
+            table: UserTable (컬럼을 직접 읽고 씀)
+            row: 유저 row
+            current_state: 현재 유저 상태
+            u: [0, 1) 균등 난수 (없으면 random.random() 사용)
 
-        모든 이벤트 후 CONTENT_PAGE → MAIN_PAGE로 전이
-        (콘텐츠 상세 페이지에서 행동 후 메인으로 돌아가는 흐름)
+        Returns:
+            (Transition, additional_data)
         """
-        if is_subscribed:
-            probs = self.state_transitions["CONTENT_PAGE"]["subscribed"]
-        else:
-            probs = self.state_transitions["CONTENT_PAGE"]["not_subscribed"]
+        # NOT_REGISTERED 상태(신규 유저): 무조건 register-in 발생 후 MAIN_PAGE로 전이
+        if current_state == UserState.NOT_REGISTERED:
+            table.logged_in_today[row] = 1
+            return self._register_in, None
 
-        event = random.choices(
-            list(probs.keys()),
-            weights=list(probs.values())
-        )[0]
+        # NOT_LOGGED_IN 상태: 무조건 access-in 발생 후 MAIN_PAGE로 전이
+        if current_state == UserState.NOT_LOGGED_IN:
+            table.logged_in_today[row] = 1
+            return self._access_in, None
 
-        if event == "contents-start":
-            # activity_level을 additional_data에 포함 (로그 생성 시 시청시간 계산용)
-            # 패턴에 따라 모든 재생 로그 생성 후 MAIN_PAGE로 전이
-            return "contents-start", UserState.MAIN_PAGE, {
-                "need_episode": True,
-                "activity_level": activity_level
-            }
+        compiled = self.transition_tables.get((current_state, table.subscribed[row] == 1))
+        if compiled is None:
+            # USER_OUT 또는 전이 확률이 없는 상태
+            return self._user_out, None
 
-        elif event == "contents-like_on":
-            return "contents-like_on", UserState.MAIN_PAGE, None
+        sampler, transitions = compiled
+        transition = transitions[sampler.sample(u)]
 
-        elif event == "contents-like_off":
-            return "contents-like_off", UserState.MAIN_PAGE, None
+        # contents-start: activity_level을 additional_data에 포함 (로그 생성 시 시청시간 계산용)
+        # 활성도 등급별 dict를 미리 만들어 두고 재사용
+        if transition.needs_activity:
+            return transition, self._start_data_by_code[table.activity_levels[row]]
 
-        elif event == "review-review":
-            return "review-review", UserState.MAIN_PAGE, None
+        return transition, transition.additional_data
 
-        else:
-            # 알 수 없는 이벤트는 MAIN_PAGE로
-            return None, UserState.MAIN_PAGE, None
 
     def get_event_category_code(self, event_type: str) -> int:
         """
@@ -227,7 +348,7 @@ class UserEventController:
             event_type: "category-type" 형식 (예: "access-in")
             
         Returns:
-            타입 코드 (1~12)
+            타입 코드 (1~13)
         """
         type_name = event_type.split("-")[1]
         
@@ -244,6 +365,7 @@ class UserEventController:
             "review": EventType.REVIEW.value,
             "search": EventType.SEARCH.value,
             "inquiry": EventType.INQUIRY.value,
+            "playing": EventType.PLAYING.value,
         }
         
         return mapping.get(type_name, 1)
\ No newline at end of file
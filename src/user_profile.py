@@ -0,0 +1,168 @@
+import math
+from typing import Optional
+
+from schemas.enum import Platform
+from src.content_catalog import ContentCatalog, ContentRecord
+from src.random_pool import RandomPool
+from src.user_table import UserTable, PROFILE_GENRES, RECENT_CONTENTS, NO_INDEX
+
+
+class UserProfiles:
+    """
+    유저별 선호 프로필 (플랫폼 / 선호 장르 / 최근 시청 콘텐츠)
+
+    책임:
+    - 유저 row별 프로필을 최초 사용 시 1회 구성하여 UserTable 컬럼에 저장 (모집단과 함께 유지)
+      - 주 사용 플랫폼: platform_ratio 비율로 선택
+      - 선호 장르: 카탈로그 장르 인기도 비율로 PROFILE_GENRES개 선택, 유저별 선호 비중 부여
+    - 세션 플랫폼 고정 (세션 시작 시 주 플랫폼 또는 낮은 확률로 다른 플랫폼)
+    - 콘텐츠 선택: 이어보기(최근 시청 LRU) → 선호 장르 → 전체 카탈로그 순으로 결정
+    - 시청한 콘텐츠를 최근 시청 LRU에 기록
+    """
+
+    def __init__(self, config: dict, catalog: Optional[ContentCatalog], random_pool: RandomPool):
+        """
+        Args:
+            config: config.toml 전체 dict
+            catalog: 콘텐츠 카탈로그 (없으면 콘텐츠 선택 시 None 반환)
+            random_pool: 난수 버퍼
+        """
+        self.catalog = catalog
+        self.random_pool = random_pool
+
+        # 플랫폼별 비율 (LogContents 설정 사용)
+        platform_ratio = config.get("log_contents", {}).get("platform_ratio", {
+            "android": 0.35,
+            "ios": 0.30,
+            "pc": 0.25,
+            "tv": 0.10
+        })
+        self.platform_codes = [Platform.ANDROID.value, Platform.IOS.value, Platform.PC.value, Platform.TV.value]
+        self.random_pool.register_choice("platform", [
+            platform_ratio.get("android", 0.35),
+            platform_ratio.get("ios", 0.30),
+            platform_ratio.get("pc", 0.25),
+            platform_ratio.get("tv", 0.10)
+        ])
+
+        # 프로필 설정
+        profile_config = config.get("user_profile", {})
+        self.platform_switch_ratio = profile_config.get("platform_switch_ratio", 0.10)
+        self.continue_watching_ratio = profile_config.get("continue_watching_ratio", 0.30)
+        self.genre_affinity_ratio = profile_config.get("genre_affinity_ratio", 0.70)
+
+        # 선호 장르 선택용 분포 (장르별 콘텐츠 인기도 합)
+        self.has_genres = bool(catalog and catalog.genres)
+        if self.has_genres:
+            self.random_pool.register_choice("profile_genre", catalog.genre_weights)
+
+
+    # ========== 프로필 구성 ==========
+
+    def ensure(self, table: UserTable, row: int):
+        """프로필이 없으면 1회 구성"""
+        if table.has_profile[row]:
+            return
+
+        pool = self.random_pool
+        table.primary_platform[row] = self.platform_codes[pool.choice("platform")]
+
+        # 선호 장르: 장르 인기도 비율로 중복 없이 선택, 선호 비중은 Dirichlet(1) (지수분포 정규화)
+        if self.has_genres:
+            base = row * PROFILE_GENRES
+            codes = []
+            for _ in range(PROFILE_GENRES * 2):
+                code = pool.choice("profile_genre")
+                if code not in codes:
+                    codes.append(code)
+                    if len(codes) == PROFILE_GENRES:
+                        break
+            weights = [-math.log(1.0 - pool.random()) for _ in codes]
+            total = sum(weights)
+            cumulative = 0.0
+            for i, (code, weight) in enumerate(zip(codes, weights)):
+                cumulative += weight / total
+                table.genre_codes[base + i] = code
+                table.genre_cum[base + i] = cumulative
+            table.genre_cum[base + len(codes) - 1] = 1.0
+
+        table.has_profile[row] = 1
+
+
+    # ========== 플랫폼 ==========
+
+    def start_session(self, user):
+        """세션 시작 (access-in / register-in): 세션 플랫폼 결정"""
+        table, row = user.table, user.row
+        self.ensure(table, row)
+        if self.random_pool.random() < self.platform_switch_ratio:
+            table.platform[row] = self.platform_codes[self.random_pool.choice("platform")]
+        else:
+            table.platform[row] = table.primary_platform[row]
+
+
+    def platform(self, user) -> int:
+        """현재 세션 플랫폼 코드 (세션이 시작되지 않았으면 시작)"""
+        code = user.table.platform[user.row]
+        if code == -1:
+            self.start_session(user)
+            code = user.table.platform[user.row]
+        return code
+
+
+    # ========== 콘텐츠 ==========
+
+    def pick_content(self, user) -> Optional[ContentRecord]:
+        """
+        유저 프로필 기반 콘텐츠 선택
+
+        1. continue_watching_ratio 확률로 최근 시청 콘텐츠 중 1개 (이어보기)
+        2. genre_affinity_ratio 확률로 선호 장르 안에서 인기도 가중치 선택
+        3. 그 외에는 전체 카탈로그에서 인기도 가중치 선택
+        """
+        catalog = self.catalog
+        if not catalog:
+            return None
+
+        table, row = user.table, user.row
+        self.ensure(table, row)
+        pool = self.random_pool
+
+        if pool.random() < self.continue_watching_ratio:
+            base = row * RECENT_CONTENTS
+            recent = table.recent_slots
+            count = 0
+            while count < RECENT_CONTENTS and recent[base + count] != NO_INDEX:
+                count += 1
+            if count:
+                return catalog.records[recent[base + pool.index(count)]]
+
+        if self.has_genres and pool.random() < self.genre_affinity_ratio:
+            base = row * PROFILE_GENRES
+            u = pool.random()
+            cum = table.genre_cum
+            for i in range(PROFILE_GENRES):
+                if u < cum[base + i]:
+                    code = table.genre_codes[base + i]
+                    if code != NO_INDEX:
+                        return catalog.sample_genre(code, pool.random())
+                    break
+
+        return catalog.sample(pool.random())
+
+
+    def remember(self, user, content: ContentRecord):
+        """시청한 콘텐츠를 최근 시청 LRU 맨 앞으로 이동"""
+        base = user.row * RECENT_CONTENTS
+        recent = user.table.recent_slots
+        slot = content.slot
+
+        # 이미 있으면 그 위치부터, 없으면 마지막 칸부터 한 칸씩 밀기
+        end = RECENT_CONTENTS - 1
+        for i in range(RECENT_CONTENTS):
+            if recent[base + i] == slot:
+                end = i
+                break
+        for i in range(end, 0, -1):
+            recent[base + i] = recent[base + i - 1]
+        recent[base] = slot
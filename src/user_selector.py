@@ -1,44 +1,27 @@
-import random
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Tuple, Optional, List
-from schemas.enum import UserState, ActivityLevel
-from src.db_client import DBClient
-
 
-class User:
-    """
-    유저 객체
-
-    책임:
-    - 유저 정보 저장
-    - 현재 상태 관리
-    - 활성도 등급 관리
-    """
-    def __init__(
-        self,
-        user_id: int,
-        is_subscribed: bool,
-        current_state: UserState = UserState.MAIN_PAGE,
-        current_content_id: Optional[str] = None,
-        current_episode_id: Optional[str] = None,
-        activity_level: Optional[ActivityLevel] = None
-    ):
-        self.user_id = user_id
-        self.is_subscribed = is_subscribed
-        self.current_state = current_state
+import pytz
 
-        # 현재 시청 중인 콘텐츠 정보
-        self.current_content_id = current_content_id
-        self.current_episode_id = current_episode_id
+from schemas.enum import UserState, ActivityLevel
+from src.date_generator import load_region_specs, region_codes
+from src.db_client import DBClient
+from src.user_table import UserTable, User, STATE_CODES, STATE_TO_CODE, ACTIVITY_CODES
+from src.sampling import AliasTable
+from src.random_pool import RandomPool
 
-        # 활성도 등급 (추가)
-        self.activity_level = activity_level
 
-        # 오늘 처음 로그인 여부 (일별 로드 시 False로 초기화됨)
-        self.has_logged_in_today = False
+class _QuotaPool:
+    """지역 1개의 남은 할당량 기반 alias 샘플러 상태"""
+    __slots__ = ("sampler", "rows", "build_weights", "total_at_build", "remaining_total", "rows_since_rebuild")
 
-        # 패턴 재생 중 차단 시간 (contents-start 패턴 재생 중에는 다른 이벤트 발생 방지)
-        self.blocked_until: Optional[datetime] = None
+    def __init__(self):
+        self.sampler: Optional[AliasTable] = None
+        self.rows: List[int] = []            # sampler 인덱스 → row
+        self.build_weights: List[int] = []   # sampler 구성 시점의 할당량
+        self.total_at_build = 0
+        self.remaining_total = 0
+        self.rows_since_rebuild = 0
 
 
 class UserSelector:
@@ -46,28 +29,70 @@ class UserSelector:
     유저 선택 및 상태 관리
 
     책임:
-    - config.toml의 DAU 기반으로 일별 유저 선정
+    - 실행 전체에 걸친 유저 모집단 유지 (최초 1회 DB 로드)
+    - config.toml의 DAU 기반으로 재방문 모델에 따라 일별 유저 선정
     - 유저 선정 시 신규/기존 결정 및 상태값 부여
+    - 활성도 등급별 일일 이벤트 할당량 부여 및 남은 할당량 기반 유저 선택
+    - 타임스탬프 지역(국가)과 같은 지역의 유저 선택 (지역별 할당량 샘플러, 없으면 전체에서 선택)
     - UserEventController로부터 받은 상태값으로 유저 상태 업데이트
+
+    일 경계는 global.timezone 기준 현지 날짜 (타임스탬프는 UTC)
     """
 
-    def __init__(self, config: dict, db_client: 'DBClient'):
+    def __init__(self, config: dict, db_client: 'DBClient', random_pool: Optional[RandomPool] = None):
         """
         Args:
             config: config.toml 전체 dict
             db_client: DB 작업용 클라이언트
+            random_pool: 이벤트별 난수 버퍼 (없으면 새로 생성, 다른 모듈과 공유 권장)
         """
         self.config = config
         self.db_client = db_client
+        self.random_pool = random_pool or RandomPool(config)
 
         # DAU (Daily Active Users)
         self.dau = config["date_generator"]["dau"]
 
-        # 당일 활성 유저 풀 (매일 초기화)
-        # key: user_id, value: User 객체
-        self.daily_users: dict[int, User] = {}
+        # 실행 전체에 걸쳐 유지되는 유저 모집단 (활성도/구독 상태/최근 콘텐츠 유지)
+        # 유저별 객체 대신 배열 기반 UserTable에 저장하고,
+        # 당일 활성 유저(DAU)는 선택 가능 집합(table.active_rows)으로 관리
+        self.users = UserTable()
         self.current_date: Optional[date] = None
 
+        # 모집단 크기 (0이면 DAU × 5)
+        user_config = config.get("user", {})
+        self.population_size = user_config.get("population_size", 0) or self.dau * 5
+        self._population_loaded = False
+
+        # 모집단 층화 추출 기준 ("", "country", "subscribed") → (segment_by, 세그먼트별 비율)
+        self.population_segment_by, self.population_shares = self._load_population_strata(config, user_config)
+
+        # 전날 활성 유저의 재방문 확률 (활성도 등급 코드별)
+        self.retention_by_code = self._load_retention_config()
+
+        # 당일 활성 유저 row 목록 (다음 날 재방문 판정에 사용)
+        self._today_rows: List[int] = []
+
+        # 차단되지 않은 유저를 찾기 위한 랜덤 샘플링 시도 횟수 (초과 시 지역 내 스캔)
+        self.max_sample_attempts = 8
+
+        # 활성도 등급별 일일 이벤트 할당량 설정
+        self.logs_per_user_per_day = config["date_generator"]["logs_per_user_per_day"]
+        self.quota_weights, self.quota_noise = self._load_quota_config()
+
+        # 지역 (users.country ↔ LogDateGenerator 지역 인덱스, 목록에 없는 국가는 0번 지역)
+        self.region_codes = region_codes(config)
+        self.region_index = {code: index for index, code in enumerate(self.region_codes)}
+
+        # 일 경계 (global.timezone 현지 날짜, [시작, 끝) epoch ms 캐시)
+        self.tz = pytz.timezone(config["global"]["timezone"])
+        self._day_start_ms = 0
+        self._day_end_ms = 0
+
+        # 지역별 남은 할당량 기반 alias 샘플러 (할당량이 소진되면서 점진적으로 재구성)
+        self._quota_pools = [_QuotaPool() for _ in self.region_codes]
+        self.quota_rebuild_ratio = 0.5  # 남은 할당량이 구성 시점의 50% 미만이면 재구성
+
         # 신규 유저 생성 비율 (config에서 읽거나 기본값: 5%)
         self.new_user_ratio = config.get("user", {}).get("new_user_ratio", 0.03)
 
@@ -76,62 +101,192 @@ class UserSelector:
         print(f"   신규 유저 비율: {self.new_user_ratio * 100:.1f}%")
 
 
-    def select_user(self, timestamp: datetime) -> Tuple[User, UserState]:
+    def select_user(self, timestamp: int, region: int = 0) -> Tuple[User, UserState]:
         """
         유저 선택 (DAU 기반) + 현재 상태 반환
 
         Args:
-            timestamp: 현재 타임스탬프
+            timestamp: 현재 타임스탬프 (UTC epoch ms)
+            region: 타임스탬프 지역 인덱스 (LogDateGenerator.regions)
 
         Returns:
             (User 객체, 현재 상태)
 
         로직:
-        1. 날짜가 바뀌면 daily_users 풀 재설정 (DB에서 DAU만큼 랜덤 선택)
-        2. daily_users 풀에서 랜덤 선택
+        1. 날짜가 바뀌면 당일 활성 유저 재선정 (모집단에서 재방문 모델로 DAU만큼 선택)
+        2. 당일 활성 유저 중 같은 지역 유저에서 선택 (없으면 전체 지역에서 선택)
         3. 신규 유저 생성 확률 적용:
-           - 신규 유저: DB에 생성 + MAIN_PAGE 상태로 시작
-           - 기존 유저: daily_users에서 선택 + 현재 상태 반환
+           - 신규 유저: DB에 생성 (지역 국가 코드) + NOT_REGISTERED 상태로 시작 (register-in 발생)
+           - 기존 유저: 당일 활성 유저에서 선택 + 현재 상태 반환
         """
-        target_date = timestamp.date()  # 오늘날짜 = target_date로 선언(2025-12-15)
-
+        now_ms = timestamp
 
-        # 초기 오늘 날짜와 다르므로 daily_users 첫 생성 + 날짜가 바뀌면 daily_users 재설정
-        if self.current_date != target_date:
-            self._load_daily_users(target_date)
-            self.current_date = target_date
+        # 초기 오늘 날짜와 다르므로 모집단 로드 + 날짜가 바뀌면 당일 활성 유저 재선정
+        if not self._day_start_ms <= now_ms < self._day_end_ms:
+            target_date = self._set_day(timestamp)
+            if self.current_date != target_date:
+                self._start_day(target_date)
+                self.current_date = target_date
+        target_date = self.current_date
 
         # 신규 유저 생성 여부 결정
-        if random.random() < self.new_user_ratio:
+        if self.random_pool.random() < self.new_user_ratio:
             # 신규 유저 생성
-            user = self._create_new_user(signup_date=target_date)
-            return user, UserState.MAIN_PAGE
+            user = self._create_new_user(signup_date=target_date, region=region)
+            return user, UserState.NOT_REGISTERED
 
-        else:  # daily_users 풀에서 랜덤 선택
+        else:  # 당일 활성 유저 중에서 랜덤 선택
 
 
-            #DB에 user가 비어있는 경우, self.daily_users가 비어져있을 경우
-            if not self.daily_users:
-                # daily_users가 비어있으면 신규 생성
-                user = self._create_new_user(signup_date=target_date)
-                return user, UserState.MAIN_PAGE
+            #DB에 user가 비어있는 경우, self.users가 비어져있을 경우
+            if not self.users.active_rows:
+                # 당일 활성 유저가 비어있으면 신규 생성
+                user = self._create_new_user(signup_date=target_date, region=region)
+                return user, UserState.NOT_REGISTERED
 
             # blocked_until이 설정되지 않았거나 이미 지난 유저만 선택 가능
-            available_users = {
-                uid: u for uid, u in self.daily_users.items()
-                if u.blocked_until is None or u.blocked_until <= timestamp
-            }
+            # 같은 지역에서 남은 할당량이 있으면 할당량 비례로, 모두 소진됐으면 균등하게 선택
+            # (같은 지역에 선택 가능한 유저가 없으면 전체 지역에서 균등하게 선택)
+            row = self._pick_quota_row(now_ms, region)
+            if row == -1:
+                row = self._pick_available_row(now_ms, region)
+            if row == -1 and len(self.region_codes) > 1:
+                row = self._pick_available_row(now_ms, -1)
 
             # 선택 가능한 유저가 없으면 신규 생성
-            if not available_users:
-                user = self._create_new_user(signup_date=target_date)
-                return user, UserState.MAIN_PAGE
+            if row == -1:
+                user = self._create_new_user(signup_date=target_date, region=region)
+                return user, UserState.NOT_REGISTERED
+
+            self._consume_quota(row)
+            return self.users.view(row), STATE_CODES[self.users.states[row]]
+            # user 뷰, 현재 상태값
+
+
+    def _set_day(self, timestamp: int) -> date:
+        """타임스탬프(epoch ms)의 현지 날짜(global.timezone)와 그 날의 [시작, 끝) epoch ms 캐시"""
+        local_date = datetime.fromtimestamp(timestamp // 1000, self.tz).date()
+        day_start = self.tz.localize(datetime(local_date.year, local_date.month, local_date.day))
+        day_end = self.tz.localize(datetime.combine(local_date + timedelta(days=1), datetime.min.time()))
+        self._day_start_ms = int(day_start.timestamp() * 1000)
+        self._day_end_ms = int(day_end.timestamp() * 1000)
+        return local_date
 
-            # 여기서 available_users 풀에서 랜덤 선택
-            user_id = random.choice(list(available_users.keys()))
-            user = available_users[user_id]
-            return user, user.current_state
-            # user객체, 인스턴스 상태값
+
+    def _pick_quota_row(self, now_ms: int, region: int) -> int:
+        """
+        같은 지역 유저 중 남은 이벤트 할당량에 비례하는 확률로 유저 row 선택
+
+        alias 테이블은 구성 시점의 할당량으로 한 번만 만들고,
+        뽑힌 row를 (남은 할당량 / 구성 시점 할당량) 확률로 채택하여
+        매 이벤트 O(1)로 "현재 남은 할당량 비례" 선택을 구현
+        남은 할당량이 크게 줄거나 신규 유저가 많이 늘면 alias 테이블을 재구성
+        시도 횟수 안에 채택하지 못하면 스캔하지 않고 -1 (호출 측에서 균등 선택)
+
+        Args:
+            now_ms: 현재 타임스탬프 (epoch ms)
+            region: 지역 인덱스
+
+        Returns:
+            row 인덱스 (남은 할당량이 없거나 선택 실패 시 -1)
+        """
+        pool = self._quota_pools[region]
+        if pool.remaining_total <= 0:
+            return -1
+
+        if self._needs_quota_rebuild(pool):
+            self._rebuild_quota_sampler(region)
+            if pool.sampler is None:
+                return -1
+
+        table = self.users
+        sampler = pool.sampler
+        rows = pool.rows
+        build_weights = pool.build_weights
+        event_quota = table.event_quota
+        blocked_until = table.blocked_until
+        active_pos = table.active_pos
+        uniform = self.random_pool.random
+
+        for _ in range(self.max_sample_attempts):
+            i = sampler.sample(uniform())
+            row = rows[i]
+            if (
+                active_pos[row] != -1
+                and blocked_until[row] <= now_ms
+                and uniform() * build_weights[i] < event_quota[row]
+            ):
+                return row
+
+        # 시도 횟수 초과 (남은 할당량이 있는 유저가 대부분 차단됨): 스캔 없이 균등 선택 경로로 넘김
+        return -1
+
+
+    def _needs_quota_rebuild(self, pool: _QuotaPool) -> bool:
+        """alias 샘플러 재구성 필요 여부"""
+        if pool.sampler is None:
+            return True
+        if pool.remaining_total < pool.total_at_build * self.quota_rebuild_ratio:
+            return True
+        return pool.rows_since_rebuild > max(16, len(pool.rows) // 10)
+
+
+    def _rebuild_quota_sampler(self, region: int):
+        """지역의 선택 가능 유저 중 할당량이 남은 유저로 alias 샘플러 재구성"""
+        table = self.users
+        event_quota = table.event_quota
+        pool = self._quota_pools[region]
+
+        rows = [row for row in table.active_rows_in(region) if event_quota[row] > 0]
+        weights = [event_quota[row] for row in rows]
+
+        pool.rows = rows
+        pool.build_weights = weights
+        pool.total_at_build = sum(weights)
+        pool.remaining_total = pool.total_at_build
+        pool.sampler = AliasTable(weights) if rows else None
+        pool.rows_since_rebuild = 0
+
+
+    def _consume_quota(self, row: int):
+        """선택된 유저의 남은 할당량 1 차감"""
+        event_quota = self.users.event_quota
+        if event_quota[row] > 0:
+            event_quota[row] -= 1
+            self._quota_pools[self.users.region[row]].remaining_total -= 1
+
+
+    def _pick_available_row(self, now_ms: int, region: int) -> int:
+        """
+        차단되지 않은 유저 row를 균등 확률로 선택
+
+        매 이벤트마다 전체 풀을 필터링하지 않고 지역의 선택 가능 집합에서 랜덤 row를 뽑아 차단 여부만 확인
+        (rejection sampling → 선택 가능 유저 중 균등 선택과 동일한 분포)
+        시도 횟수를 넘기면 (지역 유저 대부분이 차단됨) 지역 집합을 스캔하여 선택
+
+        Args:
+            now_ms: 현재 타임스탬프 (epoch ms)
+            region: 지역 인덱스 (-1이면 모든 지역)
+
+        Returns:
+            row 인덱스 (선택 가능한 유저가 없으면 -1)
+        """
+        rows = self.users.active_rows_in(region)
+        if not rows:
+            return -1
+        blocked_until = self.users.blocked_until
+        uniform = self.random_pool.random
+        size = len(rows)
+
+        for _ in range(self.max_sample_attempts):
+            row = rows[int(uniform() * size)]
+            if blocked_until[row] <= now_ms:
+                return row
+
+        available_rows = [row for row in rows if blocked_until[row] <= now_ms]
+        if not available_rows:
+            return -1
+        return self.random_pool.pick(available_rows)
 
 
     def update_user_state(self, user: User, next_state: UserState):
@@ -142,74 +297,177 @@ class UserSelector:
             user: User 객체
             next_state: 다음 상태
         """
-        user.current_state = next_state
+        table = self.users
+        row = user.row
+        table.states[row] = STATE_TO_CODE[next_state]
 
-        # USER_OUT 상태면 daily_users 풀에서 제거
+        # USER_OUT 상태면 당일 활성 유저에서 제거 (남은 할당량도 소멸)
         if next_state == UserState.USER_OUT:
-            if user.user_id in self.daily_users:
-                del self.daily_users[user.user_id]
+            table.deactivate(row)
+            self._quota_pools[table.region[row]].remaining_total -= table.event_quota[row]
+            table.event_quota[row] = 0
         else:
-            # 그 외 상태면 daily_users 풀에 추가/업데이트
-            self.daily_users[user.user_id] = user
+            # 그 외 상태면 당일 활성 유저에 추가/유지
+            table.activate(row)
 
 
-    def _load_daily_users(self, target_date: date):
+    def _load_population(self):
         """
-        일별 활성 유저 로드 (DB에서 DAU만큼 랜덤 선택)
+        유저 모집단 로드 (실행 시작 시 1회만 DB 조회)
 
-        Args:
-            target_date: 대상 날짜
-
-        로직:
-        1. daily_users 풀 초기화
-        2. DB에서 DAU만큼 유저 랜덤 조회
-        3. User 객체 생성 후 daily_users에 추가
+        활성도 등급은 이때 한 번만 부여되어 실행 내내 유지됨
+        이후 DB는 구독/탈퇴/신규 생성 같은 변경 작업에만 사용
         """
-        print(f"\n📅 {target_date} 일별 유저 로드 중...")
+        print(f"\n👥 유저 모집단 로드 중... (목표: {self.population_size:,}명)")
 
-        # 풀 초기화
-        self.daily_users.clear()
-
-        # DB에서 DAU만큼 랜덤 유저 가져오기
-        users_data = self.db_client.get_random_users(limit=self.dau)
+        users_data = self.db_client.get_random_users(
+            limit=self.population_size,
+            segment_by=self.population_segment_by,
+            shares=self.population_shares
+        )
         # [ {'user_id': 10231, 'is_subscribed': 1}, 
         #   {'user_id': 48752, 'is_subscribed': 0}, 
         #   {'user_id': 33109, 'is_subscribed': 1}...  ]
 
+        self._population_loaded = True
+
         if not users_data:
             print(f"⚠️  DB에 유저가 없습니다. 신규 유저를 생성합니다.")
             return
 
-        # User 객체 생성 및 daily_users에 추가
-        # 일별 로드 시 모든 유저는 NOT_LOGGED_IN 상태로 시작
-        for user_data in users_data:
-            user = User(
+        activity_levels = self._assign_activity_levels(len(users_data))
+        region_index = self.region_index
+        for user_data, activity_level in zip(users_data, activity_levels):
+            self.users.add(
                 user_id=user_data["user_id"],
-                is_subscribed=user_data["is_subscribed"],
-                current_state=UserState.NOT_LOGGED_IN,  # 로그인 전 상태로 시작
-                activity_level=self._assign_activity_level()
+                is_subscribed=bool(user_data["is_subscribed"]),
+                current_state=UserState.NOT_LOGGED_IN,
+                activity_level=activity_level,
+                region=region_index.get(user_data.get("country"), 0)
             )
-            user.has_logged_in_today = False  # 오늘 아직 로그인 안함
-            self.daily_users[user.user_id] = user
 
-        print(f"✅ {len(self.daily_users)}명의 유저 로드 완료")
+        print(f"✅ 모집단 {len(self.users):,}명 로드 완료")
+
+
+    def _load_population_strata(self, config: dict, user_config: dict) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        모집단 층화 추출 설정
 
+        Returns:
+            (segment_by, 세그먼트 값 → 비율) (층화하지 않으면 (None, None))
+        """
+        strata = user_config.get("population_strata", "")
+        if strata == "country":
+            shares = {code: spec["share"] for code, spec in load_region_specs(config).items()}
+            return ("country", shares) if shares else (None, None)
+        if strata == "subscribed":
+            ratio = user_config.get("population_subscribed_ratio", 0.6)
+            return "subscribed", {True: ratio, False: 1 - ratio}
+        if strata:
+            raise ValueError(f"알 수 없는 population_strata: {strata!r} (가능: \"\", \"country\", \"subscribed\")")
+        return None, None
+
+
+    def _start_day(self, target_date: date):
+        """
+        당일 활성 유저(DAU) 선정
 
+        Args:
+            target_date: 대상 날짜
 
-    def _create_new_user(self, signup_date: Optional[date] = None) -> User:
-        """신규 유저 생성 (DB에 INSERT)"""
-        user_id = self.db_client.create_new_user(signup_date=signup_date)
+        로직:
+        1. 전날 활성 유저는 활성도 등급별 재방문 확률로 유지
+        2. 나머지는 모집단에서 (전날 미활성 유저 중) 랜덤으로 채움
+        3. 선정된 유저는 NOT_LOGGED_IN 상태로 시작, 할당량 부여 후 선택 가능 집합에 등록
+        """
+        print(f"\n📅 {target_date} 일별 유저 선정 중...")
+
+        if not self._population_loaded:
+            self._load_population()
+
+        table = self.users
+        deleted = table.deleted
+        retention_by_code = self.retention_by_code
+
+        # 전날 활성 유저 전부 비활성화 + 할당량 샘플러 초기화
+        for row in list(table.active_rows):
+            table.deactivate(row)
+        self._quota_pools = [_QuotaPool() for _ in self.region_codes]
+
+        # 1. 재방문 유저
+        chosen: List[int] = []
+        chosen_set = set()
+        for row in self._today_rows:
+            if row in chosen_set or deleted[row]:
+                continue
+            if self.random_pool.random() < retention_by_code[table.activity_levels[row]]:
+                chosen.append(row)
+                chosen_set.add(row)
+        del chosen[self.dau:]
+        retained_count = len(chosen)
+
+        # 2. 모집단에서 나머지 채우기 (전날 활성 유저 제외)
+        previous_set = set(self._today_rows)
+        candidates = [
+            row for row in range(len(table))
+            if not deleted[row] and row not in previous_set
+        ]
+        need = self.dau - len(chosen)
+        if need > 0:
+            chosen.extend(self.random_pool.sample(candidates, need))
+
+        # 3. 당일 상태 초기화 및 등록
+        for row in chosen:
+            table.states[row] = STATE_TO_CODE[UserState.NOT_LOGGED_IN]  # 로그인 전 상태로 시작
+            table.logged_in_today[row] = 0
+            table.activate(row)
+        self._today_rows = chosen
+
+        # 활성도 등급별 일일 이벤트 할당량 일괄 부여 후 샘플러 구성
+        self._assign_event_quotas(chosen)
+        for region in range(len(self.region_codes)):
+            self._rebuild_quota_sampler(region)
+
+        print(f"✅ {len(chosen):,}명 선정 완료 (재방문 {retained_count:,}명)")
+
+
+    def _load_retention_config(self) -> List[float]:
+        """
+        활성도 등급별 재방문 확률 로딩
 
-        user = User(
+        Returns:
+            활성도 등급 코드(ACTIVITY_CODES 인덱스)별 재방문 확률 리스트
+        """
+        retention_config = self.config.get("user_retention", {})
+        retention = {
+            ActivityLevel.HIGH: retention_config.get("high", 0.85),
+            ActivityLevel.MEDIUM: retention_config.get("medium", 0.60),
+            ActivityLevel.LOW: retention_config.get("low", 0.30),
+        }
+        return [retention.get(level or ActivityLevel.MEDIUM) for level in ACTIVITY_CODES]
+
+
+    def _create_new_user(self, signup_date: Optional[date] = None, region: int = 0) -> User:
+        """신규 유저 생성 (ID 블록에서 할당, DB INSERT는 배치 flush, 국가는 타임스탬프 지역)"""
+        user_id = self.db_client.create_new_user(
+            signup_date=signup_date, country=self.region_codes[region]
+        )
+
+        row = self.users.add(
             user_id=user_id,
             is_subscribed=False,
-            current_state=UserState.NOT_LOGGED_IN,  # 로그인 전 상태로 시작
-            activity_level=self._assign_activity_level()
+            current_state=UserState.NOT_REGISTERED,  # 가입 전 상태로 시작 (register-in)
+            activity_level=self._assign_activity_level(),
+            region=region
         )
-        user.has_logged_in_today = False  # 신규 유저도 아직 로그인 안함
-
-        self.daily_users[user_id] = user
-        return user
+        # 신규 유저는 register-in 후 바로 MAIN_PAGE (logged_in_today 기본값 0)
+        self.users.activate(row)
+        self._today_rows.append(row)
+
+        # 신규 유저 할당량 (다음 샘플러 재구성 시 반영)
+        self._assign_event_quotas([row])
+        self._quota_pools[region].rows_since_rebuild += 1
+        return self.users.view(row)
     
 
     
@@ -228,4 +486,81 @@ class UserSelector:
         levels = [ActivityLevel.HIGH, ActivityLevel.MEDIUM, ActivityLevel.LOW]
         weights = [high_ratio, medium_ratio, low_ratio]
         
-        return random.choices(levels, weights=weights)[0]
\ No newline at end of file
+        return self.random_pool.weighted_pick(levels, weights)
+
+
+    def _assign_activity_levels(self, count: int) -> List[ActivityLevel]:
+        """
+        활성도 등급 일괄 할당 (일별 로드용, 난수 일괄 생성)
+
+        Args:
+            count: 할당할 유저 수
+
+        Returns:
+            ActivityLevel 리스트
+        """
+        activity_config = self.config.get("user_activity", {})
+        weights = [
+            activity_config.get("high_ratio", 0.20),
+            activity_config.get("medium_ratio", 0.50),
+            activity_config.get("low_ratio", 0.30)
+        ]
+        levels = [ActivityLevel.HIGH, ActivityLevel.MEDIUM, ActivityLevel.LOW]
+
+        return self.random_pool.weighted_picks(levels, weights, count)
+
+
+    def _load_quota_config(self) -> Tuple[dict, float]:
+        """
+        활성도 등급별 이벤트 할당량 가중치 로딩
+
+        가중치는 활성도 비율로 가중평균했을 때 1이 되도록 정규화하여
+        전체 평균 할당량이 logs_per_user_per_day와 같아지도록 함
+
+        Returns:
+            ({ActivityLevel: 정규화된 가중치}, noise 비율)
+        """
+        activity_config = self.config.get("user_activity", {})
+        quota_config = activity_config.get("event_quota", {})
+
+        ratios = {
+            ActivityLevel.HIGH: activity_config.get("high_ratio", 0.20),
+            ActivityLevel.MEDIUM: activity_config.get("medium_ratio", 0.50),
+            ActivityLevel.LOW: activity_config.get("low_ratio", 0.30),
+        }
+        weights = {
+            ActivityLevel.HIGH: quota_config.get("high_weight", 3.0),
+            ActivityLevel.MEDIUM: quota_config.get("medium_weight", 1.0),
+            ActivityLevel.LOW: quota_config.get("low_weight", 0.3),
+        }
+
+        mean_weight = sum(ratios[level] * weights[level] for level in ratios) / sum(ratios.values())
+        normalized = {level: weight / mean_weight for level, weight in weights.items()}
+
+        return normalized, quota_config.get("noise", 0.2)
+
+
+    def _assign_event_quotas(self, rows):
+        """
+        유저별 일일 이벤트 할당량 일괄 부여
+
+        할당량 = logs_per_user_per_day × 등급 가중치 × (1 ± noise)
+
+        Args:
+            rows: 할당량을 부여할 row 인덱스들
+        """
+        table = self.users
+        base = self.logs_per_user_per_day
+        noise = self.quota_noise
+        # 등급 코드 → 평균 할당량 (코드 0 = 미할당은 MEDIUM 취급)
+        mean_by_code = [
+            base * self.quota_weights.get(level or ActivityLevel.MEDIUM, 1.0)
+            for level in ACTIVITY_CODES
+        ]
+
+        pools = self._quota_pools
+        for row in rows:
+            mean = mean_by_code[table.activity_levels[row]]
+            quota = max(1, round(mean * self.random_pool.uniform(1 - noise, 1 + noise)))
+            table.event_quota[row] = quota
+            pools[table.region[row]].remaining_total += quota
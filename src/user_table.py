@@ -0,0 +1,337 @@
+from array import array
+from typing import Optional, List
+from schemas.enum import UserState, ActivityLevel
+
+
+# 상태/활성도 enum ↔ int8 코드 매핑 (코드 = 튜플 인덱스)
+STATE_CODES = (
+    UserState.NOT_LOGGED_IN,
+    UserState.MAIN_PAGE,
+    UserState.CONTENT_PAGE,
+    UserState.USER_OUT,
+    UserState.NOT_REGISTERED,
+)
+STATE_TO_CODE = {state: code for code, state in enumerate(STATE_CODES)}
+
+ACTIVITY_CODES = (
+    None,                  # 0: 미할당
+    ActivityLevel.HIGH,    # 1
+    ActivityLevel.MEDIUM,  # 2
+    ActivityLevel.LOW,     # 3
+)
+ACTIVITY_TO_CODE = {level: code for code, level in enumerate(ACTIVITY_CODES)}
+
+# blocked_until / content·episode 인덱스의 "없음" 값
+NO_BLOCK = 0
+NO_INDEX = -1
+
+# 유저 프로필 고정 크기 (row당 선호 장르 수, 최근 시청 콘텐츠 LRU 크기)
+PROFILE_GENRES = 3
+RECENT_CONTENTS = 5
+
+_EMPTY_GENRE_CODES = array('h', [NO_INDEX] * PROFILE_GENRES)
+_EMPTY_GENRE_CUM = array('f', [0.0] * PROFILE_GENRES)
+_EMPTY_RECENT_SLOTS = array('i', [NO_INDEX] * RECENT_CONTENTS)
+
+
+class UserTable:
+    """
+    배열 기반(struct-of-arrays) 유저 저장소
+
+    책임:
+    - 유저 필드를 컬럼별 array로 저장 (유저당 파이썬 객체/딕셔너리 없음)
+    - user_id → row 인덱스 매핑
+    - 콘텐츠/에피소드 ID 문자열 인터닝 (row에는 int 인덱스만 저장)
+    - 선택 가능한(active) row 집합 관리 (O(1) 추가/제거/랜덤 선택, 전체 + 지역별)
+
+    컬럼:
+    - user_ids: int64
+    - states / activity_levels: int8 코드 (STATE_CODES, ACTIVITY_CODES 참고)
+    - subscribed / logged_in_today / deleted: bool (int8)
+    - blocked_until: int64 epoch ms (0이면 차단 없음)
+    - content_idx / episode_idx: 인터닝된 ID 인덱스 (-1이면 없음)
+    - event_quota: 당일 남은 이벤트 할당량 (활성도 등급 기반)
+    - 프로필 (UserProfiles가 최초 사용 시 1회 구성, has_profile로 구분)
+      - primary_platform / platform: 주 사용 플랫폼 / 현재 세션 플랫폼 코드 (-1이면 없음)
+      - genre_codes / genre_cum: row당 PROFILE_GENRES개 선호 장르 코드와 누적 확률 (flat)
+      - recent_slots: row당 RECENT_CONTENTS개 최근 시청 콘텐츠 카탈로그 slot (flat, 0번이 가장 최근)
+    - region: 지역 인덱스 (LogDateGenerator.regions, users.country 기준)
+    - last_search: 직전 search-search 검색어 인덱스 (SearchIndex.terms, -1이면 없음, 다음 click에서 소비)
+    """
+
+    def __init__(self):
+        self.user_ids = array('q')
+        self.states = array('b')
+        self.activity_levels = array('b')
+        self.subscribed = array('b')
+        self.logged_in_today = array('b')
+        self.deleted = array('b')
+        self.blocked_until = array('q')
+        self.content_idx = array('i')
+        self.episode_idx = array('i')
+        self.event_quota = array('i')
+        self.region = array('b')
+
+        # 프로필 컬럼
+        self.has_profile = array('b')
+        self.primary_platform = array('b')
+        self.platform = array('b')
+        self.genre_codes = array('h')
+        self.genre_cum = array('f')
+        self.recent_slots = array('i')
+        self.last_search = array('h')
+
+        # user_id → row
+        self.row_by_user_id: dict[int, int] = {}
+
+        # 인터닝 테이블 (인덱스 → 문자열, 문자열 → 인덱스)
+        self.content_ids: List[str] = []
+        self._content_index: dict[str, int] = {}
+        self.episode_ids: List[str] = []
+        self._episode_index: dict[str, int] = {}
+
+        # 선택 가능한 row 집합 (swap-remove로 O(1) 제거)
+        self.active_rows = array('i')
+        self.active_pos = array('i')  # row → active_rows 내 위치 (-1이면 비활성)
+
+        # 지역별 선택 가능한 row 집합 (지역 인덱스 → rows, 처음 보는 지역이면 추가)
+        self.region_active_rows: List[array] = []
+        self.region_active_pos = array('i')  # row → region_active_rows[region] 내 위치
+
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+    def add(
+        self,
+        user_id: int,
+        is_subscribed: bool,
+        current_state: UserState = UserState.MAIN_PAGE,
+        activity_level: Optional[ActivityLevel] = None,
+        region: int = 0
+    ) -> int:
+        """
+        유저 row 추가 (이미 있으면 기존 row 반환)
+
+        Returns:
+            row 인덱스
+        """
+        row = self.row_by_user_id.get(user_id)
+        if row is not None:
+            return row
+
+        row = len(self.user_ids)
+        self.user_ids.append(user_id)
+        self.states.append(STATE_TO_CODE[current_state])
+        self.activity_levels.append(ACTIVITY_TO_CODE[activity_level])
+        self.subscribed.append(1 if is_subscribed else 0)
+        self.logged_in_today.append(0)
+        self.deleted.append(0)
+        self.blocked_until.append(NO_BLOCK)
+        self.content_idx.append(NO_INDEX)
+        self.episode_idx.append(NO_INDEX)
+        self.event_quota.append(0)
+        self.region.append(region)
+        self.active_pos.append(-1)
+        self.region_active_pos.append(-1)
+        while len(self.region_active_rows) <= region:
+            self.region_active_rows.append(array('i'))
+
+        self.has_profile.append(0)
+        self.primary_platform.append(-1)
+        self.platform.append(-1)
+        self.genre_codes.extend(_EMPTY_GENRE_CODES)
+        self.genre_cum.extend(_EMPTY_GENRE_CUM)
+        self.recent_slots.extend(_EMPTY_RECENT_SLOTS)
+        self.last_search.append(NO_INDEX)
+
+        self.row_by_user_id[user_id] = row
+        return row
+
+
+    def clear(self):
+        """모든 row 제거 (인터닝 테이블은 유지)"""
+        for column in (
+            self.user_ids, self.states, self.activity_levels, self.subscribed,
+            self.logged_in_today, self.deleted, self.blocked_until, self.content_idx,
+            self.episode_idx, self.event_quota, self.region, self.active_rows, self.active_pos,
+            self.region_active_pos, *self.region_active_rows,
+            self.has_profile, self.primary_platform, self.platform, self.genre_codes,
+            self.genre_cum, self.recent_slots, self.last_search
+        ):
+            del column[:]
+        self.row_by_user_id.clear()
+
+
+    def view(self, row: int) -> 'User':
+        """row에 대한 경량 뷰 반환"""
+        return User(self, row)
+
+
+    # ========== 선택 가능 row 집합 ==========
+
+    def activate(self, row: int):
+        """row를 선택 가능 집합(전체 + 소속 지역)에 추가"""
+        if self.active_pos[row] != -1:
+            return
+        self.active_pos[row] = len(self.active_rows)
+        self.active_rows.append(row)
+        region_rows = self.region_active_rows[self.region[row]]
+        self.region_active_pos[row] = len(region_rows)
+        region_rows.append(row)
+
+
+    def deactivate(self, row: int):
+        """row를 선택 가능 집합(전체 + 소속 지역)에서 제거 (마지막 원소와 swap 후 pop)"""
+        pos = self.active_pos[row]
+        if pos == -1:
+            return
+        last_row = self.active_rows[-1]
+        self.active_rows[pos] = last_row
+        self.active_pos[last_row] = pos
+        self.active_rows.pop()
+        self.active_pos[row] = -1
+
+        region_rows = self.region_active_rows[self.region[row]]
+        pos = self.region_active_pos[row]
+        last_row = region_rows[-1]
+        region_rows[pos] = last_row
+        self.region_active_pos[last_row] = pos
+        region_rows.pop()
+        self.region_active_pos[row] = -1
+
+
+    def active_rows_in(self, region: int) -> array:
+        """지역의 선택 가능 row 집합 (-1이면 전체, 수정하지 않음)"""
+        if region == -1:
+            return self.active_rows
+        if region < len(self.region_active_rows):
+            return self.region_active_rows[region]
+        return array('i')
+
+
+    def random_active_row(self, u: float, region: int = -1) -> int:
+        """
+        선택 가능 집합에서 균등 랜덤으로 row 1개 반환 (비어있으면 -1)
+
+        Args:
+            u: [0, 1) 균등 난수 (RandomPool.random())
+            region: 지역 인덱스 (-1이면 전체)
+        """
+        rows = self.active_rows_in(region)
+        if not rows:
+            return -1
+        return rows[int(u * len(rows))]
+
+
+    # ========== 인터닝 ==========
+
+    def intern_content(self, content_id: Optional[str]) -> int:
+        """콘텐츠 ID → 인덱스 (None이면 -1)"""
+        if content_id is None:
+            return NO_INDEX
+        idx = self._content_index.get(content_id)
+        if idx is None:
+            idx = len(self.content_ids)
+            self.content_ids.append(content_id)
+            self._content_index[content_id] = idx
+        return idx
+
+
+    def intern_episode(self, episode_id: Optional[str]) -> int:
+        """에피소드 ID → 인덱스 (None이면 -1)"""
+        if episode_id is None:
+            return NO_INDEX
+        idx = self._episode_index.get(episode_id)
+        if idx is None:
+            idx = len(self.episode_ids)
+            self.episode_ids.append(episode_id)
+            self._episode_index[episode_id] = idx
+        return idx
+
+
+class User:
+    """
+    UserTable row에 대한 경량 뷰 (__slots__, 필드 저장 없음)
+
+    기존 User 객체와 같은 속성 이름을 제공하며
+    읽기/쓰기는 모두 UserTable 컬럼에 바로 반영됨
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: UserTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def user_id(self) -> int:
+        return self.table.user_ids[self.row]
+
+    @property
+    def is_subscribed(self) -> bool:
+        return self.table.subscribed[self.row] == 1
+
+    @is_subscribed.setter
+    def is_subscribed(self, value: bool):
+        self.table.subscribed[self.row] = 1 if value else 0
+
+    @property
+    def current_state(self) -> UserState:
+        return STATE_CODES[self.table.states[self.row]]
+
+    @current_state.setter
+    def current_state(self, value: UserState):
+        self.table.states[self.row] = STATE_TO_CODE[value]
+
+    @property
+    def activity_level(self) -> Optional[ActivityLevel]:
+        return ACTIVITY_CODES[self.table.activity_levels[self.row]]
+
+    @activity_level.setter
+    def activity_level(self, value: Optional[ActivityLevel]):
+        self.table.activity_levels[self.row] = ACTIVITY_TO_CODE[value]
+
+    @property
+    def has_logged_in_today(self) -> bool:
+        return self.table.logged_in_today[self.row] == 1
+
+    @has_logged_in_today.setter
+    def has_logged_in_today(self, value: bool):
+        self.table.logged_in_today[self.row] = 1 if value else 0
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.table.deleted[self.row] == 1
+
+    @is_deleted.setter
+    def is_deleted(self, value: bool):
+        self.table.deleted[self.row] = 1 if value else 0
+
+    @property
+    def current_content_id(self) -> Optional[str]:
+        idx = self.table.content_idx[self.row]
+        return None if idx == NO_INDEX else self.table.content_ids[idx]
+
+    @current_content_id.setter
+    def current_content_id(self, value: Optional[str]):
+        self.table.content_idx[self.row] = self.table.intern_content(value)
+
+    @property
+    def current_episode_id(self) -> Optional[str]:
+        idx = self.table.episode_idx[self.row]
+        return None if idx == NO_INDEX else self.table.episode_ids[idx]
+
+    @current_episode_id.setter
+    def current_episode_id(self, value: Optional[str]):
+        self.table.episode_idx[self.row] = self.table.intern_episode(value)
+
+    @property
+    def blocked_until(self) -> Optional[int]:
+        """패턴 재생 중 차단 시간 (UTC epoch ms)"""
+        ms = self.table.blocked_until[self.row]
+        return None if ms == NO_BLOCK else ms
+
+    @blocked_until.setter
+    def blocked_until(self, value: Optional[int]):
+        self.table.blocked_until[self.row] = NO_BLOCK if value is None else value
@@ -0,0 +1,411 @@
+import math
+import random
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from schemas.enum import UserState
+from src.date_generator import LogDateGenerator, local_epochs
+from src.user_controller import UserEventController
+from src.watch_pattern import WatchPatternEngine
+
+
+# 세션 시작 상태 (기존 유저: NOT_LOGGED_IN, 신규 유저: NOT_REGISTERED)
+# 마르코프 체인 상태 = (UserState, 구독여부)
+ChainState = Tuple[UserState, bool]
+
+# 카테고리별 평균 레코드 크기 기본값 (bytes, JSON 직렬화 기준 벤치마크 값)
+DEFAULT_BYTES_PER_EVENT = {
+    "access": 110,
+    "contents": 170,
+    "review": 210,
+    "subscription": 125,
+    "register": 150,
+    "search": 135,
+    "support": 200,
+}
+
+# Kinesis 샤드당 쓰기 한도
+KINESIS_SHARD_BYTES_PER_SEC = 1024 * 1024
+KINESIS_SHARD_RECORDS_PER_SEC = 1000
+
+
+class VolumePlanner:
+    """
+    로그 발생량/용량 분석기 (로그를 생성하지 않고 설정만으로 계산)
+
+    책임:
+    - user_event_transitions를 흡수 마르코프 체인으로 보고 유저-일당 기대 방문 수 계산
+      (기본: 닫힌 형태 선형대수 해, 특이 행렬이면 몬테카를로 시뮬레이션)
+    - 시청 패턴(watch_patterns)으로 contents-start 1회당 재생 로그 수 확장
+    - 날짜/시간대 가중치와 DAU로 카테고리별·시간별·일별 기대 로그 수 계산
+    - 벤치마크 계수로 Kinesis 샤드 수, 시간당 바이트, 예상 실행 시간 추정
+    """
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: config.toml 전체 dict
+        """
+        self.config = config
+
+        planner_config = config.get("planner", {})
+        self.method = planner_config.get("method", "closed_form")  # closed_form | monte_carlo
+        self.monte_carlo_sessions = planner_config.get("monte_carlo_sessions", 20000)
+        self.max_session_steps = planner_config.get("max_session_steps", 1000)
+        self.subscribed_ratio = planner_config.get("subscribed_ratio", 0.70)
+        self.benchmark_mps = planner_config.get("benchmark_mps", 20000)
+        self.bytes_per_event = {
+            **DEFAULT_BYTES_PER_EVENT,
+            **planner_config.get("bytes_per_event", {})
+        }
+
+        self.dau = config["date_generator"]["dau"]
+        self.logs_per_user_per_day = config["date_generator"]["logs_per_user_per_day"]
+        self.new_user_ratio = config.get("user", {}).get("new_user_ratio", 0.03)
+
+        self.controller = UserEventController(config)
+        self.date_generator = LogDateGenerator(config)
+
+        # contents-start 1회당 재생 로그 수 (LogContents와 같은 시청 패턴 엔진 사용)
+        watch_patterns = WatchPatternEngine(config, self.controller.random_pool)
+        self.playback_logs = watch_patterns.expected_events_per_start()
+
+        # contents-playing heartbeat: 에피소드 수 × 평균 시청시간 / 간격 (구간마다 평균 0.5건 절삭)
+        playing_interval = config.get("log_contents", {}).get("playing_interval_seconds", 0)
+        if playing_interval > 0:
+            episodes, segments = watch_patterns.expected_play_per_start()
+            heartbeats = episodes * self._mean_watch_minutes() * 60 / playing_interval - 0.5 * segments
+            self.playback_logs["contents-playing"] = max(0.0, heartbeats)
+
+
+    def _mean_watch_minutes(self) -> float:
+        """활성도 등급 비율로 가중평균한 에피소드당 시청시간 (분)"""
+        activity_config = self.config.get("user_activity", {})
+        watch_time_config = activity_config.get("watch_time", {})
+        levels = [
+            (activity_config.get("high_ratio", 0.20), watch_time_config.get("high_avg_minutes", 45)),
+            (activity_config.get("medium_ratio", 0.50), watch_time_config.get("medium_avg_minutes", 25)),
+            (activity_config.get("low_ratio", 0.30), watch_time_config.get("low_avg_minutes", 10)),
+        ]
+        total = sum(ratio for ratio, _ in levels)
+        return sum(ratio * minutes for ratio, minutes in levels) / total
+
+
+    # ========== 마르코프 체인 ==========
+
+    def _chain_transitions(self) -> Dict[ChainState, List[Tuple[float, str, Optional[ChainState]]]]:
+        """
+        컴파일된 전이 테이블 → 체인 상태별 [(확률, 이벤트, 다음 체인 상태)] (None = 흡수)
+
+        subscription-start/stop은 구독여부를 뒤집어 다음 상태에 반영
+        """
+        chain: Dict[ChainState, List[Tuple[float, str, Optional[ChainState]]]] = {}
+
+        for (state, subscribed), (sampler, transitions) in self.controller.transition_tables.items():
+            # alias 테이블에서 각 Transition의 실제 선택 확률 복원
+            probs = [0.0] * len(transitions)
+            for i in range(sampler.size):
+                probs[i] += sampler.prob[i] / sampler.size
+                probs[sampler.alias[i]] += (1.0 - sampler.prob[i]) / sampler.size
+
+            edges = []
+            for p, transition in zip(probs, transitions):
+                if p <= 0:
+                    continue
+                next_subscribed = subscribed
+                if transition.event_type == "subscription-start":
+                    next_subscribed = True
+                elif transition.event_type == "subscription-stop":
+                    next_subscribed = False
+
+                if transition.next_state == UserState.USER_OUT:
+                    next_chain_state = None
+                else:
+                    next_chain_state = (transition.next_state, next_subscribed)
+                edges.append((p, transition.event_type, next_chain_state))
+            chain[(state, subscribed)] = edges
+
+        # 고정 전이: 로그인/가입 후 MAIN_PAGE
+        for subscribed in (True, False):
+            chain[(UserState.NOT_LOGGED_IN, subscribed)] = [
+                (1.0, "access-in", (UserState.MAIN_PAGE, subscribed))
+            ]
+        chain[(UserState.NOT_REGISTERED, False)] = [
+            (1.0, "register-in", (UserState.MAIN_PAGE, False))
+        ]
+        return chain
+
+
+    def _start_distribution(self) -> Dict[ChainState, float]:
+        """
+        세션 시작 상태 분포
+
+        하루 세션 수 ≈ DAU(기존 유저 1회 로그인) + 신규 유저 수
+        """
+        events_per_day = self.dau * self.logs_per_user_per_day
+        new_users_per_day = events_per_day * self.new_user_ratio
+        sessions = self.dau + new_users_per_day
+        new_share = new_users_per_day / sessions if sessions > 0 else 0.0
+        existing_share = 1.0 - new_share
+
+        return {
+            (UserState.NOT_LOGGED_IN, True): existing_share * self.subscribed_ratio,
+            (UserState.NOT_LOGGED_IN, False): existing_share * (1.0 - self.subscribed_ratio),
+            (UserState.NOT_REGISTERED, False): new_share,
+        }
+
+
+    def expected_visits_closed_form(self) -> Dict[ChainState, float]:
+        """
+        세션당 기대 방문 수 (닫힌 형태)
+
+        유저당 하루 이벤트 수(K = logs_per_user_per_day)에서 세션이 잘리므로
+        v = (α - α Q^K) (I - Q)^-1  →  (I - Q)^T v^T = (α - α Q^K)^T 를 np.linalg.solve로 풀이
+
+        Raises:
+            ValueError: 전이 확률이 정의되지 않은 상태로 이동하는 경우
+            np.linalg.LinAlgError: I - Q가 특이 행렬인 경우 (흡수되지 않는 상태 존재)
+        """
+        chain = self._chain_transitions()
+        states = list(chain.keys())
+        index = {state: i for i, state in enumerate(states)}
+        n = len(states)
+
+        # Q: 흡수되지 않는 상태 간 전이 확률
+        q = np.zeros((n, n))
+        for state, edges in chain.items():
+            i = index[state]
+            for p, _, next_state in edges:
+                if next_state is None:
+                    continue
+                j = index.get(next_state)
+                if j is None:
+                    raise ValueError(f"전이 확률이 정의되지 않은 상태로 이동: {next_state}")
+                q[i, j] += p
+
+        start = self._start_distribution()
+        alpha = np.array([start.get(state, 0.0) for state in states])
+
+        # α Q^K (K 스텝 후에도 흡수되지 않은 확률 분포)
+        tail = alpha @ np.linalg.matrix_power(q, self.logs_per_user_per_day)
+
+        a = (np.eye(n) - q).T
+        # 수치적으로만 풀리는 특이 행렬(흡수되지 않는 순환)은 solve가 거대한 값을 돌려주므로 조건수로 거름
+        if np.linalg.cond(a) > 1.0 / np.finfo(float).eps:
+            raise np.linalg.LinAlgError("특이 행렬 (흡수되지 않는 상태가 있음)")
+        solution = np.linalg.solve(a, alpha - tail)
+        return {state: float(solution[index[state]]) for state in states}
+
+
+    def expected_visits_monte_carlo(self) -> Dict[ChainState, float]:
+        """
+        세션당 기대 방문 수 (몬테카를로 시뮬레이션)
+
+        유저당 하루 이벤트 수 또는 max_session_steps를 넘는 세션은 중단
+        """
+        chain = self._chain_transitions()
+        start = self._start_distribution()
+        start_states = list(start.keys())
+        start_weights = list(start.values())
+
+        cumulative = {}
+        for state, edges in chain.items():
+            total = 0.0
+            cum = []
+            for p, _, next_state in edges:
+                total += p
+                cum.append((total, next_state))
+            cumulative[state] = (total, cum)
+
+        visits: Dict[ChainState, float] = defaultdict(float)
+        sessions = self.monte_carlo_sessions
+        max_steps = min(self.max_session_steps, self.logs_per_user_per_day)
+        for state in random.choices(start_states, weights=start_weights, k=sessions):
+            for _ in range(max_steps):
+                if state is None:
+                    break
+                visits[state] += 1
+                total, cum = cumulative[state]
+                r = random.random() * total
+                for threshold, next_state in cum:
+                    if r < threshold:
+                        state = next_state
+                        break
+
+        return {state: count / sessions for state, count in visits.items()}
+
+
+    def expected_events_per_session(self) -> Tuple[Dict[str, float], str]:
+        """
+        세션당 이벤트 타입별 기대 발생 수
+
+        Returns:
+            ({event_type: 기대 횟수}, 사용한 계산 방식)
+        """
+        method = self.method
+        visits = None
+        if method == "closed_form":
+            try:
+                visits = self.expected_visits_closed_form()
+            except (ValueError, np.linalg.LinAlgError) as e:
+                print(f"⚠️  닫힌 형태 계산 실패 ({e}) → 몬테카를로로 대체")
+                method = "monte_carlo"
+        if visits is None:
+            visits = self.expected_visits_monte_carlo()
+
+        chain = self._chain_transitions()
+        events: Dict[str, float] = defaultdict(float)
+        for state, count in visits.items():
+            for p, event, _ in chain.get(state, []):
+                if event is not None:
+                    events[event] += count * p
+        return dict(events), method
+
+
+    # ========== 로그 확장 ==========
+
+    def expected_logs_per_event(self) -> Tuple[Dict[str, float], float, str]:
+        """
+        타임스탬프(이벤트) 1개당 로그 타입별 기대 로그 수
+
+        Returns:
+            ({log_type: 이벤트당 기대 로그 수}, 세션당 기대 이벤트 수, 계산 방식)
+        """
+        events, method = self.expected_events_per_session()
+        session_length = sum(events.values())
+
+        logs: Dict[str, float] = defaultdict(float)
+        for event, count in events.items():
+            if event == "contents-start":
+                for log_type, per_start in self.playback_logs.items():
+                    logs[log_type] += count * per_start
+            else:
+                logs[event] += count
+
+        per_event = {log_type: count / session_length for log_type, count in logs.items()}
+        return per_event, session_length, method
+
+
+    # ========== 시간대별 분포 ==========
+
+    def hourly_event_counts(self, target_month: str, total_events: int) -> List[Tuple[date, int, float]]:
+        """
+        (현지 날짜, 현지 시각)별 기대 이벤트 수 (LogDateGenerator와 같은 지역별 요일/시간대 가중치)
+
+        날짜/시각은 global.timezone 기준 (월 범위와 같은 기준이라 월 첫날/마지막 날도 온전한 하루)
+
+        Returns:
+            [(date, hour, 기대 이벤트 수), ...]
+        """
+        minute_starts, weights = self.date_generator.compile_month(target_month)
+        total_weight = float(weights.sum())
+
+        # 분 단위 가중치 → 현지 시간 단위 합계
+        local = local_epochs(minute_starts, self.date_generator.tz)
+        hour_keys, hour_index = np.unique(local // 3600, return_inverse=True)
+        hour_totals = np.bincount(hour_index, weights=weights.sum(axis=0))
+
+        cells = []
+        for epoch, weight in zip((hour_keys * 3600).tolist(), hour_totals.tolist()):
+            if weight > 0:
+                local_hour = datetime.fromtimestamp(epoch, timezone.utc)  # 현지 시각을 UTC처럼 표현한 값
+                cells.append((local_hour.date(), local_hour.hour, total_events * weight / total_weight))
+        return cells
+
+
+    # ========== 리포트 ==========
+
+    def plan(self) -> dict:
+        """
+        월별 발생량/용량 계획 계산 및 출력
+
+        Returns:
+            월별 계획 결과 dict 리스트를 담은 dict
+        """
+        per_event, session_length, method = self.expected_logs_per_event()
+        logs_per_event = sum(per_event.values())
+
+        category_share: Dict[str, float] = defaultdict(float)
+        for log_type, count in per_event.items():
+            category_share[log_type.split("-")[0]] += count / logs_per_event
+        bytes_per_log = sum(
+            share * self.bytes_per_event.get(category, 150)
+            for category, share in category_share.items()
+        )
+
+        target_mps = self.config["global"].get("target_mps", 0)
+        replay_mps = target_mps if target_mps > 0 else self.benchmark_mps
+
+        print("\n" + "=" * 80)
+        print("📐 발생량/용량 계획 (로그 생성 없이 설정 기반 추정)")
+        print("=" * 80)
+        print(f"   계산 방식: {method}")
+        print(f"   세션당 기대 이벤트 수: {session_length:.2f}")
+        print(f"   이벤트(타임스탬프)당 기대 로그 수: {logs_per_event:.3f}")
+        print(f"   로그당 평균 크기: {bytes_per_log:.0f} bytes")
+        print("\n   [로그 타입별 비율]")
+        for log_type, count in sorted(per_event.items(), key=lambda x: -x[1]):
+            print(f"   - {log_type:<20} {count / logs_per_event * 100:6.2f}%")
+
+        months = []
+        for month in self.config["global"]["target_months"]:
+            total_events = self.date_generator.calculate_total_logs(
+                target_month=month,
+                dau=self.dau,
+                logs_per_user_per_day=self.logs_per_user_per_day
+            )
+            total_logs = total_events * logs_per_event
+            hourly = self.hourly_event_counts(month, total_events)
+
+            daily: Dict[date, float] = defaultdict(float)
+            for d, _, count in hourly:
+                daily[d] += count * logs_per_event
+            peak_day, peak_hour, peak_events = max(hourly, key=lambda x: x[2])
+            peak_logs_per_hour = peak_events * logs_per_event
+
+            # 실시간 재생 시 피크 시간대 초당 로그 수 → 샤드 수
+            realtime_peak_rps = peak_logs_per_hour / 3600
+            realtime_shards = self._kinesis_shards(realtime_peak_rps, bytes_per_log)
+            # 최대 속도(target_mps 또는 벤치마크 MPS)로 전송 시 샤드 수
+            replay_shards = self._kinesis_shards(replay_mps, bytes_per_log)
+
+            result = {
+                "month": month,
+                "total_events": total_events,
+                "total_logs": total_logs,
+                "logs_by_type": {t: total_events * c for t, c in per_event.items()},
+                "logs_by_day": dict(daily),
+                "peak_hour": (peak_day, peak_hour),
+                "peak_logs_per_hour": peak_logs_per_hour,
+                "peak_bytes_per_hour": peak_logs_per_hour * bytes_per_log,
+                "total_bytes": total_logs * bytes_per_log,
+                "realtime_kinesis_shards": realtime_shards,
+                "replay_kinesis_shards": replay_shards,
+                "estimated_runtime_sec": total_logs / self.benchmark_mps if self.benchmark_mps > 0 else None,
+            }
+            months.append(result)
+
+            print(f"\n📅 {month}")
+            print(f"   이벤트 수: {total_events:,} | 기대 로그 수: {total_logs:,.0f}")
+            print(f"   기대 데이터량: {result['total_bytes'] / 1024 ** 3:.2f} GiB")
+            print(f"   피크 시간대: {peak_day} {peak_hour:02d}시 ({self.date_generator.tz.zone}) "
+                  f"({peak_logs_per_hour:,.0f} logs/h, {result['peak_bytes_per_hour'] / 1024 ** 2:.1f} MiB/h)")
+            print(f"   일별 로그 수: 최소 {min(daily.values()):,.0f} / 최대 {max(daily.values()):,.0f}")
+            print(f"   Kinesis 샤드 (실시간 재생 기준): {realtime_shards}개")
+            print(f"   Kinesis 샤드 ({replay_mps:,} MPS 전송 기준): {replay_shards}개")
+            if result["estimated_runtime_sec"] is not None:
+                print(f"   예상 실행 시간 (벤치마크 {self.benchmark_mps:,} MPS): "
+                      f"{result['estimated_runtime_sec'] / 60:.1f}분")
+
+        print("\n" + "=" * 80)
+        return {"method": method, "logs_per_event": logs_per_event, "months": months}
+
+
+    def _kinesis_shards(self, records_per_sec: float, bytes_per_record: float) -> int:
+        """초당 레코드 수/크기 → 필요한 Kinesis 샤드 수"""
+        by_bytes = records_per_sec * bytes_per_record / KINESIS_SHARD_BYTES_PER_SEC
+        by_records = records_per_sec / KINESIS_SHARD_RECORDS_PER_SEC
+        return max(1, math.ceil(max(by_bytes, by_records)))
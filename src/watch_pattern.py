@@ -0,0 +1,258 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from schemas.enum import EventType
+from src.random_pool import RandomPool
+
+
+# 시청 패턴 단계에서 사용할 수 있는 재생 이벤트 (contents-{event})
+PLAYBACK_EVENTS = {
+    "start": EventType.START.value,
+    "stop": EventType.STOP.value,
+    "pause": EventType.PAUSE.value,
+    "resume": EventType.RESUME.value,
+}
+
+# 단계 지연 종류 (직전 단계 → 현재 단계까지의 시간)
+DELAY_NONE = 0    # 지연 없음 (같은 시각)
+DELAY_WATCH = 1   # 총 시청시간 × U(lo, hi) 만큼 시청
+DELAY_WAIT = 2    # U(lo, hi)분 대기 (시청시간에 포함되지 않음)
+DELAY_REST = 3    # 총 시청시간 중 남은 시간만큼 시청
+
+# config에 watch_patterns가 없을 때 사용하는 기본 패턴 (기존 4가지 패턴과 동일)
+DEFAULT_WATCH_PATTERNS = {
+    "play_stop": {
+        "probability": 0.15,
+        "steps": [
+            {"event": "start"},
+            {"event": "stop", "watch_rest": True},
+        ],
+    },
+    "play_pause_stop": {
+        "probability": 0.25,
+        "steps": [
+            {"event": "start"},
+            {"event": "pause", "watch": [0.3, 0.7]},
+            {"event": "stop", "watch_rest": True},
+        ],
+    },
+    "play_pause_resume_stop": {
+        "probability": 0.50,
+        "steps": [
+            {"event": "start"},
+            {"event": "pause", "watch": [0.2, 0.4]},
+            {"event": "resume", "wait": [1, 5]},
+            {"event": "stop", "watch_rest": True},
+        ],
+    },
+    "play_pause_resume_pause_stop": {
+        "probability": 0.10,
+        "steps": [
+            {"event": "start"},
+            {"event": "pause", "watch": [0.15, 0.25]},
+            {"event": "resume", "wait": [1, 3]},
+            {"event": "pause", "watch": [0.2, 0.35]},
+            {"event": "stop", "watch_rest": True},
+        ],
+    },
+}
+
+
+class WatchPattern(NamedTuple):
+    """컴파일된 시청 패턴 (단계별 병렬 배열)"""
+    name: str
+    probability: float
+    events: Tuple[str, ...]              # 단계별 이벤트 이름 ("start", "pause", ...)
+    event_type_codes: Tuple[int, ...]    # 단계별 EventType 코드
+    delay_kinds: Tuple[int, ...]         # 단계별 지연 종류 (DELAY_*)
+    delay_lows: Tuple[float, ...]
+    delay_highs: Tuple[float, ...]
+    episode_index: Tuple[int, ...]       # 단계별 에피소드 순번 (next_episode마다 1 증가)
+
+
+class WatchPatternEngine:
+    """
+    config 기반 시청 패턴 엔진
+
+    책임:
+    - [log_contents.watch_patterns]의 (이벤트, 지연 분포) 단계 목록을 패턴별 배열로 1회 컴파일
+    - 패턴 확률로 패턴 선택 (RandomPool 범주형 분포)
+    - 총 시청시간이 주어지면 패턴의 모든 단계 시각(분 단위 오프셋)을 한 번에 계산
+
+    패턴 단계 형식 (config.toml):
+        { event = "pause", watch = [0.2, 0.4] }   # 총 시청시간의 20~40%를 본 뒤 pause
+        { event = "resume", wait = [1, 5] }       # 1~5분 대기 후 resume (시청시간 미포함)
+        { event = "stop", watch_rest = true }     # 남은 시청시간을 모두 본 뒤 stop
+        { event = "start", next_episode = true }  # 다음 에피소드로 넘어가서 start (시리즈 정주행)
+
+    총 시청시간(활성도 등급별)은 에피소드마다 적용 (next_episode 이후 watch/watch_rest는 새로 계산)
+    """
+
+    def __init__(self, config: dict, random_pool: Optional[RandomPool] = None):
+        """
+        Args:
+            config: config.toml 전체 dict
+            random_pool: 패턴 선택/지연 샘플링용 난수 버퍼 (없으면 새로 생성)
+        """
+        log_contents_config = config.get("log_contents", {})
+        self.random_pool = random_pool or RandomPool(config)
+
+        self.patterns: Tuple[WatchPattern, ...] = tuple(
+            self._compile_pattern(name, spec)
+            for name, spec in self._load_pattern_specs(log_contents_config).items()
+        )
+        self.patterns = tuple(p for p in self.patterns if p.probability > 0)
+        if not self.patterns:
+            raise ValueError("시청 패턴이 없습니다. [log_contents.watch_patterns]를 확인하세요.")
+
+        self.random_pool.register_choice("watch_pattern", [p.probability for p in self.patterns])
+
+
+    def _load_pattern_specs(self, log_contents_config: dict) -> Dict[str, dict]:
+        """
+        패턴 정의 로드
+
+        - watch_patterns가 있으면 그대로 사용
+        - 없으면 기본 패턴을 사용하되, 기존 watch_pattern_probability가 있으면 확률만 덮어씀
+        """
+        specs = log_contents_config.get("watch_patterns")
+        if specs:
+            return specs
+
+        probabilities = log_contents_config.get("watch_pattern_probability", {})
+        specs = {}
+        for name, spec in DEFAULT_WATCH_PATTERNS.items():
+            specs[name] = {**spec, "probability": probabilities.get(name, spec["probability"])}
+        return specs
+
+
+    def _compile_pattern(self, name: str, spec: dict) -> WatchPattern:
+        """패턴 정의 1개 → WatchPattern (잘못된 정의는 ValueError)"""
+        steps = spec.get("steps", [])
+        if not steps:
+            raise ValueError(f"시청 패턴 '{name}': steps가 비어 있습니다.")
+
+        events, codes, kinds, lows, highs, episode_index = [], [], [], [], [], []
+        episode = 0
+        for i, step in enumerate(steps):
+            event = step.get("event")
+            if event not in PLAYBACK_EVENTS:
+                raise ValueError(
+                    f"시청 패턴 '{name}' {i + 1}단계: 알 수 없는 이벤트 {event!r} "
+                    f"(가능: {', '.join(PLAYBACK_EVENTS)})"
+                )
+
+            if "watch" in step:
+                kind, (low, high) = DELAY_WATCH, step["watch"]
+            elif "wait" in step:
+                kind, (low, high) = DELAY_WAIT, step["wait"]
+            elif step.get("watch_rest"):
+                kind, low, high = DELAY_REST, 0.0, 0.0
+            else:
+                kind, low, high = DELAY_NONE, 0.0, 0.0
+
+            if step.get("next_episode"):
+                episode += 1
+
+            events.append(event)
+            codes.append(PLAYBACK_EVENTS[event])
+            kinds.append(kind)
+            lows.append(float(low))
+            highs.append(float(high))
+            episode_index.append(episode)
+
+        return WatchPattern(
+            name=name,
+            probability=float(spec.get("probability", 0.0)),
+            events=tuple(events),
+            event_type_codes=tuple(codes),
+            delay_kinds=tuple(kinds),
+            delay_lows=tuple(lows),
+            delay_highs=tuple(highs),
+            episode_index=tuple(episode_index),
+        )
+
+
+    def choose(self) -> WatchPattern:
+        """패턴 확률로 패턴 1개 선택"""
+        return self.patterns[self.random_pool.choice("watch_pattern")]
+
+
+    def offsets(self, pattern: WatchPattern, total_watch_minutes: float) -> List[float]:
+        """
+        패턴 단계별 시작 시각으로부터의 오프셋 (분 단위, 단계 순서대로)
+
+        Args:
+            pattern: 컴파일된 패턴
+            total_watch_minutes: 총 시청시간 (분)
+
+        Returns:
+            단계별 누적 오프셋 리스트 (마지막 값이 패턴 종료 시각)
+        """
+        uniform = self.random_pool.random
+        offsets = []
+        elapsed = 0.0
+        watched = 0.0
+        episode = 0
+        for kind, low, high, step_episode in zip(
+            pattern.delay_kinds, pattern.delay_lows, pattern.delay_highs, pattern.episode_index
+        ):
+            # 다음 에피소드로 넘어가면 시청시간을 새로 계산
+            if step_episode != episode:
+                episode = step_episode
+                watched = 0.0
+
+            if kind == DELAY_WATCH:
+                delay = total_watch_minutes * (low + (high - low) * uniform())
+                watched += delay
+            elif kind == DELAY_WAIT:
+                delay = low + (high - low) * uniform()
+            elif kind == DELAY_REST:
+                delay = max(0.0, total_watch_minutes - watched)
+                watched += delay
+            else:
+                delay = 0.0
+            elapsed += delay
+            offsets.append(elapsed)
+        return offsets
+
+
+    def play_segments(self, pattern: WatchPattern, offsets: List[float]) -> List[Tuple[int, float, float]]:
+        """
+        재생 중 구간 목록 (start/resume → 다음 pause/stop)
+
+        Returns:
+            [(에피소드 순번, 구간 시작 오프셋, 구간 끝 오프셋), ...] (분 단위)
+        """
+        segments = []
+        opened = None  # (에피소드 순번, 구간 시작 오프셋)
+        for event, offset, episode in zip(pattern.events, offsets, pattern.episode_index):
+            # stop 없이 다음 에피소드 start가 오면 이전 구간을 그 시각에 닫음
+            if opened is not None and (event in ("pause", "stop") or episode != opened[0]):
+                segments.append((opened[0], opened[1], offset))
+                opened = None
+            if event in ("start", "resume") and opened is None:
+                opened = (episode, offset)
+        return segments
+
+
+    def expected_play_per_start(self) -> Tuple[float, float]:
+        """contents-start 1회(패턴 1회)당 기대 (시청 에피소드 수, 재생 구간 수) (VolumePlanner용)"""
+        total = sum(p.probability for p in self.patterns)
+        episodes = 0.0
+        segments = 0.0
+        for pattern in self.patterns:
+            weight = pattern.probability / total
+            episodes += weight * (pattern.episode_index[-1] + 1)
+            segments += weight * len(self.play_segments(pattern, [0.0] * len(pattern.events)))
+        return episodes, segments
+
+
+    def expected_events_per_start(self) -> Dict[str, float]:
+        """contents-start 1회(패턴 1회)당 이벤트별 기대 로그 수 (VolumePlanner용)"""
+        total = sum(p.probability for p in self.patterns)
+        counts: Dict[str, float] = {}
+        for pattern in self.patterns:
+            for event in pattern.events:
+                log_type = f"contents-{event}"
+                counts[log_type] = counts.get(log_type, 0.0) + pattern.probability / total
+        return counts
@@ -0,0 +1,93 @@
+from collections import Counter
+
+from src.active_user_index import ActiveUserIndex
+from src.random_pool import RandomPool
+
+
+def _index(rows=()):
+    return ActiveUserIndex(rows, RandomPool({"global": {"random_seed": 9}}))
+
+
+def _population():
+    # KR 구독 600 / KR 미구독 200 / JP 구독 100 / JP 미구독 100
+    rows = []
+    for user_id in range(1, 1001):
+        country = "KR" if user_id <= 800 else "JP"
+        subscribed = (user_id % 4 != 0) if country == "KR" else (user_id % 2 == 0)
+        rows.append((user_id, subscribed, country))
+    return _index(rows)
+
+
+def test_swap_remove_keeps_positions_consistent():
+    index = _index([(1, True, "KR"), (2, True, "KR"), (3, True, "KR"), (4, False, "JP")])
+
+    index.remove(1)      # 마지막 원소(3)가 빈 자리로 이동
+    index.remove(99)     # 없는 유저는 무시
+    index.remove(4)      # 셀의 유일한 원소
+
+    assert len(index) == 2 and 1 not in index and 4 not in index
+    assert sorted(row["user_id"] for row in index.sample(10)) == [2, 3]
+    for user_id in (2, 3):
+        key, pos = index._position[user_id]
+        assert index._cells[key][pos] == user_id
+
+
+def test_set_subscribed_moves_between_cells():
+    index = _index([(1, False, "KR"), (2, False, "KR")])
+
+    index.set_subscribed(1, True)
+    index.set_subscribed(1, True)  # 같은 값이면 변화 없음
+
+    assert len(index) == 2
+    rows = {row["user_id"]: row for row in index.sample(2)}
+    assert rows[1] == {"user_id": 1, "is_subscribed": 1, "country": "KR"}
+    assert rows[2]["is_subscribed"] == 0
+
+
+def test_add_ignores_duplicates():
+    index = _index([(1, True, "KR")])
+    index.add(1, False, "JP")
+
+    assert len(index) == 1
+    assert index.sample(5) == [{"user_id": 1, "is_subscribed": 1, "country": "KR"}]
+
+
+def test_uniform_sample_is_without_replacement_and_capped():
+    index = _population()
+
+    drawn = [row["user_id"] for row in index.sample(300)]
+    assert len(drawn) == len(set(drawn)) == 300
+    assert len(index.sample(5000)) == 1000
+    assert index.sample(0) == []
+
+
+def test_segment_sample_follows_shares():
+    index = _population()
+
+    rows = index.sample(200, "country", {"KR": 0.5, "JP": 0.5})
+    countries = Counter(row["country"] for row in rows)
+    assert countries == {"KR": 100, "JP": 100}
+
+    rows = index.sample(300, "subscribed", {True: 0.2, False: 0.8})
+    subscribed = Counter(row["is_subscribed"] for row in rows)
+    assert subscribed == {1: 60, 0: 240}
+
+
+def test_segment_shortfall_is_filled_from_other_users():
+    index = _population()
+
+    rows = index.sample(500, "country", {"JP": 0.9, "CN": 0.1})  # JP는 200명뿐, CN은 없음
+
+    assert len(rows) == len({row["user_id"] for row in rows}) == 500
+    assert Counter(row["country"] for row in rows)["JP"] == 200
+
+
+def test_sample_reflects_removals():
+    index = _population()
+    for user_id in range(801, 1001):
+        index.remove(user_id)
+
+    rows = index.sample(1000, "country", {"JP": 1.0})
+
+    assert len(rows) == 800
+    assert {row["country"] for row in rows} == {"KR"}
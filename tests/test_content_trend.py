@@ -0,0 +1,67 @@
+from src.content_catalog import ContentCatalog
+from src.content_trend import ContentTrend
+from src.search_index import SearchIndex
+
+
+HOUR = 3_600_000
+
+
+def _trend(interval_hours):
+    catalog = ContentCatalog([
+        {"contents_id": "movie_1", "contents_type": "movie", "popularity": 1.0, "release_date": "2025-01-01",
+         "title": "해리포터와 마법사의 돌"},
+        {"contents_id": "movie_2", "contents_type": "movie", "popularity": 1.0, "release_date": "2025-09-10",
+         "title": "해리포터와 비밀의 방"},
+    ])
+    config = {
+        "global": {"timezone": "UTC"},
+        "content_trend": {"enabled": True, "update_interval_hours": interval_hours},
+    }
+    return ContentTrend(config, catalog), catalog
+
+
+def test_next_update_aligns_to_interval_boundaries():
+    trend, _ = _trend(6)
+    now = 1_756_684_800_000 + 7 * HOUR + 123  # 2025-09-01 07:00:00.123 UTC
+
+    trend.advance(now)
+
+    assert trend.next_update == 1_756_684_800_000 + 12 * HOUR
+
+
+def test_unreleased_contents_get_zero_weight_until_release():
+    trend, catalog = _trend(1)
+
+    trend.advance(1_756_684_800_000)  # 2025-09-01
+    assert catalog.popularity_sampler.weights[1] == 0.0
+    assert catalog.popularity_sampler.weights[0] == 1.0
+
+    trend.advance(1_756_684_800_000 + 10 * 24 * HOUR)  # 2025-09-11
+    assert catalog.popularity_sampler.weights[1] > 1.0
+
+
+def test_disabled_trend_never_updates():
+    catalog = ContentCatalog([{"contents_id": "movie_1", "contents_type": "movie", "popularity": 1.0}])
+    trend = ContentTrend({"content_trend": {"enabled": False}}, catalog)
+
+    trend.advance(1_756_684_800_000)
+
+    assert not catalog.dynamic
+
+
+def test_search_index_follows_trend_weights():
+    catalog = _trend(1)[1]
+    config = {"log_contents": {"search_terms": ["해리포터", "비밀의방"]}}
+    index = SearchIndex(config, catalog)
+    trend = ContentTrend({"global": {"timezone": "UTC"}, "content_trend": {"enabled": True}}, catalog)
+    both, unreleased_only = index.term_index["해리포터"], index.term_index["비밀의방"]
+    us = [i / 200 for i in range(200)]
+
+    trend.advance(1_756_684_800_000)  # 2025-09-01, movie_2 미공개
+    assert {index.sample(both, u).contents_id for u in us} == {"movie_1"}
+    assert index.sample(unreleased_only, 0.5) is None
+
+    trend.advance(1_756_684_800_000 + 10 * 24 * HOUR)  # 2025-09-11, movie_2 공개 직후 부스트
+    picks = [index.sample(both, u).contents_id for u in us]
+    assert picks.count("movie_2") > picks.count("movie_1")
+    assert index.sample(unreleased_only, 0.5).contents_id == "movie_2"
@@ -0,0 +1,97 @@
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pytz
+
+from src.date_generator import LogDateGenerator, local_epochs
+from src.random_pool import RandomPool
+
+
+SUNDAY_ONLY = {
+    "monday": 0.0, "tuesday": 0.0, "wednesday": 0.0, "thursday": 0.0,
+    "friday": 0.0, "saturday": 0.0, "sunday": 1.0,
+}
+
+
+def _generator(hour_distribution=None, day_of_week_ratio=None, seed=5):
+    regions = {
+        "KR": {"share": 0.5, "timezone": "Asia/Seoul"},
+        "IN": {"share": 0.3, "timezone": "Asia/Kolkata"},           # UTC+5:30
+        "AU": {"share": 0.2, "timezone": "Australia/Adelaide"},     # UTC+9:30/+10:30, 10/5 16:30 UTC DST 시작
+    }
+    date_config = {"regions": regions, "hour_distribution": hour_distribution or {"0-24": 1.0}}
+    if day_of_week_ratio:
+        date_config["day_of_week_ratio"] = day_of_week_ratio
+    config = {"global": {"timezone": "Asia/Seoul", "random_seed": seed}, "date_generator": date_config}
+    return LogDateGenerator(config, RandomPool(config))
+
+
+def _month_bounds(tz_name, year, month):
+    tz = pytz.timezone(tz_name)
+    start = int(tz.localize(datetime(year, month, 1)).timestamp())
+    end = int(tz.localize(datetime(year, month + 1, 1)).timestamp())
+    return start, end
+
+
+def test_local_epochs_match_tz_offsets_across_half_hour_dst_switch():
+    tz = pytz.timezone("Australia/Adelaide")
+    epochs = np.arange(1_759_593_600, 1_759_593_600 + 86_400, 60, dtype=np.int64)  # 2025-10-04 16:00 UTC부터 하루
+
+    expected = [epoch + int(datetime.fromtimestamp(epoch, tz).utcoffset().total_seconds()) for epoch in epochs.tolist()]
+
+    assert local_epochs(epochs, tz).tolist() == expected
+
+
+def test_compile_month_uses_global_timezone_month_bounds():
+    minute_starts, weights = _generator().compile_month("2025-10")
+    start, end = _month_bounds("Asia/Seoul", 2025, 10)
+
+    assert minute_starts[0] == start and minute_starts[-1] == end - 60
+    assert len(minute_starts) == 31 * 1440
+    assert weights.shape == (3, len(minute_starts))
+    assert np.allclose(weights.sum(axis=1), [0.5, 0.3, 0.2])
+
+
+def test_compile_month_weights_follow_local_weekday_and_hour():
+    generator = _generator(hour_distribution={"20-21": 1.0}, day_of_week_ratio=SUNDAY_ONLY)
+    minute_starts, weights = generator.compile_month("2025-10")
+
+    for r, region in enumerate(generator.regions):
+        local = [datetime.fromtimestamp(epoch, region.tz) for epoch in minute_starts[weights[r] > 0].tolist()]
+        # 10월 일요일 4일 × 현지 20시 60분 (반시간 오프셋/DST 전환 후에도 현지 시각 기준)
+        assert len(local) == 4 * 60
+        assert {(t.weekday(), t.hour) for t in local} == {(6, 20)}
+        assert {t.day for t in local} == {5, 12, 19, 26}
+
+
+def test_generate_timestamps_counts_order_and_bounds():
+    generator = _generator(hour_distribution={"8-12": 1.0, "18-23": 3.0})
+    start, end = _month_bounds("Asia/Seoul", 2025, 10)
+
+    logs = list(generator.generate_timestamps("2025-10", 20_000))
+    timestamps = [timestamp for timestamp, _ in logs]
+
+    assert len(logs) == 20_000
+    assert timestamps == sorted(timestamps)  # 시간 단위 청크 사이에도 전체 순서 유지
+    assert start * 1000 <= timestamps[0] and timestamps[-1] < end * 1000
+
+
+def test_generate_timestamps_region_shares_and_local_hours():
+    generator = _generator(hour_distribution={"20-22": 1.0})
+
+    logs = list(generator.generate_timestamps("2025-10", 20_000))
+
+    counts = Counter(region for _, region in logs)
+    for r, share in enumerate([0.5, 0.3, 0.2]):
+        assert abs(counts[r] / len(logs) - share) < 0.02
+    for timestamp, region in logs[::50]:
+        local = datetime.fromtimestamp(timestamp // 1000, generator.regions[region].tz)
+        assert local.hour in (20, 21)
+
+
+def test_same_seed_reproduces_timestamps():
+    a = list(_generator().generate_timestamps("2025-10", 2_000))
+    b = list(_generator().generate_timestamps("2025-10", 2_000))
+
+    assert a == b
@@ -0,0 +1,210 @@
+import sqlite3
+
+import pytest
+
+from src.db_client import DBClient
+
+
+SCHEMA = """
+    CREATE TABLE users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL,
+        name TEXT NOT NULL,
+        gender INTEGER NOT NULL,
+        birth_date TEXT NOT NULL,
+        country TEXT NOT NULL DEFAULT 'KR',
+        city TEXT NOT NULL,
+        signup_date TEXT NOT NULL,
+        account_status TEXT NOT NULL DEFAULT 'active',
+        is_adult_verified INTEGER NOT NULL DEFAULT 0,
+        push_opt_in INTEGER NOT NULL DEFAULT 1,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        subscription_status TEXT,
+        subscription_start_date TEXT,
+        subscription_end_date TEXT,
+        subscription_id TEXT
+    );
+    CREATE TABLE user_likes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        content_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        UNIQUE(user_id, content_id)
+    );
+"""
+
+
+def _client(tmp_path, **database_config):
+    path = tmp_path / "ott.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO users (user_id, email, password_hash, name, gender, birth_date, city, signup_date, "
+            "created_at, updated_at, subscription_status) "
+            "VALUES (?, ?, 'x', 'n', 0, '1990-01-01', '서울', '2025-01-01', 'now', 'now', ?)",
+            [(1, "a@x", "active"), (2, "b@x", None), (3, "c@x", None)],
+        )
+        conn.execute("INSERT INTO user_likes (user_id, content_id, created_at) VALUES (1, 'movie_1', '2025-01-01 00:00:00')")
+    config = {
+        "global": {"random_seed": 3},
+        "database": {
+            "db_type": "sqlite",
+            "sqlite_db_path": str(path),
+            "write_behind": True,
+            "write_flush_interval_ms": 600_000,  # 테스트에서 flush_writes()로만 반영
+            "new_user_flush_size": 1000,
+            "like_flush_size": 1000,
+            **database_config,
+        },
+    }
+    return DBClient(config), path
+
+
+@pytest.fixture
+def db(tmp_path):
+    client, path = _client(tmp_path)
+    yield client, path
+    client.close()
+
+
+def _failing_apply(*args):
+    raise sqlite3.OperationalError("database is locked")
+
+
+def _users(path):
+    with sqlite3.connect(path) as conn:
+        return {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT user_id, account_status, subscription_status, subscription_id FROM users")
+        }
+
+
+def _likes(path):
+    with sqlite3.connect(path) as conn:
+        return dict(((u, c), t) for u, c, t in conn.execute("SELECT user_id, content_id, created_at FROM user_likes"))
+
+
+def test_activate_then_deactivate_keeps_plan_and_ends_inactive(db):
+    client, path = db
+    client.activate_subscription(2, "s_5")
+    client.deactivate_subscription(2)
+
+    assert client._pending_user_updates[2][0] == "s_5"
+    assert client._pending_user_updates[2][1] in ("expired", "cancelled")
+    assert client.write_stats["coalesced"] == 1
+
+    client.flush_writes()
+    status, subscription_status, subscription_id = _users(path)[2]
+    assert status == "active"
+    assert subscription_status in ("expired", "cancelled")
+    assert subscription_id == "s_5"
+
+
+def test_deactivate_then_activate_ends_active(db):
+    client, path = db
+    client.deactivate_subscription(1)
+    client.activate_subscription(1, "s_9")
+
+    assert client._pending_user_updates[1] == ["s_9", None, False]
+    client.flush_writes()
+    assert _users(path)[1] == ("active", "active", "s_9")
+
+
+def test_delete_merges_with_earlier_updates(db):
+    client, path = db
+    client.activate_subscription(3, "s_1")
+    client.delete_user(3)
+
+    assert client._pending_user_updates[3] == ["s_1", None, True]
+    client.flush_writes()
+    assert _users(path)[3] == ("deleted", "active", "s_1")
+
+
+def test_new_user_and_its_updates_apply_in_one_batch(db):
+    client, path = db
+    user_id = client.create_new_user(country="JP")
+    client.activate_subscription(user_id, "s_2")
+    client.queue_like_change(user_id, "movie_2", True, "2025-09-01 00:00:00")
+
+    assert client.flush_writes() == 3
+    assert _users(path)[user_id] == ("active", "active", "s_2")
+    assert _likes(path)[(user_id, "movie_2")] == "2025-09-01 00:00:00"
+
+
+def test_like_on_off_on_merges_to_last_state(db):
+    client, path = db
+    client.queue_like_change(2, "movie_1", True, "2025-09-01 00:00:00")
+    client.queue_like_change(2, "movie_1", False, "2025-09-01 00:00:01")
+    client.queue_like_change(2, "movie_1", True, "2025-09-01 00:00:02")
+    client.queue_like_change(1, "movie_1", False, "2025-09-01 00:00:03")
+
+    assert client._pending_like_changes == {
+        (2, "movie_1"): (True, "2025-09-01 00:00:02"),
+        (1, "movie_1"): (False, "2025-09-01 00:00:03"),
+    }
+    assert client.write_stats["coalesced"] == 2
+
+    client.flush_writes()
+    assert _likes(path) == {(2, "movie_1"): "2025-09-01 00:00:02"}
+
+
+def test_off_then_on_for_existing_like_refreshes_created_at(db):
+    client, path = db
+    client.queue_like_change(1, "movie_1", False, "2025-09-01 00:00:00")
+    client.queue_like_change(1, "movie_1", True, "2025-09-02 00:00:00")
+
+    client.flush_writes()
+    assert _likes(path) == {(1, "movie_1"): "2025-09-02 00:00:00"}
+
+
+def test_close_flushes_pending_writes(db):
+    client, path = db
+    client.delete_user(2)
+
+    client.close()
+    assert _users(path)[2][0] == "deleted"
+
+
+def test_failed_flush_requeues_batch_under_newer_changes(db):
+    client, path = db
+    apply_writes = client._apply_writes
+    client.deactivate_subscription(1)
+    client.delete_user(2)
+    client.queue_like_change(1, "movie_1", False, "2025-09-01 00:00:00")
+
+    client._apply_writes = _failing_apply
+    with pytest.raises(sqlite3.OperationalError):
+        client.flush_writes()
+
+    # 실패 배치는 큐에 남고, 그 사이 변경은 더 최신 값으로 병합
+    client.activate_subscription(1, "s_3")
+    client.queue_like_change(1, "movie_1", True, "2025-09-02 00:00:00")
+    assert client._pending_user_updates == {1: ["s_3", None, False], 2: [None, None, True]}
+
+    client._apply_writes = apply_writes
+    assert client.flush_writes() == 3
+    assert _users(path)[1] == ("active", "active", "s_3")
+    assert _users(path)[2][0] == "deleted"
+    assert _likes(path) == {(1, "movie_1"): "2025-09-02 00:00:00"}
+
+
+def test_writer_failure_stops_producer_and_close_raises(tmp_path):
+    client, path = _client(tmp_path, write_queue_size=4, write_flush_interval_ms=10)
+    client._apply_writes = _failing_apply
+    client.delete_user(2)
+
+    # 큐 상한에서 대기하던 생성 스레드는 writer 오류로 깨어나 예외 발생 (무한 대기 없음)
+    with pytest.raises(RuntimeError) as excinfo:
+        for i in range(10):
+            client.queue_like_change(3, f"movie_{i}", True, "2025-09-01 00:00:00")
+    assert isinstance(excinfo.value.__cause__, sqlite3.OperationalError)
+
+    # 오류는 유지되어 이후 적재/종료에서도 계속 보고되고, 실패한 탈퇴는 큐에 남음
+    with pytest.raises(RuntimeError):
+        client.delete_user(3)
+    assert client._pending_user_updates[2][2] is True
+    with pytest.raises(RuntimeError):
+        client.close()
+    assert _users(path)[2][0] == "active"
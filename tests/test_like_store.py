@@ -0,0 +1,53 @@
+from src.content_catalog import ContentCatalog
+from src.like_store import LikeStore
+
+
+class _LikeDB:
+    """user_likes 조회/변경 기록만 하는 DBClient 대역"""
+
+    def __init__(self, likes):
+        self.likes = likes
+        self.changes = []
+
+    def iter_user_likes(self):
+        return iter(self.likes)
+
+    def queue_like_change(self, user_id, content_id, liked, created_at):
+        self.changes.append((user_id, content_id, liked, created_at))
+
+
+def _catalog():
+    return ContentCatalog([
+        {"contents_id": "movie_1", "contents_type": "movie", "popularity": 3.0},
+        {"contents_id": "tv_2", "contents_type": "tv", "popularity": 1.0, "number_of_episodes": 2},
+    ])
+
+
+def test_loads_existing_likes_and_ignores_unknown_contents():
+    catalog = _catalog()
+    db = _LikeDB([(1, "movie_1"), (1, "movie_1"), (2, "movie_1"), (1, "movie_404")])
+
+    store = LikeStore(db, catalog)
+
+    assert store.is_liked(1, catalog.get("movie_1"))
+    assert not store.is_liked(1, catalog.get("tv_2"))
+    assert list(store.like_counts) == [2, 0]
+
+
+def test_set_liked_queues_only_real_changes():
+    catalog = _catalog()
+    db = _LikeDB([(1, "movie_1")])
+    store = LikeStore(db, catalog)
+    movie, series = catalog.get("movie_1"), catalog.get("tv_2")
+
+    store.set_liked(1, movie, True, 1_756_684_800_000)   # 이미 좋아요
+    store.set_liked(1, series, True, 1_756_684_800_000)
+    store.set_liked(1, movie, False, 1_756_684_801_000)
+    store.set_liked(1, movie, False, 1_756_684_802_000)  # 이미 취소
+
+    assert db.changes == [
+        (1, "tv_2", True, "2025-09-01 00:00:00"),
+        (1, "movie_1", False, "2025-09-01 00:00:01"),
+    ]
+    assert list(store.like_counts) == [0, 1]
+    assert store.is_liked(1, series) and not store.is_liked(1, movie)
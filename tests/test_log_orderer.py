@@ -0,0 +1,81 @@
+from schemas.log_record import LogRecord, PlaybackSession
+from src.log_orderer import LogOrderer
+
+
+class _ListSink:
+    """방출된 LogRecord를 순서대로 모으는 LogSink 대역"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+def _orderer(lateness_seconds=5, max_pending=1_000_000):
+    sink = _ListSink()
+    config = {"log_sink": {"allowed_lateness_seconds": lateness_seconds, "max_pending_logs": max_pending}}
+    return LogOrderer(config, sink), sink
+
+
+def _record(timestamp, user_id=1, event_type=1):
+    return LogRecord(timestamp, user_id, 1, event_type, b"{}")
+
+
+def test_emits_in_event_time_order_with_stable_ties():
+    orderer, sink = _orderer()
+    for record in (_record(5_000, 1), _record(1_000, 2), _record(3_000, 3), _record(3_000, 4)):
+        orderer.write(record)
+
+    orderer.flush()
+
+    assert [(r.timestamp, r.user_id) for r in sink.records] == [(1_000, 2), (3_000, 3), (3_000, 4), (5_000, 1)]
+
+
+def test_advance_only_emits_logs_older_than_the_watermark():
+    orderer, sink = _orderer(lateness_seconds=5)
+    orderer.write(_record(10_000))
+    orderer.write(_record(20_000))
+
+    orderer.advance(14_999)
+    assert sink.records == []
+
+    orderer.advance(15_000)
+    assert [r.timestamp for r in sink.records] == [10_000]
+    assert len(orderer) == 1
+
+
+def test_late_logs_are_emitted_immediately_and_counted():
+    orderer, sink = _orderer(lateness_seconds=1)
+    orderer.write(_record(10_000))
+    orderer.advance(20_000)
+
+    orderer.write(_record(9_000, user_id=2))   # 이미 방출된 시각보다 이름
+    orderer.write(_record(19_500, user_id=3))  # 허용 지연 안 → 힙에 보관
+
+    assert [r.user_id for r in sink.records] == [1, 2]
+    assert orderer.late_count == 1
+    orderer.flush()
+    assert [r.user_id for r in sink.records] == [1, 2, 3]
+    assert orderer.late_count == 0
+
+
+def test_playback_sessions_interleave_with_other_logs():
+    orderer, sink = _orderer()
+    session = PlaybackSession(0, 9, b"{}", ((1_000, 3_500),), 1_000)   # 1,000 / 2,000 / 3,000
+    orderer.write(session)
+    orderer.write(_record(2_500))
+
+    assert len(orderer) == 2  # heartbeat는 다음 1건만 보관
+    orderer.flush()
+
+    assert [r.timestamp for r in sink.records] == [1_000, 2_000, 2_500, 3_000]
+
+
+def test_max_pending_forces_earliest_logs_out():
+    orderer, sink = _orderer(max_pending=2)
+    for timestamp in (3_000, 1_000, 2_000):
+        orderer.write(_record(timestamp))
+
+    assert [r.timestamp for r in sink.records] == [1_000]
+    assert len(orderer) == 2
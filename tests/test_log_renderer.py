@@ -0,0 +1,33 @@
+import json
+
+from schemas.log_record import LogRecord
+from src.log_renderer import LogRenderer
+
+
+def test_field_cache_keeps_equal_values_of_different_types_apart():
+    renderer = LogRenderer({"log_sink": {"sink_type": "local"}})
+
+    assert renderer.field("rating", 3) == b'"rating": 3'
+    assert renderer.field("rating", 3.0) == b'"rating": 3.0'
+    assert renderer.field("rating", True) == b'"rating": true'
+    assert renderer.field("rating", 1) == b'"rating": 1'
+
+
+def test_null_fields_depend_on_sink_type():
+    assert LogRenderer({"log_sink": {"sink_type": "local"}}).field("detail", None) == b""
+    assert LogRenderer({"log_sink": {"sink_type": "kinesis"}}).field("detail", None) == b'"detail": null'
+
+
+def test_render_matches_json_dumps():
+    renderer = LogRenderer({"log_sink": {"sink_type": "local"}})
+    detail = renderer.detail(renderer.field("contents_id", "movie_1"), renderer.field("rating", 4.5), b"")
+    record = LogRecord(1_756_684_800_007, 42, 3, 10, detail)
+
+    expected = json.dumps({
+        "timestamp": "2025-09-01T00:00:00.007Z",
+        "user_id": 42,
+        "event_category": 3,
+        "event_type": 10,
+        "detail": {"contents_id": "movie_1", "rating": 4.5},
+    }, ensure_ascii=False).encode("utf-8")
+    assert renderer.render(record) == expected
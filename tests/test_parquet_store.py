@@ -0,0 +1,132 @@
+from datetime import date
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.parquet_store import ParquetStore
+
+
+USERS = {
+    "user_id": [3, 1, 2],
+    "email": ["c@x", "a@x", "b@x"],
+    "country": ["JP", "KR", "KR"],
+    "account_status": ["active", "active", "deleted"],
+    "subscription_status": [None, "active", None],
+    "subscription_id": [None, "s_1", None],
+    "subscription_start_date": [None, "2025-01-01", None],
+    "subscription_end_date": [None, "2025-02-01", None],
+    "created_at": ["2025-01-01 00:00:00"] * 3,
+    "updated_at": ["2025-01-01 00:00:00"] * 3,
+}
+
+CONTENTS = {
+    "content_id": ["movie_1", "tv_1"],
+    "content_type": ["movie", "tv"],
+    "title": ["영화", "드라마"],
+    "genre_names": ["액션", "드라마"],
+    "runtime": [120, 50],
+    "popularity": [3.0, 9.0],
+    "number_of_episodes": [0, 8],
+    "release_date": ["2025-01-01", "2025-02-01"],
+}
+
+LIKES = {
+    "id": [1, 2],
+    "user_id": [1, 3],
+    "content_id": ["movie_1", "tv_1"],
+    "created_at": ["2025-01-01 00:00:00", "2025-01-02 00:00:00"],
+}
+
+
+def _new_user(user_id, country="KR"):
+    # NEW_USER_COLUMNS 순서
+    return (user_id, f"u{user_id}@x", "x", "n", 0, date(1990, 1, 1),
+            country, "서울", date(2025, 9, 1), "active", 0, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    source = tmp_path / "parquet"
+    source.mkdir()
+    pq.write_table(pa.table(USERS), source / "users.parquet")
+    pq.write_table(pa.table(CONTENTS), source / "tmdb_contents.parquet")
+    pq.write_table(pa.table(LIKES), source / "user_likes.parquet")
+    return ParquetStore(str(source), snapshot_dir=str(tmp_path / "snapshot"))
+
+
+def test_active_users_excludes_deleted_and_orders_by_user_id(store):
+    assert store.active_users() == [
+        {"user_id": 1, "is_subscribed": 1, "country": "KR"},
+        {"user_id": 3, "is_subscribed": 0, "country": "JP"},
+    ]
+
+
+def test_apply_merges_new_users_and_subscription_changes(store):
+    store.apply(
+        [_new_user(10, "JP")],
+        {1: [None, "cancelled", False], 3: ["s_2", None, False], 10: ["s_3", None, False]},
+        {},
+    )
+
+    assert store.active_users() == [
+        {"user_id": 1, "is_subscribed": 0, "country": "KR"},
+        {"user_id": 3, "is_subscribed": 1, "country": "JP"},
+        {"user_id": 10, "is_subscribed": 1, "country": "JP"},
+    ]
+
+    store.apply([], {3: [None, None, True], 10: [None, "expired", False]}, {})
+    assert store.active_users() == [
+        {"user_id": 1, "is_subscribed": 0, "country": "KR"},
+        {"user_id": 10, "is_subscribed": 0, "country": "JP"},
+    ]
+
+
+def test_iter_likes_reflects_inserts_and_deletes(store):
+    store.apply([], {}, {
+        (1, "movie_1"): (False, "2025-09-01 00:00:00"),
+        (2, "tv_1"): (True, "2025-09-01 00:00:01"),
+    })
+
+    assert sorted(store.iter_likes()) == [(2, "tv_1"), (3, "tv_1")]
+
+    store.apply([], {}, {(1, "movie_1"): (True, "2025-09-02 00:00:00")})
+    assert sorted(store.iter_likes()) == [(1, "movie_1"), (2, "tv_1"), (3, "tv_1")]
+
+
+def test_max_user_id_includes_overlay_rows(store):
+    assert store.max_user_id() == 3
+
+    store.apply([_new_user(42)], {}, {})
+    assert store.max_user_id() == 42
+
+
+def test_iter_contents_orders_by_popularity(store):
+    contents = list(store.iter_contents(limit=0, batch_size=1))
+
+    assert [c["contents_id"] for c in contents] == ["tv_1", "movie_1"]
+    assert contents[0]["genre"] == "드라마" and contents[0]["number_of_episodes"] == 8
+
+
+def test_write_snapshot_round_trip(store, tmp_path):
+    store.apply(
+        [_new_user(10)],
+        {1: [None, None, True], 3: ["s_2", None, False]},
+        {(3, "tv_1"): (False, "2025-09-01 00:00:00"), (10, "movie_1"): (True, "2025-09-01 00:00:01")},
+    )
+
+    snapshot_dir = store.write_snapshot()
+    reloaded = ParquetStore(str(snapshot_dir))
+
+    assert reloaded.active_users() == store.active_users() == [
+        {"user_id": 3, "is_subscribed": 1, "country": "JP"},
+        {"user_id": 10, "is_subscribed": 0, "country": "KR"},
+    ]
+    assert sorted(reloaded.iter_likes()) == [(1, "movie_1"), (10, "movie_1")]
+    assert reloaded.max_user_id() == 10
+    assert reloaded.users.schema == store.users.schema
+
+    likes = pq.read_table(snapshot_dir / "user_likes.parquet").to_pylist()
+    assert {(row["user_id"], row["content_id"]): row["id"] for row in likes} == {(1, "movie_1"): 1, (10, "movie_1"): 3}
+    assert not list(snapshot_dir.glob(".*.tmp"))
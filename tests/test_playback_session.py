@@ -0,0 +1,35 @@
+from schemas.log_record import PLAYING_EVENT_CATEGORY, PLAYING_EVENT_TYPE, PlaybackSession
+
+
+BASE = 1_756_684_800_000
+
+
+def _session(segments, interval=30_000):
+    return PlaybackSession(BASE, 7, b'{"platform": 1}', tuple(segments), interval)
+
+
+def test_heartbeat_count_matches_expanded_records():
+    # 재생 90초 구간 (30초 후부터 90초 전까지: 30, 60초) + 재생 100초 구간 (30, 60, 90초)
+    session = _session([(30_000, 90_000), (120_000 + 30_000, 220_000)])
+
+    records = list(session.records())
+
+    assert session.heartbeat_count() == len(records) == 5
+    assert [r.timestamp - BASE for r in records] == [30_000, 60_000, 150_000, 180_000, 210_000]
+    assert all(
+        (r.user_id, r.event_category, r.event_type, r.detail) == (7, PLAYING_EVENT_CATEGORY, PLAYING_EVENT_TYPE, b'{"platform": 1}')
+        for r in records
+    )
+
+
+def test_segments_shorter_than_interval_have_no_heartbeat():
+    session = _session([(30_000, 30_000), (30_000, 10_000), (30_000, 30_001)])
+
+    assert session.heartbeat_count() == len(list(session.records())) == 1
+
+
+def test_heartbeat_count_for_long_session():
+    # 45분 재생, 10초 간격 → 10초부터 2,690초까지 269건
+    session = _session([(10_000, 45 * 60_000)], interval=10_000)
+
+    assert session.heartbeat_count() == len(list(session.records())) == 269
@@ -0,0 +1,46 @@
+from collections import Counter
+
+from src.random_pool import RandomPool
+
+
+def _pool(seed=11):
+    return RandomPool({"global": {"random_seed": seed, "random_block_size": 1024}})
+
+
+def test_same_seed_reproduces_draws():
+    a, b = _pool(), _pool()
+
+    assert [a.random() for _ in range(3000)] == [b.random() for _ in range(3000)]
+    assert a.sample(range(10_000), 50) == b.sample(range(10_000), 50)
+    assert a.weighted_picks("abc", [1, 2, 3], 20) == b.weighted_picks("abc", [1, 2, 3], 20)
+
+
+def test_sample_is_without_replacement():
+    pool = _pool()
+
+    drawn = pool.sample(range(1_000_000), 5000)
+    assert len(drawn) == len(set(drawn)) == 5000
+    assert all(0 <= i < 1_000_000 for i in drawn)
+    assert sorted(pool.sample([1, 2, 3], 10)) == [1, 2, 3]
+    assert pool.sample([], 3) == []
+
+
+def test_weighted_draws_follow_weights():
+    pool = _pool()
+    n = 30_000
+
+    single = Counter(pool.weighted_pick("abc", [0.2, 0.0, 0.8]) for _ in range(n))
+    bulk = Counter(pool.weighted_picks("abc", [0.2, 0.0, 0.8], n))
+
+    for counts in (single, bulk):
+        assert counts["b"] == 0
+        assert abs(counts["a"] / n - 0.2) < 0.015
+
+
+def test_registered_choice_follows_weights():
+    pool = _pool()
+    pool.register_choice("platform", [1, 1, 2])
+    n = 30_000
+
+    counts = Counter(pool.choice("platform") for _ in range(n))
+    assert abs(counts[2] / n - 0.5) < 0.015
@@ -0,0 +1,78 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.sampling import AliasTable, FenwickSampler
+
+
+def _frequencies(sampler, n=40_000, seed=3):
+    counts = Counter(sampler.sample(u) for u in np.random.default_rng(seed).random(n).tolist())
+    return [counts[i] / n for i in range(len(sampler))]
+
+
+@pytest.mark.parametrize("sampler_class", [AliasTable, FenwickSampler])
+def test_sample_frequencies_follow_weights(sampler_class):
+    weights = [5.0, 0.0, 2.0, 3.0]
+
+    frequencies = _frequencies(sampler_class(weights))
+
+    assert frequencies[1] == 0.0
+    for frequency, weight in zip(frequencies, weights):
+        assert abs(frequency - weight / sum(weights)) < 0.01
+
+
+@pytest.mark.parametrize("sampler_class", [AliasTable, FenwickSampler])
+def test_u_close_to_one_stays_in_range(sampler_class):
+    sampler = sampler_class([1.0, 2.0, 0.0])
+
+    assert sampler.sample(1.0 - 1e-16) == 1
+    assert sampler.sample(0.0) == 0
+
+
+def test_alias_table_rejects_empty_or_zero_weights():
+    with pytest.raises(ValueError):
+        AliasTable([])
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+
+
+def test_fenwick_update_changes_distribution():
+    sampler = FenwickSampler([1.0, 1.0, 1.0, 1.0])
+    sampler.update(0, 0.0)
+    sampler.update(3, 6.0)
+
+    frequencies = _frequencies(sampler)
+
+    assert frequencies[0] == 0.0
+    assert abs(frequencies[3] - 0.75) < 0.01
+    assert sampler.total == 8.0
+
+
+def test_fenwick_never_returns_zero_weight_slot_when_total_overshoots():
+    sampler = FenwickSampler([1.0, 0.0])
+    sampler.total += 1e-9  # 누적 오차로 합계가 트리보다 커진 상태
+
+    assert sampler.sample(1.0 - 1e-12) == 0
+
+
+def test_fenwick_rebuild_removes_accumulated_drift():
+    rng = np.random.default_rng(5)
+    size = 100
+    sampler = FenwickSampler([1.0] * size)
+
+    for _ in range(10 * size + 7):
+        sampler.update(int(rng.integers(size)), float(rng.random()) * 1e-3 + 0.1)
+    for index in range(0, size, 2):
+        sampler.update(index, 0.0)
+
+    assert sampler.total == pytest.approx(sum(sampler.weights), rel=1e-12)
+    drawn = {sampler.sample(u) for u in rng.random(20_000).tolist()}
+    assert drawn and all(index % 2 == 1 for index in drawn)
+
+
+def test_fenwick_all_zero_weights_falls_back_to_uniform():
+    sampler = FenwickSampler([0.0, 0.0, 0.0])
+
+    assert sampler.sample(0.5) == 1
+    assert sampler.sample(1.0 - 1e-16) == 2
@@ -0,0 +1,77 @@
+from collections import Counter
+
+from schemas.enum import EventCategory, EventType, UserState
+from src.user_controller import UserEventController
+from src.user_table import UserTable
+
+
+CONFIG = {
+    "global": {"random_seed": 7, "random_block_size": 4096},
+    "user_event_transitions": {
+        "MAIN_PAGE": {
+            "subscribed": {"contents-click": 0.75, "search-search": 0.25},
+            "not_subscribed": {"contents-click": 0.5, "no-such-event": 0.5},
+        },
+        "CONTENT_PAGE": {
+            "subscribed": {"contents-start": 1.0},
+            "not_subscribed": {"contents-like_on": 0.6, "contents-like_off": 0.2},
+        },
+    },
+}
+
+
+def _users(count, subscribed):
+    table = UserTable()
+    return [table.view(table.add(user_id, subscribed)) for user_id in range(1, count + 1)]
+
+
+def test_transition_carries_compiled_codes():
+    controller = UserEventController(CONFIG)
+    user = _users(1, True)[0]
+
+    transition, _ = controller.select_transition(user, UserState.NOT_LOGGED_IN)
+
+    assert transition.event_type == "access-in"
+    assert transition.event_category_code == EventCategory.ACCESS.value
+    assert transition.event_type_code == EventType.IN.value
+    assert transition.next_state == UserState.MAIN_PAGE
+    assert user.has_logged_in_today
+
+
+def test_validation_report_flags_bad_sums_and_unknown_events():
+    controller = UserEventController(CONFIG)
+    report = "\n".join(controller.validation_report)
+
+    assert "MAIN_PAGE.not_subscribed.no-such-event" in report
+    assert "CONTENT_PAGE.not_subscribed: 확률 합계 0.800000" in report
+
+
+def test_select_events_bulk_matches_configured_weights():
+    controller = UserEventController(CONFIG)
+    users = _users(20000, True)
+
+    results = controller.select_events_bulk(users, [UserState.MAIN_PAGE] * len(users))
+
+    assert len(results) == len(users)
+    counts = Counter(event for event, _, _ in results)
+    assert set(counts) == {"contents-click", "search-search"}
+    assert abs(counts["contents-click"] / len(users) - 0.75) < 0.02
+    for event, next_state, _ in results:
+        expected = UserState.CONTENT_PAGE if event == "contents-click" else UserState.MAIN_PAGE
+        assert next_state == expected
+
+
+def test_select_events_bulk_uses_each_users_state_and_subscription():
+    controller = UserEventController(CONFIG)
+    subscribed = _users(3, True)
+    not_subscribed = _users(3, False)
+
+    results = controller.select_events_bulk(
+        subscribed + not_subscribed,
+        [UserState.CONTENT_PAGE] * 3 + [UserState.CONTENT_PAGE, UserState.USER_OUT, UserState.NOT_REGISTERED],
+    )
+
+    assert [event for event, _, _ in results[:3]] == ["contents-start"] * 3
+    assert results[3][0] in ("contents-like_on", "contents-like_off")
+    assert results[4][:2] == (None, UserState.USER_OUT)
+    assert results[5][:2] == ("register-in", UserState.MAIN_PAGE)
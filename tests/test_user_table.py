@@ -0,0 +1,37 @@
+from schemas.enum import UserState
+from src.user_table import UserTable
+
+
+def _table(regions):
+    table = UserTable()
+    for user_id, region in enumerate(regions, start=1):
+        table.add(user_id=user_id, is_subscribed=False, current_state=UserState.MAIN_PAGE, region=region)
+    return table
+
+
+def test_region_active_sets_follow_activate_and_deactivate():
+    table = _table([0, 1, 0, 2, 0])
+    for row in range(len(table)):
+        table.activate(row)
+
+    table.deactivate(0)   # 지역 0의 마지막 원소(row 4)가 빈 자리로 이동
+    table.deactivate(3)   # 지역 2의 유일한 원소
+    table.deactivate(3)   # 이미 비활성이면 무시
+    table.activate(2)     # 이미 활성이면 무시
+
+    assert sorted(table.active_rows_in(0)) == [2, 4]
+    assert list(table.active_rows_in(1)) == [1]
+    assert list(table.active_rows_in(2)) == []
+    assert sorted(table.active_rows_in(-1)) == [1, 2, 4]
+    for region in range(3):
+        for pos, row in enumerate(table.active_rows_in(region)):
+            assert table.region_active_pos[row] == pos
+
+
+def test_random_active_row_stays_in_region():
+    table = _table([0, 1, 0, 1, 1])
+    for row in range(len(table)):
+        table.activate(row)
+
+    assert {table.random_active_row(i / 10, region=1) for i in range(10)} == {1, 3, 4}
+    assert table.random_active_row(0.5, region=5) == -1